@@ -12,15 +12,31 @@ from typing import List, Dict, Any
 from types import SimpleNamespace
 
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, flash, jsonify
+from flask import Flask, Response, render_template, request, flash, jsonify
 from utils.steam_api_client import extract_steam_ids
 import utils.inventory_processor as ip
 
 from utils import steam_api_client as sac
 from utils import local_data
 from utils import constants as consts
+from utils import alloc_tracker
+from utils import card_events
+from utils import inventory_value
+from utils import export
+from utils import metrics
+from utils import scan_profiler
+from utils import scan_store
+from utils import search_index
+from utils import watchlist
+from utils import price_history
+from utils import price_service
+from utils import price_refresher
+from utils import repricer
+from utils import valuation_service
+from utils.inventory import profiling
 from utils.price_loader import ensure_prices_cached, ensure_currencies_cached
 from utils.cache_manager import _do_refresh, fetch_missing_cache_files
+from utils.stacking import stack_items
 
 COLOR_YELLOW = "\033[33m"
 COLOR_RESET = "\033[0m"
@@ -35,6 +51,8 @@ parser = argparse.ArgumentParser(add_help=False)
 parser.add_argument("--refresh", action="store_true")
 parser.add_argument("--verbose", action="store_true")
 parser.add_argument("--test", action="store_true")
+parser.add_argument("--profile-extractors", action="store_true")
+parser.add_argument("--track-allocations", action="store_true")
 ARGS, _ = parser.parse_known_args()
 
 
@@ -59,6 +77,14 @@ app = Flask(__name__)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-insecure-change-me")
 
 MAX_MERGE_MS = 0
+if ARGS.profile_extractors:
+    profiling.enable()
+else:
+    profiling.enable_from_env()
+if ARGS.track_allocations:
+    alloc_tracker.enable()
+else:
+    alloc_tracker.enable_from_env()
 local_data.load_files(auto_refetch=True, verbose=ARGS.verbose)
 _prices_path = ensure_prices_cached(refresh=ARGS.refresh)
 if _prices_path.exists() and _prices_path.stat().st_size <= 2:
@@ -74,24 +100,6 @@ except Exception:
 
 # --- Utility functions ------------------------------------------------------
 
-IGNORED_STACK_KEYS = {
-    "level",
-    "custom_description",
-    "custom_name",
-    "origin",
-    "id",
-    "original_id",
-    "inventory",
-}
-
-# Item names that should never be merged into quantity stacks
-UNSTACKABLE_NAMES = {
-    "Killstreak Kit",
-    "Specialized Killstreak Kit",
-    "Professional Killstreak Kit",
-    "Killstreak Kit Fabricator",
-}
-
 
 def kill_process_on_port(port: int) -> None:
     """Terminate any process currently listening on ``port``."""
@@ -109,45 +117,6 @@ def kill_process_on_port(port: int) -> None:
                         proc.kill()
 
 
-def stack_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Return ``items`` grouped into quantity stacks.
-
-    Items whose ``name`` or ``item_type_name`` appears in
-    :data:`UNSTACKABLE_NAMES` are kept separate.  All other items are merged by
-    comparing every field except those in :data:`IGNORED_STACK_KEYS`.
-    """
-
-    grouped: Dict[str, Dict[str, Any]] = {}
-    uniques: List[Dict[str, Any]] = []
-
-    for itm in items:
-        if not isinstance(itm, dict):
-            continue
-
-        item_name = itm.get("name")
-        item_type = itm.get("item_type_name")
-        if item_name in UNSTACKABLE_NAMES or item_type in UNSTACKABLE_NAMES:
-            new_item = itm.copy()
-            new_item.setdefault("quantity", 1)
-            uniques.append(new_item)
-            continue
-
-        key_obj = {k: v for k, v in itm.items() if k not in IGNORED_STACK_KEYS}
-        try:
-            key = json.dumps(key_obj, sort_keys=True)
-        except TypeError:
-            key = str(key_obj)
-
-        if key in grouped:
-            grouped[key]["quantity"] += 1
-        else:
-            new_item = itm.copy()
-            new_item.setdefault("quantity", 1)
-            grouped[key] = new_item
-
-    return list(grouped.values()) + uniques
-
-
 async def get_player_summary(steamid64: str) -> Dict[str, Any] | None:
     """Return profile name, avatar URL and TF2 playtime for a user.
 
@@ -214,17 +183,24 @@ async def fetch_inventory(steamid64: str) -> Dict[str, Any]:
         data = TEST_INVENTORY_RAW
     else:
         status, data = await sac.fetch_inventory_async(steamid64)
+    scan_profiler.record_inventory(steamid64, status, data)
     items: List[Dict[str, Any]] = []
+    # One service for the whole scan; a price refresh swaps in a new one.
+    service = ip.get_valuation_service()
     if status == "parsed":
         try:
-            items = ip.process_inventory(
-                data, valuation_service=ip.get_valuation_service()
-            )
+            with alloc_tracker.stage("process_inventory", steamid64):
+                items = ip.process_inventory(data, valuation_service=service)
         except Exception:
             app.logger.exception("Failed to enrich inventory for %s", steamid64)
             status = "failed"
             items = []
-    return {"items": items, "status": status}
+    return {
+        "items": items,
+        "status": status,
+        "price_generation": getattr(service, "generation", None),
+        "key_price": price_service.key_price(getattr(service, "currencies", {})),
+    }
 
 
 async def build_user_data_async(steamid64: str) -> Dict[str, Any] | None:
@@ -232,22 +208,46 @@ async def build_user_data_async(steamid64: str) -> Dict[str, Any] | None:
 
     Returns ``None`` if the user summary could not be retrieved.
     """
-    t1 = time.perf_counter()
-    summary_task = asyncio.create_task(get_player_summary(steamid64))
-    inv_task = asyncio.create_task(fetch_inventory(steamid64))
-    summary, inv_result = await asyncio.gather(summary_task, inv_task)
+    alloc_tracker.begin_scan(steamid64)
+    with metrics.ACTIVE_SCANS.track_inprogress():
+        t1 = time.perf_counter()
+        summary_task = asyncio.create_task(get_player_summary(steamid64))
+        inv_task = asyncio.create_task(fetch_inventory(steamid64))
+        summary, inv_result = await asyncio.gather(summary_task, inv_task)
     if summary is None:
+        metrics.SCANS_TOTAL.inc(status="no_summary")
         return None
     t2 = time.perf_counter()
 
+    key_price = inv_result.get("key_price")
+    if key_price is None:
+        key_price = price_service.key_price(local_data.CURRENCIES)
     items = inv_result.get("items", [])
+    value = inventory_value.summarize_items(
+        items if isinstance(items, list) else [], key_price, steamid=steamid64
+    )
     if not isinstance(items, list):
         items = []
     else:
-        items = stack_items(items)
+        if inv_result.get("status") == "parsed":
+            scan_store.record_scan(
+                steamid64,
+                items,
+                "parsed",
+                price_generation=inv_result.get("price_generation"),
+                value=value.to_dict(),
+                profile=dict(summary),
+            )
+        with metrics.STACK_SECONDS.time(), alloc_tracker.stage(
+            "stack_items", steamid64
+        ):
+            items = stack_items(items)
     status = inv_result.get("status", "failed")
+    metrics.SCANS_TOTAL.inc(status=status)
 
-    summary.update({"steamid": steamid64, "items": items, "status": status})
+    summary.update(
+        {"steamid": steamid64, "items": items, "status": status, "value": value}
+    )
 
     inventory_fetch_ms = int((t2 - t1) * 1000)
     merge_ms = int((time.perf_counter() - t2) * 1000)
@@ -261,6 +261,13 @@ async def build_user_data_async(steamid64: str) -> Dict[str, Any] | None:
     return summary
 
 
+def render_timed(template: str, **context: Any) -> str:
+    """Render ``template`` and record the render time for ``/metrics``."""
+
+    with metrics.RENDER_SECONDS.time(template=template):
+        return render_template(template, **context)
+
+
 def normalize_user_payload(user: Dict[str, Any]) -> SimpleNamespace:
     """Return a namespace with ``items`` guaranteed to be a list."""
 
@@ -272,16 +279,23 @@ def normalize_user_payload(user: Dict[str, Any]) -> SimpleNamespace:
 async def fetch_and_process_single_user(steamid64: int) -> str:
     user = await build_user_data_async(str(steamid64))
     user = normalize_user_payload(user)
-    return render_template("_user.html", user=user)
+    with alloc_tracker.stage("render", getattr(user, "steamid", None)):
+        return render_timed("_user.html", user=user)
 
 
 async def fetch_and_process_many(
     ids: List[str],
+    *,
+    sort: str | None = None,
+    totals: inventory_value.InventoryValue | None = None,
 ) -> tuple[List[str], List[str], List[str]]:
     """Return rendered user cards grouped by status and failed IDs.
 
     Args:
         ids: SteamID64 strings to process.
+        sort: One of :data:`utils.inventory_value.SORT_KEYS` to order the
+            completed cards by, highest first; input order by default.
+        totals: Summary every user's inventory value is added to.
 
     Returns:
         A tuple ``(completed, failed, failed_ids)`` where ``completed`` and
@@ -296,7 +310,7 @@ async def fetch_and_process_many(
     }
 
     results = await asyncio.gather(*tasks.values())
-    completed: List[str] = []
+    completed: List[tuple[float, str]] = []
     failed: List[str] = []
     failed_ids: List[str] = []
     seen: set[str] = set()
@@ -311,14 +325,73 @@ async def fetch_and_process_many(
             print("DUPLICATE PANEL:", user_ns.steamid)
             continue
         seen.add(user_ns.steamid)
-        rendered = render_template("_user.html", user=user_ns)
+        value = getattr(user_ns, "value", None)
+        if totals is not None and value is not None:
+            totals.add(value)
+        with alloc_tracker.stage("render", user_ns.steamid):
+            rendered = render_timed("_user.html", user=user_ns)
         if user_ns.status == "failed":
             failed.append(rendered)
             failed_ids.append(user_ns.steamid)
         else:
-            completed.append(rendered)
+            completed.append((inventory_value.sort_value(value, sort or ""), rendered))
+
+    if sort:
+        completed.sort(key=lambda pair: -pair[0])
+    return [rendered for _value, rendered in completed], failed, failed_ids
 
-    return completed, failed, failed_ids
+
+def render_stored_card(steamid: str) -> str | None:
+    """Render the user card of a stored scan, or ``None`` without a profile."""
+
+    store = scan_store.get_scan_store()
+    meta = store.meta(steamid) or {}
+    profile = meta.get("profile")
+    if not isinstance(profile, dict):
+        return None
+    value = meta.get("value")
+    user = {
+        **profile,
+        "steamid": steamid,
+        "status": meta.get("status", "parsed"),
+        "items": stack_items(list(store.iter_items(steamid))),
+        "value": (
+            inventory_value.InventoryValue.from_dict(value)
+            if isinstance(value, dict)
+            else None
+        ),
+    }
+    return render_timed("_user.html", user=normalize_user_payload(user))
+
+
+async def reprice_stored_scans(
+    steamids: List[str] | None = None, force: bool = False
+) -> List[repricer.RepriceResult]:
+    """Reprice stored scans and push the refreshed cards to open pages.
+
+    Also called by the price refresher after each new price generation.
+    """
+
+    results = await asyncio.to_thread(repricer.reprice_scans, steamids, force=force)
+    events = card_events.get_card_events()
+    if not events.subscribers():
+        return results
+    with app.app_context():
+        for result in results:
+            if not result.repriced:
+                continue
+            html = render_stored_card(result.steamid)
+            if html is None:
+                continue
+            events.publish(
+                "card",
+                {
+                    "steamid": result.steamid,
+                    "price_generation": result.price_generation,
+                    "html": html,
+                },
+            )
+    return results
 
 
 async def _setup_test_mode() -> None:
@@ -405,10 +478,31 @@ async def _setup_test_mode() -> None:
     app.config["TEST_STEAMID"] = steamid
 
 
+def _requested_capture(label: str):
+    """Return ``(capture, error)`` for an optional ``?profile=1`` request.
+
+    ``capture`` is ``None`` when profiling was not requested; ``error`` is a
+    403 response when it was requested without a valid admin token.
+    """
+    if request.args.get("profile") != "1":
+        return None, None
+    token = request.headers.get(scan_profiler.ADMIN_HEADER)
+    if not scan_profiler.admin_authorized(token):
+        return None, (jsonify({"error": "admin token required for profiling"}), 403)
+    return scan_profiler.capture(label), None
+
+
 @app.post("/retry/<int:steamid64>")
 async def retry_single(steamid64: int):
     """Reprocess a single user and return a rendered snippet."""
-    return await fetch_and_process_single_user(steamid64)
+    capture, error = _requested_capture(f"retry:{steamid64}")
+    if error:
+        return error
+    with capture or contextlib.nullcontext():
+        html = await fetch_and_process_single_user(steamid64)
+    if capture:
+        return html, {"X-Profile-Id": capture.profile_id}
+    return html
 
 
 @app.post("/api/users")
@@ -430,8 +524,302 @@ async def api_users():
     if not ids:
         return jsonify({"error": "Invalid Steam ID"}), 400
 
-    completed, failed, _ = await fetch_and_process_many(ids)
-    return jsonify({"completed": completed, "failed": failed, "invalid": invalid_count})
+    sort = payload.get("sort")
+    if sort is not None and sort not in inventory_value.SORT_KEYS:
+        return (
+            jsonify({"error": f"sort must be one of {inventory_value.SORT_KEYS}"}),
+            400,
+        )
+
+    capture, error = _requested_capture("api_users")
+    if error:
+        return error
+    totals = inventory_value.InventoryValue()
+    with capture or contextlib.nullcontext():
+        completed, failed, _ = await fetch_and_process_many(
+            ids, sort=sort, totals=totals
+        )
+    body = {
+        "completed": completed,
+        "failed": failed,
+        "invalid": invalid_count,
+        "value": totals.to_dict(),
+    }
+    if capture:
+        body["profile"] = capture.summary()
+    return jsonify(body)
+
+
+@app.post("/api/reprice")
+async def api_reprice():
+    """Reprice stored scans with the current prices without rescanning.
+
+    JSON body: optional ``ids`` (default: every stored scan) and ``force`` to
+    reprice scans already priced by the current generation.  Refreshed cards
+    are pushed to ``/api/events`` subscribers.
+    """
+    payload = request.get_json(silent=True) or {}
+    ids_raw = payload.get("ids")
+    if ids_raw is not None and not isinstance(ids_raw, list):
+        return jsonify({"error": "ids must be a list"}), 400
+    ids = None
+    if ids_raw is not None:
+        ids = []
+        for raw in ids_raw:
+            try:
+                ids.append(sac.convert_to_steam64(str(raw)))
+            except ValueError:
+                continue
+    started = time.perf_counter()
+    results = await reprice_stored_scans(ids, force=bool(payload.get("force")))
+    return jsonify(
+        {
+            "price_generation": valuation_service.get_valuation_service().generation,
+            "repriced": sum(1 for r in results if r.repriced),
+            "skipped": sum(1 for r in results if not r.repriced),
+            "changed_items": sum(r.changed for r in results),
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+            "results": [
+                {k: v for k, v in r.to_dict().items() if k != "value"} for r in results
+            ],
+        }
+    )
+
+
+@app.get("/api/events")
+def api_events():
+    """Stream refreshed user cards as server-sent ``card`` events.
+
+    ``run.py`` serves this path with :class:`card_events.EventStreamApp`
+    instead; this view is used by the development server.
+    """
+    return Response(
+        card_events.get_card_events().stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/export/<int:steamid64>")
+async def export_inventory(steamid64: int):
+    """Stream a user's enriched items as NDJSON or CSV.
+
+    Query parameters: ``format`` (``ndjson`` or ``csv``), ``columns`` (comma
+    separated item fields) and ``source`` (``cache`` for the stored scan,
+    ``live`` to fetch now; by default the stored scan is used when present).
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in export.FORMATS:
+        return jsonify({"error": f"format must be one of {export.FORMATS}"}), 400
+    columns = export.parse_columns(request.args.get("columns"))
+    source = request.args.get("source", "auto")
+    if source not in ("auto", "cache", "live"):
+        return jsonify({"error": "source must be auto, cache or live"}), 400
+
+    store = scan_store.get_scan_store()
+    steamid = str(steamid64)
+    if source == "live" or (source == "auto" and store.meta(steamid) is None):
+        inv_result = await fetch_inventory(steamid)
+        if inv_result["status"] != "parsed":
+            return jsonify({"error": f"inventory {inv_result['status']}"}), 404
+        items = inv_result["items"]
+        key_price = inv_result.get("key_price")
+        if key_price is None:
+            key_price = price_service.key_price(local_data.CURRENCIES)
+        value = inventory_value.summarize_items(items, key_price, steamid=steamid)
+        # No profile is fetched here; the stored one is kept.
+        scan_store.record_scan(
+            steamid,
+            items,
+            "parsed",
+            price_generation=inv_result.get("price_generation"),
+            value=value.to_dict(),
+        )
+    elif store.meta(steamid) is None:
+        return jsonify({"error": "no stored scan"}), 404
+    else:
+        items = store.iter_items(steamid)
+
+    # A plain generator: async views cannot use ``stream_with_context`` and the
+    # body needs nothing from the request context.
+    return Response(
+        export.iter_items(items, fmt, columns),
+        mimetype=export.content_type(fmt),
+        headers={
+            "Content-Disposition": f"attachment; filename={steamid}.{fmt}",
+        },
+    )
+
+
+@app.get("/api/search")
+def search_items():
+    """Search items across every stored scan.
+
+    Query parameters: ``q`` (name words), the exact filters in
+    :data:`utils.search_index.FACETS`, ``min_price``/``max_price`` in
+    refined, ``steamid`` and ``limit``.
+    """
+    started = time.perf_counter()
+    min_price = request.args.get("min_price", type=float)
+    max_price = request.args.get("max_price", type=float)
+    limit = min(request.args.get("limit", 100, type=int), 1000)
+    filters = {f: request.args.get(f) for f in search_index.FACETS}
+
+    index = search_index.get_search_index()
+    index.refresh()
+    result = index.search(
+        request.args.get("q", ""),
+        filters=filters,
+        min_price=min_price,
+        max_price=max_price,
+        steamid=request.args.get("steamid"),
+        limit=limit,
+    )
+    result["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return jsonify(result)
+
+
+@app.get("/api/value")
+def api_value():
+    """Total inventory value across every stored scan.
+
+    Query parameters: ``sort`` (one of
+    :data:`utils.inventory_value.SORT_KEYS`), ``limit`` for the per-user
+    ranking and ``top`` for the most valuable items overall.
+    """
+    sort = request.args.get("sort", "value")
+    if sort not in inventory_value.SORT_KEYS:
+        return (
+            jsonify({"error": f"sort must be one of {inventory_value.SORT_KEYS}"}),
+            400,
+        )
+    limit = min(request.args.get("limit", 100, type=int), 1000)
+    top = min(request.args.get("top", inventory_value.TOP_ITEMS, type=int), 100)
+
+    store = scan_store.get_scan_store()
+    totals = inventory_value.InventoryValue()
+    ranked = []
+    for steamid in store.steamids():
+        meta = store.meta(steamid) or {}
+        if not isinstance(meta.get("value"), dict):
+            continue
+        value = inventory_value.InventoryValue.from_dict(meta["value"])
+        totals.add(value, top=top)
+        user = {
+            "steamid": steamid,
+            "scanned_at": meta.get("scanned_at"),
+            "price_generation": meta.get("price_generation"),
+            "total_value_raw": round(value.total_value_raw, 2),
+            "total_string": value.total_string,
+            "priced": value.priced,
+            "unpriced": value.unpriced,
+        }
+        ranked.append((inventory_value.sort_value(value, sort), user))
+    ranked.sort(key=lambda pair: -pair[0])
+    users = [user for _value, user in ranked[: max(limit, 0)]]
+    return jsonify({"total": totals.to_dict(), "users": users})
+
+
+@app.get("/api/watchlist")
+def watchlist_index():
+    """Return watched users with their schedule and recent changes."""
+    store = scan_store.get_scan_store()
+    entries = watchlist.get_watchlist().entries()
+    for entry in entries:
+        entry["scan"] = store.meta(entry["steamid"])
+    return jsonify({"entries": entries})
+
+
+@app.post("/api/watchlist")
+def watchlist_add():
+    """Watch the Steam IDs in ``ids``, optionally with an ``interval`` in seconds."""
+    payload = request.get_json(silent=True) or {}
+    ids_raw = payload.get("ids", [])
+    if not isinstance(ids_raw, list):
+        return jsonify({"error": "ids must be a list"}), 400
+    try:
+        interval = float(payload.get("interval", watchlist.DEFAULT_INTERVAL))
+    except (TypeError, ValueError):
+        return jsonify({"error": "interval must be a number"}), 400
+
+    added, invalid = [], []
+    for raw in ids_raw:
+        try:
+            steamid = sac.convert_to_steam64(str(raw))
+            added.append(watchlist.get_watchlist().add(steamid, interval))
+        except ValueError:
+            invalid.append(raw)
+    if not added:
+        return jsonify({"error": "Invalid Steam ID", "invalid": invalid}), 400
+    return jsonify({"added": added, "invalid": invalid})
+
+
+@app.get("/api/watchlist/<int:steamid64>")
+def watchlist_entry(steamid64: int):
+    """Return one watched user's entry and stored scan metadata."""
+    entry = watchlist.get_watchlist().get(str(steamid64))
+    if entry is None:
+        return jsonify({"error": "not watched"}), 404
+    entry["scan"] = scan_store.get_scan_store().meta(str(steamid64))
+    return jsonify(entry)
+
+
+@app.delete("/api/watchlist/<int:steamid64>")
+def watchlist_remove(steamid64: int):
+    """Stop watching a user; the stored scan is kept."""
+    if not watchlist.get_watchlist().remove(str(steamid64)):
+        return jsonify({"error": "not watched"}), 404
+    return jsonify({"removed": str(steamid64)})
+
+
+@app.get("/api/prices")
+def api_prices():
+    """Return the loaded price generation, its age and refresher state."""
+    status = valuation_service.price_status()
+    status["refresher"] = price_refresher.get_price_refresher().status()
+    return jsonify(status)
+
+
+@app.get("/api/prices/unmatched")
+def api_prices_unmatched():
+    """Return price map names the SKU index could not join to the schema."""
+    limit = request.args.get("limit", 50, type=int)
+    index = valuation_service.get_valuation_service().sku_index()
+    if index is None:
+        return jsonify({"error": "schema not loaded"}), 503
+    return jsonify(index.report(limit=max(limit, 0)))
+
+
+@app.get("/api/prices/history")
+def api_prices_history():
+    """Return an item's recorded price changes and the key price over time."""
+    name = request.args.get("name", "")
+    if not name:
+        return jsonify({"error": "name is required"}), 400
+    key = (
+        name,
+        request.args.get("quality", 6, type=int),
+        request.args.get("craftable", "1") != "0",
+        request.args.get("australium", "0") == "1",
+        request.args.get("effect", 0, type=int),
+        request.args.get("killstreak", 0, type=int),
+    )
+    start = request.args.get("start", type=float)
+    end = request.args.get("end", type=float)
+    history = price_history.get_price_history()
+    points = history.curve(key, start, end, request.args.get("step", type=int))
+    return jsonify(
+        {
+            "points": [
+                {"ts": ts, "value_raw": value, "currency": currency}
+                for ts, value, currency in points
+            ],
+            "key_prices": [
+                {"ts": ts, "value_raw": value}
+                for ts, value in history.key_prices(start, end)
+            ],
+        }
+    )
 
 
 @app.get("/api/constants")
@@ -449,6 +837,49 @@ def api_constants():
     )
 
 
+@app.get("/metrics")
+def metrics_endpoint():
+    """Expose scan pipeline metrics in Prometheus text format."""
+    return Response(
+        metrics.render_prometheus(),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.route("/debug/extractors", methods=["GET", "DELETE"])
+def debug_extractors():
+    """Return (or reset with ``DELETE``) per-extractor enrichment timings."""
+    if not profiling.ENABLED:
+        return jsonify({"error": "extractor profiling is disabled"}), 404
+    if request.method == "DELETE":
+        profiling.reset()
+        return jsonify({"reset": True})
+    return jsonify({"extractors": profiling.snapshot()})
+
+
+@app.route("/debug/allocations", methods=["GET", "DELETE"])
+def debug_allocations():
+    """Return (or clear with ``DELETE``) recent per-scan allocation reports."""
+    if not alloc_tracker.ENABLED:
+        return jsonify({"error": "allocation tracking is disabled"}), 404
+    if request.method == "DELETE":
+        alloc_tracker.reset()
+        return jsonify({"reset": True})
+    return jsonify({"reports": alloc_tracker.recent()})
+
+
+@app.get("/debug/profiles/<profile_id>")
+def debug_profile(profile_id: str):
+    """Return collapsed stacks captured by a ``?profile=1`` request."""
+    token = request.headers.get(scan_profiler.ADMIN_HEADER)
+    if not scan_profiler.admin_authorized(token):
+        return jsonify({"error": "admin token required"}), 403
+    folded = scan_profiler.load_profile(profile_id)
+    if folded is None:
+        return jsonify({"error": "profile not found"}), 404
+    return Response(folded, mimetype="text/plain")
+
+
 # --- Flask routes -----------------------------------------------------------
 
 
@@ -487,7 +918,7 @@ async def index():
             flash(
                 "No valid Steam IDs found. Please input in SteamID64, SteamID2, or SteamID3 format."
             )
-            return render_template(
+            return render_timed(
                 "index.html",
                 completed_users=[],
                 failed_users=[],
@@ -495,7 +926,7 @@ async def index():
                 ids=[],
                 failed_ids=[],
             )
-    return render_template(
+    return render_timed(
         "index.html",
         completed_users=completed_users,
         failed_users=failed_users,
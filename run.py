@@ -5,7 +5,16 @@ import sys
 from hypercorn.asyncio import serve
 from hypercorn.config import Config
 
-from app import app, kill_process_on_port, _setup_test_mode, ARGS
+from app import (
+    app,
+    build_user_data_async,
+    kill_process_on_port,
+    reprice_stored_scans,
+    _setup_test_mode,
+    ARGS,
+)
+from utils import card_events, price_refresher, valuation_service, watchlist
+from utils.metrics import monitor_event_loop_lag
 from utils.cache_manager import (
     fetch_missing_cache_files,
     COLOR_YELLOW,
@@ -36,10 +45,29 @@ async def main() -> None:
     kill_process_on_port(port)
     if ARGS.test:
         await _setup_test_mode()
+    # Prices and the SKU index are loaded before the first request needs them.
+    await asyncio.to_thread(valuation_service.warm_up)
     config = Config()
     config.bind = [f"0.0.0.0:{port}"]
     config.use_reloader = not ARGS.test
-    await serve(app, config)
+    background = [asyncio.create_task(monitor_event_loop_lag())]
+    if watchlist.scheduler_enabled() and not ARGS.test:
+        scheduler = watchlist.WatchlistScheduler(
+            watchlist.get_watchlist(), build_user_data_async
+        )
+        background.append(asyncio.create_task(scheduler.run()))
+    if price_refresher.refresher_enabled() and not ARGS.test:
+        refresher = price_refresher.get_price_refresher()
+        refresher.listeners.append(reprice_stored_scans)
+        background.append(asyncio.create_task(refresher.run()))
+    # ``/api/events`` streams are served on the loop instead of holding
+    # one executor thread each; everything else goes to the Flask app.
+    asgi_app = card_events.EventStreamApp(app, max_body_size=config.wsgi_max_body_size)
+    try:
+        await serve(asgi_app, config)
+    finally:
+        for task in background:
+            task.cancel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+"""Offline benchmarks for enrichment, stacking, pricing and startup.
+
+Run from the repository root::
+
+    python -m scripts.benchmark --output bench_output.json
+    python -m scripts.benchmark --baseline bench_baseline.json --max-regression 0.25
+
+Inventories are generated from the cached item schema when it is present and
+from :mod:`scripts.synthetic_data` otherwise, so no network access is needed.
+Each case reports the median, minimum and mean wall time over ``--repeat``
+runs.  With ``--baseline`` the exit status is 1 when any case's median is
+slower than the baseline by more than its allowed ratio.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List
+
+from flask import Flask, render_template
+
+from scripts.synthetic_data import (
+    generate_inventory,
+    generate_price_dump,
+    write_schema_files,
+)
+from utils import local_data, price_loader, price_snapshot
+from utils.inventory import extractors_grade_tier
+from utils.inventory_processor import enrich_inventory, process_inventory
+from utils.stacking import stack_items
+from utils.valuation_service import ValuationService
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = (1000, 5000, 20000)
+DEFAULT_OUTPUT = BASE_DIR / "bench_output.json"
+
+# ``local_data`` attributes pointed at synthetic files when the cache is empty.
+_SCHEMA_PATH_ATTRS = {
+    "attributes": "ATTRIBUTES_FILE",
+    "items": "ITEMS_FILE",
+    "qualities": "QUALITIES_FILE",
+    "particles": "PARTICLES_FILE",
+    "currencies": "CURRENCIES_FILE",
+}
+
+
+def time_case(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Run ``func`` once to warm up, then ``repeat`` times and summarize."""
+
+    func()
+    runs: List[float] = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(runs),
+        "min_s": min(runs),
+        "mean_s": statistics.fmean(runs),
+        "runs": len(runs),
+    }
+
+
+def _load_schema(workdir: Path) -> str:
+    """Load the cached schema, falling back to synthetic files in ``workdir``."""
+
+    try:
+        local_data.load_files(auto_refetch=False)
+        return "cache"
+    except RuntimeError:
+        pass
+    paths = write_schema_files(workdir / "schema")
+    for key, attr in _SCHEMA_PATH_ATTRS.items():
+        setattr(local_data, attr, paths[key])
+    local_data.load_files(auto_refetch=False)
+    return "synthetic"
+
+
+def _offline_grades() -> None:
+    """Pre-seed the grade endpoint memo so enrichment never hits the network."""
+
+    for defindex in local_data.ITEMS_BY_DEFINDEX:
+        if defindex not in local_data.ITEM_GRADE_BY_DEFINDEX:
+            extractors_grade_tier._grade_endpoint_lookups().setdefault(defindex, None)
+
+
+def _prices_source(workdir: Path) -> Path:
+    """Return the cached price dump, or a synthetic one written to ``workdir``."""
+
+    cached = price_loader.PRICES_FILE
+    if cached.exists() and cached.stat().st_size >= price_loader.EMPTY_THRESHOLD:
+        return cached
+    path = workdir / "prices.json"
+    path.write_text(json.dumps(generate_price_dump(local_data.ITEMS_BY_DEFINDEX)))
+    return path
+
+
+def _app_import_case(repeat: int) -> Dict[str, Any]:
+    """Time ``import app`` in a fresh interpreter when the cache allows it."""
+
+    prices = BASE_DIR / price_loader.PRICES_FILE
+    if not (local_data.ITEMS_FILE.exists() and prices.exists()):
+        return {"skipped": "schema or price cache missing"}
+    env = dict(os.environ)
+    env.setdefault("STEAM_API_KEY", "benchmark")
+    env.setdefault("BPTF_API_KEY", "benchmark")
+    cmd = [sys.executable, "-c", "import app"]
+
+    def run() -> None:
+        subprocess.run(cmd, cwd=BASE_DIR, env=env, check=True, capture_output=True)
+
+    try:
+        return time_case(run, repeat)
+    except subprocess.CalledProcessError as exc:
+        return {"skipped": f"import failed: {exc.stderr.decode(errors='replace')}"}
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    repeat: int = 5,
+    only: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Run every benchmark case and return the JSON-serializable report."""
+
+    filters = tuple(only)
+
+    def wanted(name: str) -> bool:
+        return not filters or any(f in name for f in filters)
+
+    cases: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        schema_source = _load_schema(workdir)
+        if wanted("load_files"):
+            cases["load_files"] = time_case(
+                lambda: local_data.load_files(auto_refetch=False), repeat
+            )
+        # After the last reload: the memo is reset once per schema generation.
+        _offline_grades()
+
+        prices_path = _prices_source(workdir)
+        price_map = price_loader.build_price_map(prices_path)
+        map_path = price_loader.dump_price_map(price_map, workdir / "price_map.json")
+        if wanted("build_price_map"):
+            cases["build_price_map"] = time_case(
+                lambda: price_loader.build_price_map(prices_path), repeat
+            )
+        if wanted("load_price_map"):
+            cases["load_price_map"] = time_case(
+                lambda: price_loader.load_price_map(map_path), repeat
+            )
+        if wanted("load_price_map_snapshot"):
+            snapshot_path = map_path.with_suffix(".bin")
+            cases["load_price_map_snapshot"] = time_case(
+                lambda: price_snapshot.PriceSnapshot(snapshot_path).close(), repeat
+            )
+
+        service = ValuationService(price_map=price_map)
+        flask_app = Flask(__name__, template_folder=str(BASE_DIR / "templates"))
+        for size in sizes:
+            inventory = generate_inventory(size, local_data.ITEMS_BY_DEFINDEX)
+            if wanted(f"enrich_{size}"):
+                cases[f"enrich_{size}"] = time_case(
+                    lambda inv=inventory: enrich_inventory(inv, service), repeat
+                )
+            if wanted(f"process_{size}"):
+                cases[f"process_{size}"] = time_case(
+                    lambda inv=inventory: process_inventory(inv, service), repeat
+                )
+            if not (wanted(f"stack_{size}") or wanted(f"render_{size}")):
+                continue
+            enriched = process_inventory(inventory, service)
+            if wanted(f"stack_{size}"):
+                cases[f"stack_{size}"] = time_case(
+                    lambda items=enriched: stack_items(items), repeat
+                )
+            if wanted(f"render_{size}"):
+                user = SimpleNamespace(
+                    steamid="76561197960265728",
+                    username="benchmark",
+                    avatar="",
+                    profile="",
+                    playtime=0,
+                    status="parsed",
+                    items=stack_items(enriched),
+                )
+
+                def render(user: SimpleNamespace = user) -> None:
+                    with flask_app.app_context():
+                        render_template("_user.html", user=user)
+
+                cases[f"render_{size}"] = time_case(render, repeat)
+
+    if wanted("app_import"):
+        cases["app_import"] = _app_import_case(repeat)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "schema_source": schema_source,
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float = 0.25,
+    thresholds: Dict[str, float] | None = None,
+) -> List[str]:
+    """Return a message for each case slower than ``baseline`` allows.
+
+    A case regresses when its median exceeds the baseline median by more than
+    ``max_regression`` (a ratio, so ``0.25`` means 25% slower).  ``thresholds``
+    overrides the ratio per case name.  Cases missing from either report or
+    marked as skipped are ignored.
+    """
+
+    thresholds = thresholds or {}
+    regressions: List[str] = []
+    base_cases = baseline.get("cases", {})
+    for name, current in results.get("cases", {}).items():
+        previous = base_cases.get(name)
+        if not previous or "median_s" not in current or "median_s" not in previous:
+            continue
+        if previous["median_s"] <= 0:
+            continue
+        allowed = thresholds.get(name, max_regression)
+        ratio = current["median_s"] / previous["median_s"] - 1
+        if ratio > allowed:
+            regressions.append(
+                f"{name}: {current['median_s'] * 1000:.2f} ms vs "
+                f"{previous['median_s'] * 1000:.2f} ms "
+                f"(+{ratio:.0%}, allowed +{allowed:.0%})"
+            )
+    return regressions
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    """Return ``results`` as a fixed-width text table."""
+
+    lines = [f"{'case':<24} {'median ms':>11} {'min ms':>11} {'runs':>5}"]
+    for name, row in results["cases"].items():
+        if "skipped" in row:
+            lines.append(f"{name:<24} skipped: {row['skipped'].strip()[:60]}")
+            continue
+        lines.append(
+            f"{name:<24} {row['median_s'] * 1000:>11.2f} "
+            f"{row['min_s'] * 1000:>11.2f} {row['runs']:>5}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_threshold(value: str) -> tuple[str, float]:
+    name, sep, ratio = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected CASE=RATIO")
+    try:
+        return name, float(ratio)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid ratio {ratio!r}") from exc
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma separated inventory sizes (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        help="Only run cases whose name contains this text (repeatable)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=DEFAULT_OUTPUT, help="JSON results path"
+    )
+    parser.add_argument("--baseline", type=Path, help="Previous results to compare")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown ratio versus the baseline (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        type=_parse_threshold,
+        metavar="CASE=RATIO",
+        help="Per-case slowdown ratio, e.g. enrich_20000=0.5",
+    )
+    args = parser.parse_args(argv)
+
+    # Per-item fallback warnings would dominate the timings.
+    logging.disable(logging.WARNING)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = run_benchmarks(sizes, args.repeat, args.only)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(format_report(results))
+    print(f"Results written to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.max_regression, dict(args.threshold))
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
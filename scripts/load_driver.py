@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Drive ``POST /api/users`` at a fixed concurrency and report latency.
+
+Typically run against an app pointed at :mod:`scripts.standin_server`::
+
+    python -m scripts.load_driver --url http://127.0.0.1:5000 --concurrency 16 --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+import httpx
+
+FIRST_STEAMID64 = 76561197960265728
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Return the nearest-rank ``pct`` percentile of ``samples``."""
+
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(
+    latencies: Sequence[float], statuses: Counter, elapsed: float
+) -> Dict[str, Any]:
+    """Return throughput and latency percentiles (in milliseconds)."""
+
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    *,
+    total: int,
+    concurrency: int,
+    ids_per_request: int = 1,
+    first_id: int = FIRST_STEAMID64,
+) -> Dict[str, Any]:
+    """Send ``total`` requests with at most ``concurrency`` in flight."""
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for n in counter:
+            base = first_id + n * ids_per_request
+            ids = [str(base + i) for i in range(ids_per_request)]
+            start = time.perf_counter()
+            try:
+                resp = await client.post("/api/users", json={"ids": ids})
+                statuses[resp.status_code] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Return ``summary`` as human readable lines."""
+
+    statuses = ", ".join(f"{k}: {v}" for k, v in summary["statuses"].items())
+    return "\n".join(
+        [
+            f"requests     {summary['requests']} in {summary['elapsed_s']} s",
+            f"throughput   {summary['throughput_rps']} req/s",
+            f"latency ms   p50 {summary['p50_ms']}  p95 {summary['p95_ms']}  "
+            f"p99 {summary['p99_ms']}  max {summary['max_ms']}",
+            f"statuses     {statuses}",
+        ]
+    )
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=timeout, limits=limits
+    ) as client:
+        return await run_load(
+            client,
+            total=args.requests,
+            concurrency=args.concurrency,
+            ids_per_request=args.ids_per_request,
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--ids-per-request", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="Print JSON summary")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(_main(args))
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
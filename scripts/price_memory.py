@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Compare the memory used by the dict and compact forms of the price map.
+
+Run from the repository root::
+
+    python -m scripts.price_memory                    # cached or synthetic dump
+    python -m scripts.price_memory cache/prices.json --items 12000
+
+Each form is built twice in fresh interpreters: once to read the RSS growth
+and once under :mod:`tracemalloc` for the Python allocations the finished
+map retains.  The dict is built by
+:func:`~utils.price_loader.build_price_map`; the compact map is filled from
+:func:`~utils.price_loader.iter_price_entries` without a dict in between.
+Without a cached dump, one covering ``--items`` synthetic schema items is
+generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+import psutil
+
+from scripts.synthetic_data import generate_price_dump, synthetic_items
+from utils import price_loader
+from utils.price_table import CompactPriceMap
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FORMS = ("dict", "compact")
+
+
+def _build(form: str, prices_path: Path) -> Any:
+    if form == "compact":
+        return CompactPriceMap(price_loader.iter_price_entries(prices_path))
+    return price_loader.build_price_map(prices_path)
+
+
+def measure(form: str, prices_path: Path, trace: bool = False) -> Dict[str, Any]:
+    """Build the price map as ``form`` and return the memory it retains."""
+
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    price_map = _build(form, prices_path)
+    gc.collect()
+    result: Dict[str, Any] = {"form": form, "entries": len(price_map)}
+    if trace:
+        result["traced_mb"] = round(tracemalloc.get_traced_memory()[0] / 2**20, 1)
+        tracemalloc.stop()
+    else:
+        rss = process.memory_info().rss - rss_before
+        result["rss_mb"] = round(rss / 2**20, 1)
+    return result
+
+
+def _measure_in_child(form: str, prices_path: Path, trace: bool) -> Dict[str, Any]:
+    cmd = [sys.executable, "-m", "scripts.price_memory", "--child", form]
+    cmd += [str(prices_path)] + (["--trace"] if trace else [])
+    out = subprocess.run(cmd, cwd=BASE_DIR, check=True, capture_output=True)
+    return json.loads(out.stdout)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("prices", nargs="?", type=Path)
+    parser.add_argument("--items", type=int, default=12000)
+    parser.add_argument("--child", choices=FORMS, help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.prices, args.trace)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prices_path = args.prices or BASE_DIR / price_loader.PRICES_FILE
+        if not prices_path.exists():
+            prices_path = Path(tmp) / "prices.json"
+            dump = generate_price_dump(synthetic_items(args.items))
+            prices_path.write_text(json.dumps(dump))
+        results = [
+            {
+                **_measure_in_child(form, prices_path, False),
+                **_measure_in_child(form, prices_path, True),
+            }
+            for form in FORMS
+        ]
+
+    print(f"{'form':<10}{'entries':>10}{'RSS MB':>10}{'traced MB':>12}")
+    for result in results:
+        print(
+            f"{result['form']:<10}{result['entries']:>10}"
+            f"{result['rss_mb']:>10}{result['traced_mb']:>12}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Profile enrichment extractors against cached inventory files."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from utils import local_data
+from utils.inventory import profiling
+from utils.inventory_processor import process_inventory
+from utils.valuation_service import ValuationService
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Inventory JSON files (defaults to cached_inventories/*.json)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Passes per file")
+    parser.add_argument("--json", action="store_true", help="Print JSON rows")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted((BASE_DIR / "cached_inventories").glob("*.json"))
+    if not paths:
+        print("No inventory files found.")
+        return 1
+
+    local_data.load_files(auto_refetch=False)
+    service = ValuationService()
+    inventories = [json.loads(p.read_text()) for p in paths]
+
+    profiling.reset()
+    profiling.enable()
+    try:
+        for _ in range(max(args.repeat, 1)):
+            for data in inventories:
+                process_inventory(data, valuation_service=service)
+    finally:
+        profiling.disable()
+
+    rows = profiling.snapshot()
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(profiling.format_report(rows))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+"""Local stand-in for the Steam Web API and backpack.tf price endpoints.
+
+Serves ``GetPlayerItems``, ``GetPlayerSummaries``, ``GetOwnedGames``,
+``ResolveVanityURL``, ``IGetPrices`` and ``IGetCurrencies`` from recorded
+inventories in ``cached_inventories/`` or from :mod:`scripts.synthetic_data`,
+with configurable latency, error and rate-limit rates.  Point the app at it
+with::
+
+    python -m scripts.standin_server --port 8765 --latency-ms 80 --rate-limit-rate 0.02
+    STEAM_API_BASE_URL=http://127.0.0.1:8765 \\
+    BPTF_API_BASE_URL=http://127.0.0.1:8765 python run.py
+
+and drive load with :mod:`scripts.load_driver`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs
+
+from scripts.synthetic_data import (
+    currencies_payload,
+    generate_inventory,
+    generate_price_dump,
+    synthetic_items,
+    write_schema_files,
+)
+from utils import local_data
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour knobs for :class:`StandInApp`."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    private_rate: float = 0.0
+    inventory_size: int = 300
+    seed: int = 0
+
+
+def _digest(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode()).digest()[:8], "big")
+
+
+class StandInApp:
+    """Minimal ASGI application emulating the upstream APIs."""
+
+    def __init__(
+        self,
+        config: StandInConfig | None = None,
+        items_by_defindex: Dict[int, Dict[str, Any]] | None = None,
+        recorded: Dict[str, Dict[str, Any]] | None = None,
+    ) -> None:
+        self.config = config or StandInConfig()
+        self.items_by_defindex = items_by_defindex or synthetic_items(2000)
+        self.recorded = recorded or {}
+        self._rng = random.Random(self.config.seed)
+        self._prices: bytes | None = None
+        self._inventories: Dict[str, Dict[str, Any]] = {}
+        # Keyed without trailing slashes; see :meth:`handle`.
+        self.routes: Dict[str, Callable[[Dict[str, str]], Tuple[int, Any]]] = {
+            "/IEconItems_440/GetPlayerItems/v0001": self.player_items,
+            "/ISteamUser/GetPlayerSummaries/v2": self.player_summaries,
+            "/IPlayerService/GetOwnedGames/v0001": self.owned_games,
+            "/ISteamUser/ResolveVanityURL/v1": self.resolve_vanity,
+            "/IGetPrices/v4": self.prices,
+            "/IGetCurrencies/v1": self.currencies,
+        }
+
+    # -- endpoints ---------------------------------------------------------
+
+    def player_items(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        steamid = params.get("steamid", "")
+        if self.config.private_rate and (
+            _digest(steamid) % 1000 < self.config.private_rate * 1000
+        ):
+            return 403, {"result": {"status": 15}}
+        inventory = self.recorded.get(steamid)
+        if inventory is None and self.recorded:
+            keys = sorted(self.recorded)
+            inventory = self.recorded[keys[_digest(steamid) % len(keys)]]
+        if inventory is None:
+            inventory = self._inventories.get(steamid)
+        if inventory is None:
+            inventory = generate_inventory(
+                self.config.inventory_size,
+                self.items_by_defindex,
+                seed=_digest(steamid) ^ self.config.seed,
+            )
+            self._inventories[steamid] = inventory
+        return 200, {"result": inventory}
+
+    def player_summaries(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        players = [
+            {
+                "steamid": sid,
+                "personaname": f"standin-{sid[-4:]}",
+                "profileurl": f"https://steamcommunity.com/profiles/{sid}/",
+                "avatarfull": "",
+                "communityvisibilitystate": 3,
+            }
+            for sid in params.get("steamids", "").split(",")
+            if sid
+        ]
+        return 200, {"response": {"players": players}}
+
+    def owned_games(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        minutes = _digest(params.get("steamid", "")) % 600_000
+        games = [{"appid": 440, "playtime_forever": minutes}]
+        return 200, {"response": {"game_count": 1, "games": games}}
+
+    def resolve_vanity(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        vanity = params.get("vanityurl", "")
+        if not vanity:
+            return 200, {"response": {"success": 42, "message": "No match"}}
+        steamid = 76561197960265728 + _digest(vanity) % 1_000_000_000
+        return 200, {"response": {"success": 1, "steamid": str(steamid)}}
+
+    def prices(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        if self._prices is None:
+            dump = generate_price_dump(self.items_by_defindex, seed=self.config.seed)
+            self._prices = json.dumps(dump).encode()
+        return 200, self._prices
+
+    def currencies(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        return 200, currencies_payload()
+
+    # -- ASGI plumbing -----------------------------------------------------
+
+    async def _delay(self) -> None:
+        delay = self.config.latency_ms + self._rng.uniform(0, self.config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def handle(self, path: str, query: str) -> Tuple[int, Any]:
+        """Return ``(status, body)`` for a request, applying failure rates."""
+
+        handler = self.routes.get(path.rstrip("/"))
+        if handler is None:
+            return 404, {"error": "not found"}
+        roll = self._rng.random()
+        if roll < self.config.rate_limit_rate:
+            return 429, {"error": "Too Many Requests"}
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return 500, {"error": "Internal Server Error"}
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        return handler(params)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        await self._delay()
+        status, body = self.handle(scope["path"], scope["query_string"].decode())
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+
+def load_recorded(directory: Path) -> Dict[str, Dict[str, Any]]:
+    """Return cached ``GetPlayerItems`` results keyed by SteamID64."""
+
+    recorded: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and isinstance(data.get("items"), list):
+            recorded[path.stem] = data
+    return recorded
+
+
+def _schema_items() -> Dict[int, Dict[str, Any]]:
+    try:
+        local_data.load_files(auto_refetch=False)
+    except RuntimeError:
+        return synthetic_items(2000)
+    return local_data.ITEMS_BY_DEFINDEX or synthetic_items(2000)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--private-rate", type=float, default=0.0)
+    parser.add_argument("--inventory-size", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--recorded",
+        type=Path,
+        default=BASE_DIR / "cached_inventories",
+        help="Directory of recorded inventories (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--synthetic-only",
+        action="store_true",
+        help="Ignore recorded inventories and the cached schema",
+    )
+    parser.add_argument(
+        "--write-schema",
+        type=Path,
+        metavar="DIR",
+        help="Write matching synthetic schema files to DIR and print TF2_* exports",
+    )
+    args = parser.parse_args(argv)
+
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        private_rate=args.private_rate,
+        inventory_size=args.inventory_size,
+        seed=args.seed,
+    )
+    items = synthetic_items(2000) if args.synthetic_only else _schema_items()
+    recorded = {} if args.synthetic_only else load_recorded(args.recorded)
+    if args.write_schema:
+        paths = write_schema_files(args.write_schema, items)
+        for key, path in paths.items():
+            print(f"export TF2_{key.upper()}_FILE={path.resolve()}")
+
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    hconfig = Config()
+    hconfig.bind = [f"{args.host}:{args.port}"]
+    print(
+        f"Stand-in serving {len(items)} schema items and {len(recorded)} recorded "
+        f"inventories on http://{args.host}:{args.port}"
+    )
+    asyncio.run(serve(StandInApp(config, items, recorded), hconfig))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
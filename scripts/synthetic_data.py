@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+"""Deterministic synthetic schema, inventories and price dumps.
+
+Used by the benchmark suite and the local Steam/backpack.tf stand-in so both
+run fully offline.  Inventories are drawn from whichever item schema is
+supplied (normally the cached ``items.json`` loaded by
+:func:`utils.local_data.load_files`); when no schema is cached a small
+synthetic one is generated instead.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+KEY_PRICE_REFINED = 60.0
+
+# Attribute definitions the extractors look up by class.
+SYNTHETIC_ATTRIBUTES: List[Dict[str, Any]] = [
+    {
+        "defindex": 134,
+        "name": "attach particle effect",
+        "attribute_class": "set_attached_particle",
+    },
+    {
+        "defindex": 142,
+        "name": "set item tint RGB",
+        "attribute_class": "set_item_tint_rgb",
+    },
+    {
+        "defindex": 187,
+        "name": "set supply crate series",
+        "attribute_class": "supply_crate_series",
+    },
+    {"defindex": 214, "name": "kill eater", "attribute_class": "kill_eater"},
+    {
+        "defindex": 292,
+        "name": "kill eater score type",
+        "attribute_class": "kill_eater_score_type",
+    },
+    {
+        "defindex": 725,
+        "name": "set_item_texture_wear",
+        "attribute_class": "set_item_texture_wear",
+    },
+    {
+        "defindex": 834,
+        "name": "paintkit_proto_def_index",
+        "attribute_class": "paintkit_proto_def_index",
+    },
+    {
+        "defindex": 866,
+        "name": "custom_paintkit_seed_lo",
+        "attribute_class": "custom_paintkit_seed_lo",
+    },
+    {
+        "defindex": 867,
+        "name": "custom_paintkit_seed_hi",
+        "attribute_class": "custom_paintkit_seed_hi",
+    },
+    {
+        "defindex": 1004,
+        "name": "SPELL: set item tint RGB",
+        "attribute_class": "set_item_tint_rgb_override",
+    },
+    {
+        "defindex": 1009,
+        "name": "SPELL: Halloween death ghosts",
+        "attribute_class": "halloween_death_ghosts",
+    },
+    {
+        "defindex": 2013,
+        "name": "killstreak effect",
+        "attribute_class": "killstreak_effect",
+    },
+    {
+        "defindex": 2014,
+        "name": "killstreak idleeffect",
+        "attribute_class": "killstreak_idleeffect",
+    },
+    {"defindex": 2025, "name": "killstreak tier", "attribute_class": "killstreak_tier"},
+    {
+        "defindex": 2027,
+        "name": "is australium item",
+        "attribute_class": "is_australium_item",
+    },
+]
+
+SYNTHETIC_QUALITIES = {
+    "Normal": 0,
+    "Genuine": 1,
+    "Vintage": 3,
+    "Unusual": 5,
+    "Unique": 6,
+    "Strange": 11,
+    "Haunted": 13,
+    "Collector's": 14,
+    "Decorated Weapon": 15,
+}
+
+EFFECT_IDS = (13, 17, 34, 701, 702, 703, 3001, 3010)
+PAINT_VALUES = (3100495, 8208497, 1315860, 12377523, 15185211)
+
+
+def synthetic_items(count: int = 600) -> Dict[int, Dict[str, Any]]:
+    """Return a schema map of ``count`` items spread across item categories."""
+
+    items: Dict[int, Dict[str, Any]] = {
+        5002: {
+            "defindex": 5002,
+            "name": "Refined Metal",
+            "item_name": "Refined Metal",
+            "item_class": "craft_item",
+            "craft_class": "craft_bar",
+        },
+        5021: {
+            "defindex": 5021,
+            "name": "Mann Co. Supply Crate Key",
+            "item_name": "Mann Co. Supply Crate Key",
+            "item_class": "tool",
+            "craft_class": "tool",
+        },
+    }
+    for i in range(count):
+        defindex = 10000 + i
+        kind = i % 4
+        if kind == 0:
+            entry = {
+                "item_class": "tf_weapon_rocketlauncher",
+                "craft_class": "weapon",
+                "item_name": f"Synthetic Launcher {i}",
+            }
+        elif kind == 1:
+            entry = {
+                "item_class": "tf_wearable",
+                "craft_class": "hat",
+                "item_name": f"Synthetic Hat {i}",
+            }
+        elif kind == 2:
+            entry = {
+                "item_class": "tool",
+                "craft_class": "tool",
+                "item_name": f"Synthetic Tool {i}",
+            }
+        else:
+            entry = {
+                "item_class": "supply_crate",
+                "craft_class": "supply_crate",
+                "item_name": f"Synthetic Crate {i}",
+            }
+        entry.update(
+            {
+                "defindex": defindex,
+                "name": entry["item_name"],
+                "image_url": f"https://media.steampowered.com/apps/440/icons/{defindex}.png",
+            }
+        )
+        items[defindex] = entry
+    return items
+
+
+def _by_category(items_by_defindex: Dict[int, Dict[str, Any]]) -> Dict[str, List[int]]:
+    groups: Dict[str, List[int]] = {"weapon": [], "hat": [], "tool": [], "other": []}
+    for defindex, entry in items_by_defindex.items():
+        if not isinstance(entry, dict):
+            continue
+        craft = entry.get("craft_class") or entry.get("craft_material_type")
+        if craft == "weapon":
+            groups["weapon"].append(defindex)
+        elif craft == "hat" or entry.get("item_class") == "tf_wearable":
+            groups["hat"].append(defindex)
+        elif entry.get("item_class") == "tool":
+            groups["tool"].append(defindex)
+        else:
+            groups["other"].append(defindex)
+    fallback = sorted(items_by_defindex) or [5002]
+    return {k: sorted(v) or fallback for k, v in groups.items()}
+
+
+def generate_inventory(
+    count: int,
+    items_by_defindex: Dict[int, Dict[str, Any]],
+    *,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Return a ``GetPlayerItems`` result with ``count`` synthetic assets."""
+
+    rng = random.Random(seed)
+    groups = _by_category(items_by_defindex)
+    assets: List[Dict[str, Any]] = []
+    for i in range(count):
+        roll = rng.random()
+        attrs: List[Dict[str, Any]] = []
+        asset: Dict[str, Any] = {
+            "id": 1_000_000 + i,
+            "original_id": 1_000_000 + i,
+            "level": rng.randint(1, 100),
+            "origin": rng.choice((0, 1, 4, 8)),
+        }
+        if roll < 0.35:
+            asset["defindex"] = rng.choice(groups["weapon"])
+            asset["quality"] = rng.choice((6, 11, 11, 1, 3))
+            if asset["quality"] == 11:
+                attrs.append({"defindex": 214, "value": rng.randint(0, 50000)})
+            if rng.random() < 0.3:
+                attrs.append({"defindex": 2025, "float_value": rng.randint(1, 3)})
+                attrs.append({"defindex": 2014, "float_value": rng.randint(1, 7)})
+                attrs.append({"defindex": 2013, "float_value": rng.randint(2002, 2008)})
+            if rng.random() < 0.05:
+                attrs.append({"defindex": 2027, "float_value": 1})
+        elif roll < 0.55:
+            asset["defindex"] = rng.choice(groups["hat"])
+            asset["quality"] = rng.choice((6, 6, 5, 11, 13))
+            if asset["quality"] == 5:
+                attrs.append({"defindex": 134, "float_value": rng.choice(EFFECT_IDS)})
+            if rng.random() < 0.2:
+                attrs.append({"defindex": 142, "float_value": rng.choice(PAINT_VALUES)})
+            if rng.random() < 0.05:
+                attrs.append({"defindex": 1009, "float_value": 1})
+        elif roll < 0.65:
+            asset["defindex"] = rng.choice(groups["weapon"])
+            asset["quality"] = 15
+            attrs.append({"defindex": 834, "value": rng.randint(100, 400)})
+            attrs.append(
+                {"defindex": 725, "float_value": rng.choice((0.2, 0.4, 0.6, 0.8, 1.0))}
+            )
+            asset["descriptions"] = [
+                {"value": "Killstreaks Active"},
+                {"value": "<span>Sheen: Team Shine</span>"},
+            ]
+        elif roll < 0.85:
+            # Currency and tools stack heavily in real backpacks.
+            asset["defindex"] = (
+                rng.choice((5002, 5021))
+                if 5002 in items_by_defindex
+                else rng.choice(groups["tool"])
+            )
+            asset["quality"] = 6
+        else:
+            asset["defindex"] = rng.choice(groups["other"])
+            asset["quality"] = 6
+            attrs.append({"defindex": 187, "float_value": rng.randint(1, 100)})
+        if rng.random() < 0.05:
+            asset["flag_cannot_craft"] = True
+        asset["attributes"] = attrs
+        assets.append(asset)
+    return {"status": 1, "num_backpack_slots": max(count, 300), "items": assets}
+
+
+def generate_price_dump(
+    items_by_defindex: Dict[int, Dict[str, Any]],
+    *,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Return an ``IGetPrices`` v4 style payload covering ``items_by_defindex``."""
+
+    rng = random.Random(seed)
+    entries: Dict[str, Any] = {}
+
+    def price() -> Dict[str, Any]:
+        value_raw = round(rng.uniform(0.05, 400.0), 2)
+        return {
+            "value": value_raw,
+            "value_raw": value_raw,
+            "currency": "metal",
+            "last_update": 1_700_000_000 + rng.randint(0, 10_000_000),
+        }
+
+    for defindex, entry in sorted(items_by_defindex.items()):
+        if not isinstance(entry, dict):
+            continue
+        name = entry.get("item_name") or entry.get("name")
+        if not name:
+            continue
+        prices: Dict[str, Any] = {
+            "6": {"Tradable": {"Craftable": [price()], "Non-Craftable": [price()]}},
+            "11": {"Tradable": {"Craftable": [price()]}},
+        }
+        if (
+            entry.get("craft_class") == "hat"
+            or entry.get("item_class") == "tf_wearable"
+        ):
+            prices["5"] = {
+                "Tradable": {"Craftable": {str(e): price() for e in EFFECT_IDS}}
+            }
+        entries.setdefault(name, {"defindex": [defindex], "prices": {}})[
+            "prices"
+        ].update(prices)
+        if entry.get("craft_class") == "weapon":
+            ks_name = f"Professional Killstreak {name}"
+            entries[ks_name] = {
+                "defindex": [defindex],
+                "prices": {"6": {"Tradable": {"Craftable": [price()]}}},
+            }
+    return {
+        "response": {
+            "success": 1,
+            "current_time": 1_710_000_000,
+            "raw_usd_value": 0.03,
+            "usd_currency": "metal",
+            "items": entries,
+        }
+    }
+
+
+def currencies_payload(key_price: float = KEY_PRICE_REFINED) -> Dict[str, Any]:
+    """Return an ``IGetCurrencies`` style payload."""
+
+    return {
+        "response": {
+            "success": 1,
+            "currencies": {
+                "metal": {
+                    "name": "Refined Metal",
+                    "price": {"value": 1, "value_raw": 1.0},
+                },
+                "keys": {
+                    "name": "Mann Co. Supply Crate Key",
+                    "price": {"value": key_price, "value_raw": key_price},
+                },
+            },
+        }
+    }
+
+
+def write_schema_files(
+    directory: Path, items_by_defindex: Dict[int, Dict[str, Any]] | None = None
+) -> Dict[str, Path]:
+    """Write the required ``load_files`` inputs under ``directory``."""
+
+    directory.mkdir(parents=True, exist_ok=True)
+    items_by_defindex = items_by_defindex or synthetic_items()
+    files = {
+        "attributes": (directory / "attributes.json", SYNTHETIC_ATTRIBUTES),
+        "items": (directory / "items.json", list(items_by_defindex.values())),
+        "qualities": (directory / "qualities.json", SYNTHETIC_QUALITIES),
+        "particles": (
+            directory / "particles.json",
+            [
+                {"id": e, "name": f"Effect {e}", "system": f"effect_{e}"}
+                for e in EFFECT_IDS
+            ],
+        ),
+        "currencies": (directory / "currencies.json", currencies_payload()),
+    }
+    paths: Dict[str, Path] = {}
+    for key, (path, data) in files.items():
+        path.write_text(json.dumps(data))
+        paths[key] = path
+    return paths
+
+
+__all__ = [
+    "KEY_PRICE_REFINED",
+    "SYNTHETIC_ATTRIBUTES",
+    "SYNTHETIC_QUALITIES",
+    "synthetic_items",
+    "generate_inventory",
+    "generate_price_dump",
+    "currencies_payload",
+    "write_schema_files",
+]
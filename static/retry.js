@@ -80,6 +80,43 @@ function addCardToBucket(card, containerId) {
 
 window.addCardToBucket = addCardToBucket;
 
+/**
+ * Replace user cards on the page when the server pushes a repriced card.
+ * Cards not on the page are ignored.
+ *
+ * @returns {EventSource|undefined} The open event stream.
+ * @example
+ * subscribeCardUpdates();
+ */
+function subscribeCardUpdates() {
+  if (!window.EventSource) return undefined;
+  const source = new EventSource("/api/events");
+  source.addEventListener("card", (event) => {
+    let data;
+    try {
+      data = JSON.parse(event.data);
+    } catch {
+      return;
+    }
+    const card = document.getElementById("user-" + data.steamid);
+    if (!card || card.classList.contains("loading")) return;
+    const wrapper = document.createElement("div");
+    wrapper.innerHTML = data.html;
+    const newCard = wrapper.firstElementChild;
+    if (!newCard) return;
+    card.replaceWith(newCard);
+    if (window.attachHandlers) {
+      window.attachHandlers();
+    }
+    if (window.refreshLazyLoad) {
+      window.refreshLazyLoad();
+    }
+  });
+  return source;
+}
+
+document.addEventListener("DOMContentLoaded", subscribeCardUpdates);
+
 /**
  * Retry fetching inventory for a specific user.
  *
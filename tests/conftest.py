@@ -11,7 +11,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 
 @pytest.fixture
-def app(monkeypatch):
+def app(monkeypatch, tmp_path):
     """Return Flask app with env and schema mocks."""
 
     monkeypatch.setenv("STEAM_API_KEY", "x")
@@ -29,6 +29,8 @@ def app(monkeypatch):
         "utils.price_loader.build_price_map",
         lambda path: {},
     )
+    monkeypatch.setattr("utils.scan_store.SCANS_DIR", tmp_path / "scans")
+    monkeypatch.setattr("utils.watchlist.WATCHLIST_FILE", tmp_path / "watchlist.json")
 
     mod = importlib.import_module("app")
     importlib.reload(mod)
@@ -0,0 +1,109 @@
+import importlib
+import threading
+import time
+
+import pytest
+
+from utils import alloc_tracker
+
+
+@pytest.fixture(autouse=True)
+def tracking():
+    alloc_tracker.reset()
+    yield
+    alloc_tracker.disable()
+    alloc_tracker.reset()
+
+
+def test_disabled_stage_is_noop():
+    alloc_tracker.begin_scan("1")
+    with alloc_tracker.stage("process_inventory", "1"):
+        pass
+    assert alloc_tracker.recent() == []
+
+
+def test_stage_reports_retained_allocations():
+    alloc_tracker.enable()
+    alloc_tracker.begin_scan("1")
+    with alloc_tracker.stage("process_inventory", "1"):
+        kept = [bytearray(1024) for _ in range(200)]
+
+    (report,) = alloc_tracker.recent()
+    (entry,) = report["stages"]
+    assert entry["stage"] == "process_inventory"
+    assert entry["retained_kb"] >= 190
+    assert entry["peak_kb"] >= entry["retained_kb"]
+    assert "test_alloc_tracker.py:" in entry["top_sites"][0]["site"]
+    assert len(kept) == 200
+
+
+def test_reports_are_bounded(monkeypatch):
+    monkeypatch.setattr(alloc_tracker, "MAX_REPORTS", 2)
+    alloc_tracker.enable()
+    for sid in ("1", "2", "3"):
+        alloc_tracker.begin_scan(sid)
+    assert [r["steamid"] for r in alloc_tracker.recent()] == ["3", "2"]
+
+
+@pytest.mark.asyncio
+async def test_scan_records_each_stage(monkeypatch, async_client):
+    mod = importlib.import_module("app")
+
+    async def fake_summary(_id):
+        return {"username": "u", "avatar": "", "playtime": 0, "profile": ""}
+
+    async def fake_fetch(_id):
+        return "parsed", {"items": [{"defindex": 5021}]}
+
+    monkeypatch.setattr(mod, "get_player_summary", fake_summary)
+    monkeypatch.setattr(mod.sac, "fetch_inventory_async", fake_fetch)
+    monkeypatch.setattr(
+        mod.ip, "process_inventory", lambda data, **_: [{"name": "Key"}]
+    )
+    monkeypatch.setattr(mod.ip, "get_valuation_service", lambda: None)
+
+    resp = await async_client.get("/debug/allocations")
+    assert resp.status_code == 404
+
+    alloc_tracker.enable()
+    resp = await async_client.post("/retry/76561197960287930")
+    assert resp.status_code == 200
+
+    resp = await async_client.get("/debug/allocations")
+    (report,) = resp.json()["reports"]
+    assert report["steamid"] == "76561197960287930"
+    assert [s["stage"] for s in report["stages"]] == [
+        "process_inventory",
+        "stack_items",
+        "render",
+    ]
+
+
+def test_concurrent_stages_do_not_see_each_other():
+    alloc_tracker.enable()
+    alloc_tracker.begin_scan("1")
+    alloc_tracker.begin_scan("2")
+    first_allocated = threading.Event()
+    kept = {}
+
+    def first():
+        with alloc_tracker.stage("process_inventory", "1"):
+            kept["1"] = [bytearray(1024) for _ in range(200)]
+            first_allocated.set()
+            time.sleep(0.3)
+
+    def second():
+        first_allocated.wait()
+        with alloc_tracker.stage("process_inventory", "2"):
+            kept["2"] = [bytearray(1024) for _ in range(600)]
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reports = {r["steamid"]: r["stages"][0] for r in alloc_tracker.recent()}
+    assert 190 <= reports["1"]["retained_kb"] < 400
+    assert 590 <= reports["2"]["retained_kb"] < 800
+    assert reports["1"]["peak_kb"] < 400
@@ -0,0 +1,76 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import scripts.benchmark as bench
+from scripts.synthetic_data import generate_inventory, synthetic_items
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_generate_inventory_is_deterministic():
+    items = synthetic_items(40)
+    first = generate_inventory(100, items, seed=3)
+    assert first == generate_inventory(100, items, seed=3)
+    assert len(first["items"]) == 100
+    assert {a["defindex"] for a in first["items"]} <= set(items)
+
+
+def test_compare_flags_only_slow_cases():
+    baseline = {"cases": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}}}
+    results = {
+        "cases": {
+            "a": {"median_s": 1.2},
+            "b": {"median_s": 2.0},
+            "c": {"median_s": 9.0},
+            "app_import": {"skipped": "no cache"},
+        }
+    }
+    assert bench.compare(results, baseline, 0.25) == [
+        "b: 2000.00 ms vs 1000.00 ms (+100%, allowed +25%)"
+    ]
+    assert bench.compare(results, baseline, 0.25, {"b": 1.5}) == []
+    assert len(bench.compare(results, baseline, 0.1)) == 2
+
+
+def test_cli_writes_results_and_fails_on_regression(tmp_path):
+    output = tmp_path / "bench.json"
+    cmd = [
+        sys.executable,
+        "-m",
+        "scripts.benchmark",
+        "--sizes",
+        "30",
+        "--repeat",
+        "1",
+        "--only",
+        "_30",
+        "--only",
+        "price_map",
+        "--output",
+        str(output),
+    ]
+    proc = subprocess.run(cmd, cwd=BASE_DIR, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    results = json.loads(output.read_text())
+    assert set(results["cases"]) == {
+        "build_price_map",
+        "load_price_map",
+        "load_price_map_snapshot",
+        "enrich_30",
+        "process_30",
+        "stack_30",
+        "render_30",
+    }
+
+    fast = {
+        "cases": {name: {"median_s": 1e-9} for name in results["cases"]},
+    }
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(fast))
+    proc = subprocess.run(
+        cmd + ["--baseline", str(baseline)], cwd=BASE_DIR, capture_output=True
+    )
+    assert proc.returncode == 1
+    assert b"REGRESSION" in proc.stdout
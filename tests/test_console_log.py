@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from utils import console_log
+
+STATUS = (
+    "# userid name uniqueid connected ping loss state\n"
+    '#      2 "Alpha"   [U:1:22202]  12:34  50 0 active\n'
+    '#      3 "Bravo"   [U:1:1]      01:02  70 0 active\n'
+)
+
+
+def test_parser_handles_lines_split_across_chunks():
+    parser = console_log.StreamingIdParser()
+    data = STATUS.encode()
+    split = data.index(b"22202") + 2
+    assert parser.feed(data[:split]) == []
+    assert parser.feed(data[split:]) == ["[U:1:22202]", "[U:1:1]"]
+    assert parser.consumed == len(data)
+
+
+def test_tail_reads_incrementally_and_dedupes(tmp_path):
+    log = tmp_path / "console.log"
+    state = tmp_path / "state.json"
+    log.write_text("Connected to 1.2.3.4\n" + STATUS)
+
+    tail = console_log.ConsoleLogTail(log, state)
+    assert tail.poll() == ["76561197960287930", "76561197960265729"]
+    tail.commit()
+
+    # A new session repeats one player and adds another, with a partial line.
+    with log.open("a") as handle:
+        handle.write(STATUS)
+        handle.write('#      4 "Charlie" [U:1:3]  00:10  40 0 active\n')
+        handle.write('#      5 "Delta"   [U:1:')
+
+    tail = console_log.ConsoleLogTail(log, state)
+    assert tail.poll() == ["76561197960265731"]
+    tail.commit()
+    saved = json.loads(state.read_text())
+    assert log.read_bytes()[saved["offset"] :].startswith(b'#      5 "Delta"')
+
+    with log.open("a") as handle:
+        handle.write("5]  00:01  30 0 active\n")
+    assert console_log.ConsoleLogTail(log, state).poll() == ["76561197960265733"]
+
+
+def test_truncated_log_is_reread(tmp_path):
+    log = tmp_path / "console.log"
+    state = tmp_path / "state.json"
+    log.write_text(STATUS * 3)
+    tail = console_log.ConsoleLogTail(log, state)
+    tail.poll()
+    tail.commit()
+
+    log.write_text('#      9 "Echo" [U:1:9]  00:01  30 0 active\n')
+    assert tail.poll() == ["76561197960265737"]
+
+
+def test_overlong_line_is_skipped_and_counted(tmp_path):
+    log = tmp_path / "console.log"
+    state = tmp_path / "state.json"
+    with log.open("wb") as handle:
+        handle.write(b"x" * 200_000 + b" [U:1:7]\n")
+        handle.write(b'#      9 "Echo" [U:1:9]  00:01  30 0 active\n')
+
+    tail = console_log.ConsoleLogTail(log, state)
+    assert tail.poll() == ["76561197960265737"]
+    tail.commit()
+    assert tail.offset == log.stat().st_size
+    assert console_log.ConsoleLogTail(log, state).poll() == []
+
+
+def test_main_prints_new_ids(tmp_path, capsys):
+    log = tmp_path / "console.log"
+    log.write_text(STATUS)
+    state = tmp_path / "state.json"
+    assert console_log.main([str(log), "--state", str(state)]) == 0
+    assert capsys.readouterr().out.split() == [
+        "76561197960287930",
+        "76561197960265729",
+    ]
+    assert console_log.main([str(log), "--state", str(state)]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_ids_are_kept_until_committed(tmp_path, monkeypatch):
+    log = tmp_path / "console.log"
+    log.write_text(STATUS)
+    state = tmp_path / "state.json"
+
+    async def failing_scan(ids, args):
+        raise OSError("Steam unreachable")
+
+    monkeypatch.setattr(console_log, "_scan", failing_scan)
+    monkeypatch.setattr(console_log.local_data, "load_files", lambda **_: None)
+    with pytest.raises(OSError):
+        console_log.main([str(log), "--state", str(state), "--scan"])
+    assert not state.exists()
+
+    tail = console_log.ConsoleLogTail(log, state)
+    assert tail.poll() == ["76561197960287930", "76561197960265729"]
+    assert tail.poll() == ["76561197960287930", "76561197960265729"]
+    tail.commit()
+    assert console_log.ConsoleLogTail(log, state).poll() == []
@@ -0,0 +1,59 @@
+from utils.inventory import descriptions
+from utils.inventory.extractors_misc import _trade_hold_timestamp
+from utils.inventory.extractors_unusual_killstreak import (
+    _extract_killstreak_effect,
+    _extract_killstreak_tier,
+)
+
+
+def test_parse_text_strips_html_and_combines_facts():
+    descriptions.parse_text.cache_clear()
+    value = "<span>Killstreaker: Tornado</span> (Professional Killstreak)"
+    assert descriptions.parse_text(value) == (3, "Tornado (Professional Killstreak)")
+    assert descriptions.parse_text("Killstreaks Active") == (1, None)
+    assert descriptions.parse_text(
+        "Sheen: Team Shine &amp; Specialized Killstreak"
+    ) == (
+        2,
+        None,
+    )
+    descriptions.parse_text(value)
+    assert descriptions.parse_text.cache_info().hits == 1
+
+
+def test_describe_takes_first_description_per_fact():
+    asset = {
+        "descriptions": [
+            "not a dict",
+            {"value": "Specialized Killstreak"},
+            {"value": "Professional Killstreak"},
+            {"value": "Killstreaker: Hypno-Beam"},
+            {"app_data": {"steam_market_tradeable_after": "bad"}},
+            {"app_data": {"steam_market_marketable_after": "1700000000"}},
+        ]
+    }
+    assert descriptions.describe(asset) == (2, "Hypno-Beam", 1700000000)
+    assert descriptions.describe({}) == descriptions.EMPTY
+
+    # Nothing is cached per list, so an edited list is parsed again.
+    asset["descriptions"][1] = {"value": "Killstreaks Active"}
+    assert descriptions.describe(asset) == (1, "Hypno-Beam", 1700000000)
+
+
+def test_extractors_share_description_facts():
+    asset = {
+        "attributes": [],
+        "descriptions": [
+            {"value": "Killstreaker: Fire Horns"},
+            {"value": "Killstreaks Active"},
+            {"app_data": {"steam_market_tradeable_after": 1700000001}},
+        ],
+    }
+    assert _extract_killstreak_tier(asset) == 1
+    assert _extract_killstreak_effect(asset) == "Fire Horns"
+    assert _trade_hold_timestamp(asset) == 1700000001
+
+    facts = descriptions.DescriptionFacts(3, "Tornado", None)
+    assert _extract_killstreak_tier(asset, facts) == 3
+    assert _extract_killstreak_effect(asset, facts) == "Tornado"
+    assert _trade_hold_timestamp(asset, facts) is None
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+
+import pytest
+
+from utils import export
+
+ITEMS = [
+    {
+        "id": 1,
+        "name": "Team Captain",
+        "quality": "Unusual",
+        "price": {"value_raw": 120.5, "currency": "metal"},
+        "quantity": 2,
+        "badges": [{"type": "effect"}],
+    },
+    {"id": 2, "name": 'Refined Metal, "bar"', "price": None},
+]
+
+
+def test_parse_columns_defaults_and_custom():
+    assert export.parse_columns(None) == export.DEFAULT_ITEM_COLUMNS
+    assert export.parse_columns(" name, price_refined ,") == ("name", "price_refined")
+
+
+def test_ndjson_projects_columns():
+    lines = list(export.iter_items(ITEMS, "ndjson", ("id", "price_refined")))
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "price_refined": 120.5},
+        {"id": 2, "price_refined": None},
+    ]
+
+
+def test_csv_quotes_and_serializes_nested_values():
+    text = "".join(export.iter_items(ITEMS, "csv", ("name", "quantity", "badges")))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == ["name", "quantity", "badges"]
+    assert rows[1] == ["Team Captain", "2", '[{"type": "effect"}]']
+    assert rows[2] == ['Refined Metal, "bar"', "1", ""]
+
+
+def test_csv_neutralizes_formula_cells():
+    items = [
+        {
+            "custom_name": '=HYPERLINK("http://evil.example","click")',
+            "custom_description": "@SUM(A1)",
+            "quantity": -1,
+        },
+        {"custom_name": "-2+3", "custom_description": "\tcmd"},
+        {"custom_name": "Plain = fine"},
+    ]
+    columns = ("custom_name", "custom_description", "quantity")
+    text = "".join(export.iter_items(items, "csv", columns))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[1] == ['\'=HYPERLINK("http://evil.example","click")', "'@SUM(A1)", "-1"]
+    assert rows[2] == ["'-2+3", "'\tcmd", "1"]
+    assert rows[3] == ["Plain = fine", "", "1"]
+
+
+def test_item_value_uses_quantity():
+    assert export.item_value(ITEMS[0]) == 241.0
+    assert export.item_value(ITEMS[1]) == 0.0
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        export.iter_items(ITEMS, "xml")
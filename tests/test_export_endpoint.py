@@ -0,0 +1,106 @@
+import csv
+import importlib
+import io
+import json
+import threading
+
+import pytest
+
+from utils import scan_store
+
+STEAMID = "76561197960287930"
+
+
+def test_store_round_trip(tmp_path):
+    store = scan_store.ScanStore(tmp_path)
+    store.save(STEAMID, [{"id": 1}, {"id": 2}])
+    assert store.meta(STEAMID)["item_count"] == 2
+    assert list(store.iter_items(STEAMID)) == [{"id": 1}, {"id": 2}]
+    assert store.steamids() == [STEAMID]
+    assert store.delete(STEAMID)
+    assert store.meta(STEAMID) is None
+    with pytest.raises(ValueError):
+        store.path("../etc/passwd")
+
+
+def test_concurrent_saves_never_mix(tmp_path):
+    store = scan_store.ScanStore(tmp_path)
+    errors = []
+
+    def write(n):
+        try:
+            for _ in range(20):
+                store.save(STEAMID, [{"writer": n, "i": i} for i in range(200)])
+        except Exception as exc:  # surfaced below
+            errors.append(exc)
+
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    assert errors == []
+    items = list(store.iter_items(STEAMID))
+    assert len(items) == 200
+    assert len({item["writer"] for item in items}) == 1
+    assert [p.name for p in tmp_path.iterdir()] == [f"{STEAMID}.ndjson"]
+
+
+@pytest.fixture
+def live_inventory(monkeypatch):
+    mod = importlib.import_module("app")
+    calls = []
+
+    async def fake_fetch(steamid):
+        calls.append(steamid)
+        return {
+            "status": "parsed",
+            "items": [
+                {"id": 1, "name": "Key", "price": {"value_raw": 60.0}},
+                {"id": 2, "name": 'Hat, "Team"', "price": None},
+            ],
+            "key_price": 60.0,
+        }
+
+    monkeypatch.setattr(mod, "fetch_inventory", fake_fetch)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson_and_stores_scan(async_client, live_inventory):
+    resp = await async_client.get(
+        f"/api/export/{STEAMID}", params={"columns": "id,price_refined"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [{"id": 1, "price_refined": 60.0}, {"id": 2, "price_refined": None}]
+    assert scan_store.get_scan_store().meta(STEAMID)["item_count"] == 2
+
+    # The stored scan is reused without fetching again.
+    resp = await async_client.get(
+        f"/api/export/{STEAMID}", params={"format": "csv", "columns": "name,quantity"}
+    )
+    rows = list(csv.reader(io.StringIO(resp.text)))
+    assert rows == [["name", "quantity"], ["Key", "1"], ['Hat, "Team"', "1"]]
+    assert resp.headers["content-disposition"].endswith(f"{STEAMID}.csv")
+    assert live_inventory == [STEAMID]
+
+
+@pytest.mark.asyncio
+async def test_live_export_keeps_profile_and_stores_value(async_client, live_inventory):
+    scan_store.record_scan(STEAMID, [], "parsed", profile={"username": "Alpha"})
+    resp = await async_client.get(f"/api/export/{STEAMID}", params={"source": "live"})
+    assert resp.status_code == 200
+    meta = scan_store.get_scan_store().meta(STEAMID)
+    assert meta["profile"] == {"username": "Alpha"}
+    assert meta["value"]["total_value_raw"] == 60.0
+    assert meta["value"]["total_keys"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_bad_parameters(async_client, live_inventory):
+    resp = await async_client.get(f"/api/export/{STEAMID}", params={"format": "xml"})
+    assert resp.status_code == 400
+    resp = await async_client.get(f"/api/export/{STEAMID}", params={"source": "cache"})
+    assert resp.status_code == 404
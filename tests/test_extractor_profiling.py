@@ -0,0 +1,55 @@
+import pytest
+
+from utils import local_data as ld
+from utils.inventory import processor, profiling
+from utils.inventory import extractors_grade_tier as grade
+from utils.valuation_service import ValuationService
+
+
+@pytest.fixture(autouse=True)
+def offline_schema(monkeypatch):
+    monkeypatch.setattr(ld, "ITEMS_BY_DEFINDEX", {111: {"item_name": "Shovel"}})
+    monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {})
+    monkeypatch.setattr(
+        grade, "_resolve_grade_from_defindex", lambda defindex: (None, "none")
+    )
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def test_disabled_by_default_records_nothing():
+    original = processor._extract_paintkit
+    processor._process_item(
+        {"defindex": 111, "quality": 6}, ValuationService(price_map={})
+    )
+    assert profiling.snapshot() == []
+    assert profiling.phase_clock() is None
+    assert processor._extract_paintkit is original
+
+
+def test_enable_counts_extractors_and_phases():
+    original = processor._extract_grade_tier
+    profiling.enable()
+    assert processor._extract_grade_tier is not original
+
+    service = ValuationService(price_map={})
+    for _ in range(3):
+        processor._process_item({"defindex": 111, "quality": 11}, service)
+
+    rows = {(r["kind"], r["name"]): r for r in profiling.snapshot()}
+    assert rows[("extractor", "_extract_grade_tier")]["calls"] == 3
+    assert rows[("extractor", "resolve_wear")]["calls"] == 3
+    assert rows[("phase", "valuation")]["calls"] == 3
+    assert rows[("phase", "schema_lookup")]["calls"] == 3
+    assert "_extract_grade_tier" in profiling.format_report()
+
+    profiling.disable()
+    assert processor._extract_grade_tier is original
+
+
+def test_enable_from_env(monkeypatch):
+    monkeypatch.setenv("PROFILE_EXTRACTORS", "1")
+    assert profiling.enable_from_env() is True
+    assert profiling.phase_clock() is not None
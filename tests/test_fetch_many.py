@@ -37,7 +37,7 @@ async def test_fetch_many_concurrent(monkeypatch, app):
 async def test_api_users_returns_html(monkeypatch, async_client):
     mod = importlib.import_module("app")
 
-    async def fake_fetch(ids):
+    async def fake_fetch(ids, **_kwargs):
         return [f"<div>{i}</div>" for i in ids], [], []
 
     monkeypatch.setattr(mod, "fetch_and_process_many", fake_fetch)
@@ -47,6 +47,7 @@ async def test_api_users_returns_html(monkeypatch, async_client):
     resp = await async_client.post("/api/users", json={"ids": ["1", "2"]})
     assert resp.status_code == 200
     data = resp.json()
+    assert data.pop("value")["users"] == 0
     assert data == {
         "completed": ["<div>1</div>", "<div>2</div>"],
         "failed": [],
@@ -58,7 +59,7 @@ async def test_api_users_returns_html(monkeypatch, async_client):
 async def test_api_users_skips_invalid_ids(monkeypatch, async_client):
     mod = importlib.import_module("app")
 
-    async def fake_fetch(ids):
+    async def fake_fetch(ids, **_kwargs):
         return [f"<div>{i}</div>" for i in ids], [], []
 
     def fake_convert(raw):
@@ -71,7 +72,9 @@ async def test_api_users_skips_invalid_ids(monkeypatch, async_client):
 
     resp = await async_client.post("/api/users", json={"ids": ["1", "bad", "2"]})
     assert resp.status_code == 200
-    assert resp.json() == {
+    data = resp.json()
+    assert data.pop("value")["priced"] == 0
+    assert data == {
         "completed": ["<div>1</div>", "<div>2</div>"],
         "failed": [],
         "invalid": 1,
@@ -0,0 +1,109 @@
+import importlib
+
+import pytest
+
+from utils import scan_store
+from utils.inventory_value import InventoryValue, sort_value, summarize_items
+
+
+def _item(name, value=None, quality="Unique", slot="misc", quantity=None):
+    item = {"name": name, "quality": quality, "slot_type": slot}
+    item["price"] = {"value_raw": value, "currency": "metal"} if value else None
+    if quantity:
+        item["quantity"] = quantity
+    return item
+
+
+ITEMS = [
+    _item("Team Captain", 500.0, "Unusual"),
+    _item("Ubersaw", 1.0, slot="melee", quantity=3),
+    _item("Scrap", None, quantity=2),
+    _item("Kritzkrieg", 2.5, "Strange", "secondary"),
+]
+
+
+def test_summarize_items():
+    value = summarize_items(ITEMS, key_price=50.0, steamid="1", top=2)
+    assert value.total_value_raw == 505.5
+    assert value.total_keys == pytest.approx(10.11)
+    assert value.total_string == "10 Keys 5.50 ref"
+    assert (value.priced, value.unpriced, value.users) == (5, 2, 1)
+    assert value.by_quality == {"Unusual": 500.0, "Unique": 3.0, "Strange": 2.5}
+    assert value.by_slot == {"misc": 500.0, "melee": 3.0, "secondary": 2.5}
+    assert [(e["name"], e["steamid"]) for e in value.top] == [
+        ("Team Captain", "1"),
+        ("Kritzkrieg", "1"),
+    ]
+    assert summarize_items([]).to_dict()["total_string"] == "0.00 ref"
+
+
+def test_add_merges_and_round_trips():
+    totals = InventoryValue()
+    totals.add(summarize_items(ITEMS, 50.0, steamid="1"), top=2)
+    totals.add(summarize_items([_item("Earbuds", 60.0)], 50.0, steamid="2"), top=2)
+    assert totals.users == 2
+    assert totals.total_value_raw == 565.5
+    assert totals.by_quality["Unique"] == 63.0
+    assert [e["steamid"] for e in totals.top] == ["1", "2"]
+
+    restored = InventoryValue.from_dict(totals.to_dict())
+    assert restored.total_string == totals.total_string
+    assert restored.top == totals.top
+    assert sort_value(restored, "items") == 8
+    assert sort_value(None) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_sorts_by_value_and_totals(monkeypatch, app):
+    mod = importlib.import_module("app")
+    worth = {"1": 5.0, "2": 80.0, "3": 20.0}
+
+    async def fake_build(id_):
+        return {
+            "steamid": id_,
+            "avatar": "",
+            "username": f"user{id_}",
+            "playtime": 0,
+            "status": "parsed",
+            "items": [],
+            "value": summarize_items([_item("Hat", worth[id_])], 50.0, steamid=id_),
+        }
+
+    monkeypatch.setattr(mod, "build_user_data_async", fake_build)
+    totals = InventoryValue()
+    with app.test_request_context():
+        completed, _, _ = await mod.fetch_and_process_many(
+            ["1", "2", "3"], sort="value", totals=totals
+        )
+        unsorted, _, _ = await mod.fetch_and_process_many(["1", "2", "3"])
+    assert ["user2" in completed[0], "user3" in completed[1]] == [True, True]
+    assert "1 Key 30.00 ref" in completed[0]
+    assert "user1" in unsorted[0]
+    assert totals.total_value_raw == 105.0
+    assert totals.users == 3
+
+
+@pytest.mark.asyncio
+async def test_value_endpoint_totals_stored_scans(async_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(scan_store, "_default_store", scan_store.ScanStore(tmp_path))
+    store = scan_store.get_scan_store()
+    for steamid, items in (
+        ("76561198000000001", ITEMS),
+        ("76561198000000002", [_item("Earbuds", 600.0)]),
+    ):
+        value = summarize_items(items, 50.0, steamid=steamid)
+        store.save(steamid, items, value=value.to_dict())
+    store.save("76561198000000003", [])  # scanned before values were stored
+
+    resp = await async_client.get("/api/value?limit=1&top=1")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"]["users"] == 2
+    assert data["total"]["total_value_raw"] == 1105.5
+    assert data["total"]["top"][0]["name"] == "Earbuds"
+    assert [user["steamid"] for user in data["users"]] == ["76561198000000002"]
+
+    resp = await async_client.get("/api/value?sort=items")
+    assert resp.json()["users"][0]["steamid"] == "76561198000000001"
+    resp = await async_client.get("/api/value?sort=bogus")
+    assert resp.status_code == 400
@@ -0,0 +1,76 @@
+import importlib
+
+import pytest
+
+from utils import metrics
+
+
+def test_counter_and_gauge_render():
+    reg = metrics.Registry()
+    counter = reg.register(metrics.Counter("c_total", "A counter.", labels=("kind",)))
+    gauge = reg.register(metrics.Gauge("g", "A gauge."))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    with gauge.track_inprogress():
+        assert gauge.value() == 1
+    assert gauge.value() == 0
+
+    text = reg.render()
+    assert "# TYPE c_total counter" in text
+    assert 'c_total{kind="a"} 3' in text
+    assert "g 0" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = metrics.Histogram("h", "A histogram.", buckets=(0.1, 1.0))
+    hist.observe(0.05)
+    hist.observe(0.5)
+    hist.observe(5)
+    lines = hist.samples()
+    assert 'h_bucket{le="0.1"} 1' in lines
+    assert 'h_bucket{le="1"} 2' in lines
+    assert 'h_bucket{le="+Inf"} 3' in lines
+    assert "h_count 3" in lines
+    assert hist.sum() == pytest.approx(5.55)
+
+
+def test_label_mismatch_raises():
+    counter = metrics.Counter("x_total", "X.", labels=("a",))
+    with pytest.raises(ValueError):
+        counter.inc(b="1")
+
+
+def test_duplicate_registration_rejected():
+    reg = metrics.Registry()
+    reg.register(metrics.Counter("dup", "Dup."))
+    with pytest.raises(ValueError):
+        reg.register(metrics.Counter("dup", "Dup."))
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_scan(monkeypatch, async_client):
+    mod = importlib.import_module("app")
+
+    async def fake_summary(_id):
+        return {"username": "u", "avatar": "", "playtime": 0, "profile": ""}
+
+    async def fake_inventory(_id):
+        return {"items": [{"name": "A"}, {"name": "A"}], "status": "parsed"}
+
+    monkeypatch.setattr(mod, "get_player_summary", fake_summary)
+    monkeypatch.setattr(mod, "fetch_inventory", fake_inventory)
+    before = metrics.STACK_SECONDS.count()
+    parsed_before = metrics.SCANS_TOTAL.value(status="parsed")
+
+    user = await mod.build_user_data_async("1")
+    assert user["items"][0]["quantity"] == 2
+    assert metrics.STACK_SECONDS.count() == before + 1
+    assert metrics.SCANS_TOTAL.value(status="parsed") == parsed_before + 1
+    assert metrics.ACTIVE_SCANS.value() == 0
+
+    resp = await async_client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert "tf2scanner_stack_items_seconds_count" in body
+    assert 'tf2scanner_scans_total{status="parsed"}' in body
@@ -0,0 +1,86 @@
+import difflib
+import random
+
+import pytest
+
+from utils import local_data as ld
+from utils.inventory import extractors_paint_and_wear as epw
+from utils.inventory import paintkit_index
+
+NAMES = {
+    "Warhawk": 350,
+    "Night Owl Mk.II": 410,
+    "Carpet Bomber": 102,
+    "Woodland Warrior": 103,
+    "Sudden Flurry": 104,
+    "Hana": 105,
+}
+
+
+@pytest.mark.parametrize(
+    "query", ["Warhwak", "Night Owl Mk.Ii", "Carpet Bomb", "Totally Different", "Han"]
+)
+def test_closest_agrees_with_difflib(query):
+    index = paintkit_index.PaintkitIndex(NAMES)
+    expected = difflib.get_close_matches(query, list(NAMES), n=1, cutoff=0.6)
+    assert index.closest(query) == (expected[0] if expected else None)
+
+
+def test_closest_matches_difflib_on_random_queries():
+    names = {
+        f"{a} {b}": i
+        for i, (a, b) in enumerate(
+            (a, b)
+            for a in ("Brain", "Rod", "Night Owl", "Warhawk", "Macabre", "Blue Mew")
+            for b in ("Mk.II", "Candy", "Web", "Rush")
+        )
+    }
+    names.update({"Brain": 900, "Rod": 901, "Hana": 902})
+    index = paintkit_index.PaintkitIndex(names)
+    rng = random.Random(440)
+    queries = ["crain", "Lod"]
+    for _ in range(500):
+        word = list(rng.choice(list(names)))
+        for _ in range(rng.randint(0, 4)):
+            pos = rng.randrange(len(word))
+            op = rng.choice("dsi")
+            if op == "d" and len(word) > 1:
+                del word[pos]
+            elif op == "s":
+                word[pos] = rng.choice("abcdelmnorw ")
+            else:
+                word.insert(pos, rng.choice("abcdelmnorw "))
+        queries.append("".join(word)[: rng.randint(1, len(word))])
+    for query in queries:
+        expected = difflib.get_close_matches(query, list(names), n=1, cutoff=0.6)
+        assert index.closest(query) == (expected[0] if expected else None), query
+
+
+def test_slug_table_built_from_schema_names():
+    index = paintkit_index.PaintkitIndex(
+        NAMES, ["warbird_rocketlauncher_night_owl_mk_ii", "tf_wearable", "craftsmann_x"]
+    )
+    assert index.slugs == {
+        "night_owl_mk_ii": (410, "Night Owl Mk.II"),
+        "x": (None, None),
+    }
+
+
+def test_extract_paintkit_uses_index_without_difflib(monkeypatch):
+    monkeypatch.setattr(ld, "PAINTKIT_NAMES", dict(NAMES), False)
+    monkeypatch.setattr(
+        ld, "ITEMS_BY_DEFINDEX", {1: {"name": "warbird_sniperrifle_warhwak"}}, False
+    )
+    index = paintkit_index.get_index()
+    assert index.slugs["warhwak"] == (350, "Warhawk")
+
+    def fail(*_a, **_k):
+        raise AssertionError("difflib used in steady state")
+
+    monkeypatch.setattr(difflib.SequenceMatcher, "ratio", fail)
+    entry = {"name": "warbird_sniperrifle_warhwak"}
+    assert epw._extract_paintkit({"attributes": []}, entry) == (350, "Warhawk")
+    assert paintkit_index.get_index() is index
+
+    monkeypatch.setattr(ld, "ITEMS_BY_DEFINDEX", {}, False)
+    assert paintkit_index.get_index() is not index
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import price_history
+from utils.price_history import DAY, PriceHistory
+
+UBERSAW = ("Ubersaw", 6, True, False, 0, 0)
+HAT = ("Team Captain", 5, True, False, 13, 0)
+T0 = int(datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp())
+
+
+def _price(value, currency="metal"):
+    return {"value_raw": value, "currency": currency}
+
+
+def _keys(value):
+    return {"keys": {"price": {"value_raw": value}}}
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PriceHistory(tmp_path / "history")
+
+
+def test_record_appends_only_changes(history):
+    assert history.record({UBERSAW: _price(1.0), HAT: _price(9, "keys")}, at=T0) == 2
+    assert history.record({UBERSAW: _price(1.0)}, at=T0 + 3600) == 0
+    assert history.record({UBERSAW: _price(1.5)}, at=T0 + 7200) == 1
+
+    assert history.curve(UBERSAW) == [(T0, 1.0, "metal"), (T0 + 7200, 1.5, "metal")]
+    assert history.curve(HAT) == [(T0, 9.0, "keys")]
+    assert history.curve(("Unknown", 6, True, False, 0, 0)) == []
+    assert sorted(history.series()) == sorted([UBERSAW, HAT])
+
+
+def test_state_survives_reopen(history):
+    history.record({UBERSAW: _price(1.0)}, _keys(50.0), at=T0)
+    reopened = PriceHistory(history.root)
+    assert reopened.record({UBERSAW: _price(1.0)}, _keys(50.0), at=T0 + 60) == 0
+    assert reopened.record({UBERSAW: _price(2.0)}, _keys(51.0), at=T0 + 120) == 1
+    assert reopened.curve(UBERSAW)[-1] == (T0 + 120, 2.0, "metal")
+    assert reopened.key_prices() == [(T0, 50.0), (T0 + 120, 51.0)]
+
+
+def test_curve_window_and_step(history):
+    for hour in range(48):
+        history.record({UBERSAW: _price(float(hour))}, at=T0 + hour * 3600)
+
+    window = history.curve(UBERSAW, start=T0 + 10 * 3600 + 5, end=T0 + 12 * 3600)
+    # The price in effect at ``start`` comes first, stamped ``start``.
+    assert window == [
+        (T0 + 10 * 3600 + 5, 10.0, "metal"),
+        (T0 + 11 * 3600, 11.0, "metal"),
+        (T0 + 12 * 3600, 12.0, "metal"),
+    ]
+    daily = history.curve(UBERSAW, step=DAY)
+    assert [value for _ts, value, _currency in daily] == [23.0, 47.0]
+
+
+def test_curve_spans_months(history):
+    history.record({UBERSAW: _price(1.0)}, at=T0)
+    later = T0 + 60 * DAY
+    history.record({UBERSAW: _price(2.0)}, at=later)
+    assert sorted(history.stats()["months"]) == ["2026-01", "2026-03"]
+    assert history.curve(UBERSAW, start=later - DAY) == [
+        (later - DAY, 1.0, "metal"),
+        (later, 2.0, "metal"),
+    ]
+
+
+def test_downsample_keeps_last_price_per_day(history):
+    for hour in range(72):
+        history.record(
+            {UBERSAW: _price(float(hour)), HAT: _price(9, "keys")},
+            _keys(50.0 + hour % 2),
+            at=T0 + hour * 3600,
+        )
+    before = history.stats()["months"]["2026-01"]
+    history.record({UBERSAW: _price(100.0)}, at=T0 + 40 * DAY)
+
+    assert history.downsample(now=T0 + 10 * DAY) == []
+    assert history.downsample(now=T0 + 60 * DAY) == ["2026-01"]
+    after = history.stats()["months"]["2026-01"]
+    assert after["downsampled"] and after["rows"] == 3 + 1
+    assert after["bytes"] < before["bytes"]
+    assert [v for _ts, v, _c in history.curve(UBERSAW)] == [23.0, 47.0, 71.0, 100.0]
+    assert [v for _ts, v in history.key_prices(end=T0 + 10 * DAY)] == [51.0] * 3
+    assert history.downsample(now=T0 + 60 * DAY) == []
+
+
+def test_partial_row_is_ignored(history):
+    history.record({UBERSAW: _price(1.0)}, at=T0)
+    with (history.root / "2026-01" / "ts.u32").open("ab") as f:
+        f.write(b"\x01\x00\x00\x00")
+    reopened = PriceHistory(history.root)
+    assert reopened.curve(UBERSAW) == [(T0, 1.0, "metal")]
+
+
+@pytest.mark.asyncio
+async def test_history_endpoint(async_client, tmp_path, monkeypatch):
+    history = PriceHistory(tmp_path / "history")
+    history.record({HAT: _price(9, "keys")}, _keys(50.0), at=T0)
+    monkeypatch.setattr(price_history, "_default_history", history)
+
+    resp = await async_client.get(
+        "/api/prices/history?name=Team%20Captain&quality=5&effect=13"
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["points"] == [{"ts": T0, "value_raw": 9.0, "currency": "keys"}]
+    assert data["key_prices"] == [{"ts": T0, "value_raw": 50.0}]
+    resp = await async_client.get("/api/prices/history")
+    assert resp.status_code == 400
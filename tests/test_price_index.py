@@ -0,0 +1,145 @@
+import dataclasses
+import threading
+import time
+
+import pytest
+
+from utils import schema_snapshot
+from utils import valuation_service as vs
+from utils.price_index import build_sku_index, sku
+
+ITEMS = {
+    18: {"name": "TF_WEAPON_ROCKETLAUNCHER", "item_name": "Rocket Launcher"},
+    205: {
+        "name": "Upgradeable TF_WEAPON_ROCKETLAUNCHER",
+        "item_name": "Rocket Launcher",
+    },
+    378: {"name": "The Team Captain", "item_name": "The Team Captain"},
+}
+PAINTKITS = {"Warhawk": 350, "Night Owl": "14"}
+PRICE_MAP = {
+    ("Rocket Launcher", 6, True, False, 0, 0): {"value_raw": 0.05, "currency": "metal"},
+    ("Rocket Launcher", 11, True, True, 0, 3): {"value_raw": 900.0, "currency": "keys"},
+    ("Team Captain", 5, True, False, 13, 0): {"value_raw": 4000.0, "currency": "keys"},
+    ("Festivized Rocket Launcher", 6, True, False, 0, 0): {
+        "value_raw": 3.0,
+        "currency": "metal",
+    },
+    ("Warhawk Rocket Launcher (Field-Tested)", 15, True, False, 0, 0): {
+        "value_raw": 20.0,
+        "currency": "metal",
+    },
+    ("Night Owl Rocket Launcher (Factory New)", 15, True, False, 0, 0): {
+        "value_raw": 30.0,
+        "currency": "metal",
+    },
+    ("Mystery Hat", 6, True, False, 0, 0): {"value_raw": 1.0, "currency": "metal"},
+}
+
+
+def test_join_to_schema():
+    index = build_sku_index(PRICE_MAP, ITEMS, PAINTKITS)
+
+    assert index[sku(18, 6)]["value_raw"] == 0.05
+    assert index[sku(205, 6)] is index[sku(18, 6)]
+    assert index[sku(378, 5, effect_id=13)]["value_raw"] == 4000.0
+    assert index[sku(18, 11, is_australium=True, killstreak_tier=3)]["value_raw"] == 900
+    assert index[sku(18, 6, festivized=True)]["value_raw"] == 3.0
+    assert index[sku(18, 15, wear="Field-Tested", paintkit_id=350)]["value_raw"] == 20
+    assert index[sku(205, 15, wear=1, paintkit_id=14)]["value_raw"] == 30.0
+    assert len(index) == 11
+
+    report = index.report()
+    assert report["matched_names"] == 5
+    assert report["unmatched_names"] == 1
+    assert report["top_unmatched"] == [{"name": "Mystery Hat", "entries": 1}]
+
+
+def test_lookup_fallbacks():
+    index = build_sku_index(PRICE_MAP, ITEMS, PAINTKITS)
+    # Killstreak, effect and festivized fall back like the name map.
+    assert (
+        index.lookup(sku(18, 6, killstreak_tier=2, festivized=True))["value_raw"] == 3
+    )
+    assert index.lookup(sku(18, 6, effect_id=701))["value_raw"] == 0.05
+    # A decorated weapon is never priced as the plain one.
+    assert index.lookup(sku(18, 15, wear=2, paintkit_id=350)) is None
+
+
+@pytest.fixture
+def schema(monkeypatch):
+    snapshot = dataclasses.replace(
+        schema_snapshot.SchemaSnapshot.capture(),
+        items_by_defindex=ITEMS,
+        paintkit_names=PAINTKITS,
+    )
+    with schema_snapshot.use(snapshot):
+        yield snapshot
+
+
+def test_batch_prefers_sku_and_falls_back_to_name(schema):
+    price_map = dict(PRICE_MAP)
+    # Priced under a name the schema calls differently.
+    price_map[("Mystery Hat", 6, True, False, 0, 0)] = {
+        "value_raw": 7.0,
+        "currency": "metal",
+    }
+    service = vs.ValuationService(
+        price_map=price_map, currencies={"keys": {"price": {"value_raw": 50.0}}}
+    )
+    batch = service.batch()
+    assert batch.sku_index is service.sku_index()
+
+    # The schema name differs from backpack.tf's ("The Team Captain").
+    key = vs.price_key("The Team Captain", 5, effect_id=13)
+    info, formatted = batch.value(key, sku(378, 5, effect_id=13))
+    assert info["value_raw"] == 4000.0 and formatted == "80 Keys"
+    assert batch.value(key) == (None, "")
+
+    key = vs.price_key("Mystery Hat", 6)
+    assert batch.value(key, sku(9999, 6))[1] == "7.00 ref"
+
+    result = service.value_inventory(
+        [vs.price_key("Rocket Launcher", 15)],
+        skus=[sku(18, 15, wear="Field-Tested", paintkit_id=350)],
+    )
+    assert result.total_value_raw == 20.0
+
+
+def test_sku_index_built_once_under_concurrent_batches(schema, monkeypatch):
+    builds = []
+
+    def slow_build(*args):
+        builds.append(1)
+        time.sleep(0.05)
+        return build_sku_index(*args)
+
+    monkeypatch.setattr(vs, "build_sku_index", slow_build)
+    service = vs.ValuationService(price_map=PRICE_MAP)
+    assert service.built_sku_index() is None
+    indexes = []
+
+    def scan():
+        with schema_snapshot.use(schema):
+            indexes.append(service.batch().sku_index)
+
+    threads = [threading.Thread(target=scan) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert all(index is service.built_sku_index() for index in indexes)
+
+
+@pytest.mark.asyncio
+async def test_unmatched_endpoint(async_client, monkeypatch, schema):
+    monkeypatch.setattr(vs, "_default_service", None)
+    service = vs.ValuationService(price_map=PRICE_MAP)
+    vs.swap_valuation_service(service)
+    assert "sku" not in vs.price_status()
+
+    resp = await async_client.get("/api/prices/unmatched?limit=5")
+    assert resp.status_code == 200
+    assert resp.json()["top_unmatched"] == [{"name": "Mystery Hat", "entries": 1}]
+    assert vs.price_status()["sku"]["entries"] == 11
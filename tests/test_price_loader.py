@@ -294,6 +294,25 @@ def test_backpack_tf_alias_key(tmp_path, monkeypatch):
     assert p.exists()
 
 
+def test_failed_response_keeps_previous_dump(tmp_path, monkeypatch):
+    monkeypatch.setenv("BPTF_API_KEY", "TEST")
+    monkeypatch.setenv("PRICE_RETRIES", "1")
+    prices = tmp_path / "prices.json"
+    dump = '{"response": {"success": 1, "items": {}}}'
+    prices.write_text(dump + " " * price_loader.EMPTY_THRESHOLD)
+    before = prices.read_bytes()
+    monkeypatch.setattr(price_loader, "PRICES_FILE", prices)
+    url = "https://backpack.tf/api/IGetPrices/v4?raw=1&key=TEST"
+    payload = {"response": {"success": 0, "message": "API key invalid"}}
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, url, json=payload, status=200)
+        assert price_loader.ensure_prices_cached(refresh=True) == prices
+
+    assert prices.read_bytes() == before
+    assert not prices.with_suffix(".json.part").exists()
+
+
 def test_dump_and_load_price_map(tmp_path):
     mapping = {("A", 6, True, False, 0, 0): {"value_raw": 1, "currency": "metal"}}
     path = tmp_path / "map.json"
@@ -0,0 +1,240 @@
+import json
+
+import pytest
+
+from utils import local_data, price_history, price_loader, price_refresher, scan_store
+from utils import valuation_service as vs
+
+
+def _dump(value: float) -> dict:
+    return {
+        "response": {
+            "items": {
+                "Ubersaw": {
+                    "prices": {
+                        "6": {
+                            "Tradable": {
+                                "Craftable": [{"value_raw": value, "currency": "metal"}]
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def price_files(tmp_path, monkeypatch):
+    prices = tmp_path / "prices.json"
+    currencies = tmp_path / "currencies.json"
+    monkeypatch.setattr(price_loader, "PRICES_FILE", prices)
+    monkeypatch.setattr(price_loader, "CURRENCIES_FILE", currencies)
+    monkeypatch.setattr(price_loader, "PRICE_MAP_FILE", tmp_path / "price_map.json")
+    monkeypatch.setattr(price_loader, "PRICE_STATE_FILE", tmp_path / "state.json")
+    monkeypatch.setattr(vs, "_default_service", None)
+    monkeypatch.setattr(local_data, "CURRENCIES", {})
+    monkeypatch.setattr(
+        price_history,
+        "_default_history",
+        price_history.PriceHistory(tmp_path / "history"),
+    )
+    state = {"value": 1.0, "key": 50.0, "fail": False, "deltas": []}
+
+    async def fake_prices(refresh=False):
+        if not state["fail"]:
+            prices.write_text(json.dumps(_dump(state["value"])))
+        return prices
+
+    async def fake_currencies(refresh=False):
+        if not state["fail"]:
+            rates = {"keys": {"price": {"value_raw": state["key"]}}}
+            currencies.write_text(json.dumps({"response": {"currencies": rates}}))
+        return currencies
+
+    async def fake_delta(since):
+        state["deltas"].append(since)
+        if state["fail"]:
+            raise OSError("offline")
+        delta = {}
+        for name, item in _dump(state["value"])["response"]["items"].items():
+            price_loader._add_item_prices(delta, name, item)
+        return delta, 1700000000
+
+    monkeypatch.setattr(price_loader, "fetch_price_delta_async", fake_delta)
+    monkeypatch.setattr(price_loader, "ensure_prices_cached_async", fake_prices)
+    monkeypatch.setattr(price_loader, "ensure_currencies_cached_async", fake_currencies)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_refresh_swaps_generation_with_currencies(price_files):
+    old = vs.ValuationService(price_map={})
+    vs.swap_valuation_service(old)
+    refresher = price_refresher.PriceRefresher(interval=60)
+
+    assert await refresher.refresh()
+    new = vs.get_valuation_service()
+    assert new is not old
+    assert new.generation == old.generation + 1
+    assert new.get_price_info("Ubersaw", 6)["value_raw"] == 1.0
+    assert local_data.CURRENCIES is new.currencies
+    assert new.currencies["keys"]["price"]["value_raw"] == 50.0
+    # A scan holding the previous generation keeps pricing against it.
+    assert old.get_price_info("Ubersaw", 6) is None
+    assert price_loader.PRICE_MAP_FILE.with_suffix(".bin").exists()
+
+    status = vs.price_status()
+    assert status["generation"] == new.generation
+    assert status["entries"] == 1
+    assert status["age_s"] >= 0
+    assert refresher.status()["last_error"] is None
+
+
+@pytest.mark.asyncio
+async def test_failed_download_keeps_generation(price_files):
+    refresher = price_refresher.PriceRefresher(interval=60)
+    assert await refresher.refresh()
+    generation = vs.get_valuation_service().generation
+
+    price_files["fail"] = True
+    assert not await refresher.refresh(full=True)
+    assert vs.get_valuation_service().generation == generation
+    assert refresher.status()["last_error"]
+
+    price_files.update(fail=False, value=2.0)
+    assert await refresher.refresh(full=True)
+    service = vs.get_valuation_service()
+    assert service.generation == generation + 1
+    assert service.get_price_info("Ubersaw", 6)["value_raw"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_empty_or_shrunken_dump_is_not_published(price_files, monkeypatch):
+    refresher = price_refresher.PriceRefresher(interval=60)
+    assert await refresher.refresh()
+    service = vs.get_valuation_service()
+    history = price_history.get_price_history().stats()
+
+    async def empty_prices(refresh=False):
+        price_loader.PRICES_FILE.write_text(json.dumps({"response": {"items": {}}}))
+        return price_loader.PRICES_FILE
+
+    monkeypatch.setattr(price_loader, "ensure_prices_cached_async", empty_prices)
+    assert not await refresher.refresh(full=True)
+    assert vs.get_valuation_service() is service
+    assert "0 entries" in refresher.status()["last_error"]
+    assert price_history.get_price_history().stats() == history
+    assert price_loader.load_price_map(price_loader.PRICE_MAP_FILE)
+
+    price_loader.PRICES_FILE.write_text(json.dumps(_dump(3.0)))
+    with pytest.raises(ValueError):
+        price_refresher.build_service(
+            price_loader.PRICES_FILE, price_loader.CURRENCIES_FILE, min_entries=2
+        )
+
+
+def test_refresh_interval(monkeypatch):
+    monkeypatch.setenv("PRICE_REFRESH_INTERVAL", "0")
+    assert not price_refresher.refresher_enabled()
+    monkeypatch.setenv("PRICE_REFRESH_INTERVAL", "10")
+    assert price_refresher.refresh_interval() == price_refresher.MIN_INTERVAL
+    monkeypatch.setenv("PRICE_REFRESH_INTERVAL", "bad")
+    assert price_refresher.refresh_interval() == price_refresher.DEFAULT_INTERVAL
+
+
+def test_stored_scan_records_price_generation(tmp_path):
+    store = scan_store.ScanStore(tmp_path)
+    store.save("76561198000000000", [], price_generation=3)
+    assert store.meta("76561198000000000")["price_generation"] == 3
+    store.save("76561198000000000", [])
+    assert "price_generation" not in store.meta("76561198000000000")
+
+
+@pytest.mark.asyncio
+async def test_prices_endpoint(async_client, monkeypatch):
+    monkeypatch.setattr(vs, "_default_service", None)
+    vs.swap_valuation_service(vs.ValuationService(price_map={}))
+    resp = await async_client.get("/api/prices")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["generation"] == 1
+    assert data["entries"] == 0
+    assert "interval_s" in data["refresher"]
+
+
+@pytest.mark.asyncio
+async def test_delta_refresh_merges_into_current_map(price_files):
+    base = {
+        ("Team Captain", 5, True, False, 13, 0): {"value_raw": 9, "currency": "keys"}
+    }
+    refresher = price_refresher.PriceRefresher(interval=60, full_interval=3600)
+    assert await refresher.refresh()
+    assert refresher.last_mode == "full"
+    state = price_loader.load_price_state()
+    assert state["since"] and state["map"]
+
+    # Seed an entry the next delta does not mention; it must survive the merge.
+    current = vs.get_valuation_service()
+    merged, _ = price_loader.merge_price_map(current.price_map, base)
+    price_loader.dump_price_map(merged, price_loader.PRICE_MAP_FILE)
+    vs.swap_valuation_service(vs.ValuationService(price_map=merged))
+    state["map"] = list(price_refresher._map_stamp())
+    price_loader.save_price_state(state)
+
+    price_files["value"] = 3.0
+    assert await refresher.refresh()
+    assert refresher.last_mode == "delta"
+    assert refresher.last_changed == 1
+    assert price_files["deltas"] == [state["since"]]
+    service = vs.get_valuation_service()
+    assert service.get_price_info("Ubersaw", 6)["value_raw"] == 3.0
+    assert service.get_price_info("Team Captain", 5, effect_id=13)["value_raw"] == 9
+    # History holds both prices of the refreshed item, not the seeded one.
+    history = price_history.get_price_history()
+    curve = history.curve(("Ubersaw", 6, True, False, 0, 0))
+    assert [value for _ts, value, _currency in curve] == [1.0, 3.0]
+    assert not history.curve(("Team Captain", 5, True, False, 13, 0))
+    new_state = price_loader.load_price_state()
+    assert new_state["since"] == 1700000000 - price_refresher.DELTA_OVERLAP
+    assert new_state["full_at"] == state["full_at"]
+
+
+@pytest.mark.asyncio
+async def test_failed_or_inconsistent_delta_falls_back_to_full(price_files):
+    refresher = price_refresher.PriceRefresher(interval=60, full_interval=3600)
+    assert await refresher.refresh()
+
+    price_files.update(fail=True)
+    assert not await refresher.refresh()
+    assert len(price_files["deltas"]) == 1  # tried, then a (failing) full fetch
+
+    # A map rewritten behind the refresher's back forces a full download.
+    price_files.update(fail=False, value=4.0)
+    price_loader.dump_price_map({}, price_loader.PRICE_MAP_FILE)
+    assert await refresher.refresh()
+    assert refresher.last_mode == "full"
+    assert len(price_files["deltas"]) == 1
+
+    # So does an expired full refresh interval.
+    refresher.full_interval = 0
+    assert await refresher.refresh()
+    assert refresher.last_mode == "full"
+
+
+@pytest.mark.asyncio
+async def test_listeners_run_after_publish(price_files):
+    calls = []
+
+    async def listener():
+        calls.append(vs.get_valuation_service().generation)
+        raise RuntimeError("ignored")
+
+    refresher = price_refresher.PriceRefresher(interval=60)
+    refresher.listeners.append(listener)
+    assert await refresher.refresh()
+    assert calls == [vs.get_valuation_service().generation]
+
+    price_files["fail"] = True
+    assert not await refresher.refresh(full=True)
+    assert len(calls) == 1
@@ -0,0 +1,107 @@
+import gc
+import os
+import weakref
+
+import pytest
+
+from utils import price_loader, price_snapshot, valuation_service
+from utils.valuation_service import ValuationService
+
+PRICE_MAP = {
+    ("Team Captain", 5, True, False, 13, 0): {"value_raw": 900.5, "currency": "keys"},
+    ("Team Captain", 5, True, False, 0, 0): {"value_raw": 100.0, "currency": "keys"},
+    ("Team Captain", 6, False, False, 0, 0): {"value_raw": 1.33, "currency": "metal"},
+    ("Rocket Launcher", 11, True, True, 0, 3): {"value_raw": 45.0, "currency": "keys"},
+    ("Ubersaw", 6, True, False, 0, 0): {"value_raw": 0.05, "currency": "metal"},
+    ("Übersaw", 6, True, False, 0, 0): {"value_raw": 2.0, "currency": "usd"},
+}
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = price_snapshot.write_snapshot(PRICE_MAP, tmp_path / "map.bin")
+    snap = price_snapshot.PriceSnapshot(path)
+    assert len(snap) == len(PRICE_MAP)
+    assert dict(snap) == PRICE_MAP
+    assert snap[("Rocket Launcher", 11, True, True, 0, 3)]["currency"] == "keys"
+    assert snap.get(("Rocket Launcher", 11, True, False, 0, 3)) is None
+    assert snap.get(("Missing", 6, True, False, 0, 0), "x") == "x"
+    assert ("Übersaw", 6, True, False, 0, 0) in snap
+    with pytest.raises(KeyError):
+        snap[("Ubersaw", 6, False, False, 0, 0)]
+    snap.close()
+
+
+def test_dropped_snapshot_is_freed_without_gc(tmp_path):
+    path = price_snapshot.write_snapshot(PRICE_MAP, tmp_path / "map.bin")
+    snap = price_snapshot.PriceSnapshot(path)
+    assert snap.get(("Ubersaw", 6, True, False, 0, 0))["currency"] == "metal"
+    ref = weakref.ref(snap)
+    gc.disable()
+    try:
+        del snap
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_empty_and_invalid_snapshots(tmp_path):
+    empty = price_snapshot.PriceSnapshot(
+        price_snapshot.write_snapshot({}, tmp_path / "empty.bin")
+    )
+    assert len(empty) == 0
+    assert empty.get(("A", 6, True, False, 0, 0)) is None
+
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a snapshot at all")
+    with pytest.raises(price_snapshot.SnapshotError):
+        price_snapshot.PriceSnapshot(bad)
+
+
+def test_dump_price_map_writes_snapshot(tmp_path):
+    path = price_loader.dump_price_map(PRICE_MAP, tmp_path / "price_map.json")
+    snap = price_snapshot.PriceSnapshot(path.with_suffix(".bin"))
+    assert dict(snap) == price_loader.load_price_map(path)
+
+
+def test_service_prefers_fresh_snapshot(tmp_path, monkeypatch):
+    json_path = tmp_path / "price_map.json"
+    bin_path = tmp_path / "price_map.bin"
+    monkeypatch.setattr(valuation_service, "PRICE_MAP_FILE", json_path)
+    monkeypatch.setattr(valuation_service, "PRICE_SNAPSHOT_FILE", bin_path)
+    monkeypatch.setattr(valuation_service, "PRICES_FILE", tmp_path / "prices.json")
+    price_loader.dump_price_map(PRICE_MAP, json_path)
+
+    service = ValuationService()
+    assert isinstance(service.price_map, price_snapshot.PriceSnapshot)
+    info = service.get_price_info("Team Captain", 5, effect_id=13)
+    assert info == {"value_raw": 900.5, "currency": "keys"}
+    # Effect fallback works against the snapshot as with a dict.
+    assert service.get_price_info("Team Captain", 5, effect_id=99)["value_raw"] == 100
+
+    # A JSON map newer than the snapshot wins and the snapshot is rewritten.
+    newer = {("Ubersaw", 6, True, False, 0, 0): {"value_raw": 3.0, "currency": "metal"}}
+    json_path.write_text(
+        '[[["Ubersaw", 6, true, false, 0, 0], '
+        '{"value_raw": 3.0, "currency": "metal"}]]'
+    )
+    stat = bin_path.stat()
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    service = ValuationService()
+    assert service.price_map == newer
+    assert dict(price_snapshot.PriceSnapshot(bin_path)) == newer
+
+
+def test_service_rebuilds_map_older_than_dump(tmp_path, monkeypatch):
+    prices = tmp_path / "prices.json"
+    monkeypatch.setattr(valuation_service, "PRICE_MAP_FILE", tmp_path / "m.json")
+    monkeypatch.setattr(valuation_service, "PRICE_SNAPSHOT_FILE", tmp_path / "m.bin")
+    monkeypatch.setattr(valuation_service, "PRICES_FILE", prices)
+    price_loader.dump_price_map(PRICE_MAP, tmp_path / "m.json")
+    prices.write_text("{}")
+    stat = (tmp_path / "m.bin").stat()
+    os.utime(prices, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    monkeypatch.setattr(valuation_service, "ensure_prices_cached", lambda: prices)
+
+    service = ValuationService()
+    assert dict(service.price_map) == {}
+    assert len(price_snapshot.PriceSnapshot(tmp_path / "m.bin")) == 0
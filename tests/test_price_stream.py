@@ -0,0 +1,117 @@
+import json
+
+import pytest
+import responses
+
+from utils import price_loader
+from utils.price_stream import PriceItemStream
+
+DUMP = {
+    "response": {
+        "success": 1,
+        "current_time": 1700000000,
+        "raw_usd_value": 0.035,
+        "items": {
+            f"Item {i} é": {
+                "defindex": [i],
+                "prices": {
+                    "6": {
+                        "Tradable": {
+                            "Craftable": [
+                                {"value_raw": i * 1.5e-3, "currency": "metal"}
+                            ]
+                        }
+                    }
+                },
+            }
+            for i in range(200)
+        },
+        "usd_currency": "metal",
+    }
+}
+
+
+def _parse(data: bytes, size: int):
+    stream = PriceItemStream()
+    items = []
+    for start in range(0, len(data), size):
+        items.extend(stream.feed(data[start : start + size]))
+    items.extend(stream.close())
+    return items, stream
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("size", [1, 3, 4096])
+def test_items_survive_any_chunking(indent, size):
+    data = json.dumps(DUMP, indent=indent, ensure_ascii=False).encode()
+    items, stream = _parse(data, size)
+    assert dict(items) == DUMP["response"]["items"]
+    assert stream.items == 200
+    assert stream.bytes == len(data)
+
+
+def test_empty_and_malformed_documents():
+    assert _parse(b"{}", 1)[0] == []
+    assert _parse(b'{"response": {"success": 0}}', 2)[0] == []
+    with pytest.raises(ValueError):
+        _parse(b'{"response": {"items": {"A": {}', 4)
+    with pytest.raises(ValueError):
+        _parse(b'{"response": 1} trailing', 4)
+    with pytest.raises(ValueError):
+        _parse(b"[]", 4)
+
+
+def test_download_builds_map_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("BPTF_API_KEY", "TEST")
+    monkeypatch.setattr(price_loader, "PRICES_FILE", tmp_path / "prices.json")
+    url = "https://backpack.tf/api/IGetPrices/v4?raw=1&key=TEST"
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, url, json=DUMP, status=200)
+        path = price_loader.ensure_prices_cached(refresh=True)
+
+    assert json.loads(path.read_text()) == DUMP
+    assert not path.with_suffix(".json.part").exists()
+
+    # The map built during the download is reused, then the file is parsed.
+    monkeypatch.setattr(price_loader, "PriceItemStream", None)
+    mapping = price_loader.build_price_map(path)
+    assert mapping[("Item 10 é", 6, True, False, 0, 0)]["value_raw"] == 0.015
+    with pytest.raises(TypeError):
+        price_loader.build_price_map(path)
+
+
+def test_truncated_download_keeps_previous_dump(tmp_path, monkeypatch):
+    monkeypatch.setenv("BPTF_API_KEY", "TEST")
+    monkeypatch.setenv("PRICE_RETRIES", "1")
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps(DUMP) + " " * price_loader.EMPTY_THRESHOLD)
+    monkeypatch.setattr(price_loader, "PRICES_FILE", path)
+    url = "https://backpack.tf/api/IGetPrices/v4?raw=1&key=TEST"
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, url, body=json.dumps(DUMP)[:-40], status=200)
+        assert price_loader.ensure_prices_cached(refresh=True) == path
+
+    assert json.loads(path.read_text()) == DUMP
+    assert not path.with_suffix(".json.part").exists()
+
+
+def test_price_delta_and_merge(monkeypatch):
+    monkeypatch.setenv("BPTF_API_KEY", "TEST")
+    url = "https://backpack.tf/api/IGetPrices/v4?raw=1&since=1699990000&key=TEST"
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, url, json=DUMP, status=200)
+        delta, server_time = price_loader.fetch_price_delta(1699990000)
+    assert server_time == 1700000000
+    assert len(delta) == 200
+
+    base = {("Old", 6, True, False, 0, 0): {"value_raw": 1, "currency": "metal"}}
+    key = ("Item 3 é", 6, True, False, 0, 0)
+    base[key] = dict(delta[key])
+    merged, changed = price_loader.merge_price_map(base, delta)
+    assert changed == 199
+    assert len(merged) == 201 and "Old" in {k[0] for k in merged}
+
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, url, json={"response": {"success": 0}}, status=200)
+        with pytest.raises(ValueError):
+            price_loader.fetch_price_delta(1699990000)
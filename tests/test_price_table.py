@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from utils import price_loader
+from utils.price_table import CompactPriceMap
+from utils.valuation_service import ValuationService
+
+PRICE_MAP = {
+    ("Team Captain", 5, True, False, 13, 0): {"value_raw": 4000.0, "currency": "keys"},
+    ("Team Captain", 5, True, False, 0, 0): {"value_raw": 3000.0, "currency": "keys"},
+    ("Team Captain", 6, False, False, 0, 0): {"value_raw": 20.0, "currency": "metal"},
+    ("Rocket Launcher", 11, True, True, 0, 3): {"value_raw": 900.0, "currency": "keys"},
+    ("Rocket Launcher", 11, True, True, 0, 0): {"value_raw": 800.0, "currency": "keys"},
+    ("Crate", 6, True, False, -1, 0): {"value_raw": 0.05, "currency": "metal"},
+    ("Bad", 6, True, False, 0, 0): {"value_raw": "n/a", "currency": "metal"},
+}
+
+
+def test_round_trips_map():
+    compact = CompactPriceMap(PRICE_MAP)
+    expected = {k: v for k, v in PRICE_MAP.items() if k[0] != "Bad"}
+    assert len(compact) == len(expected)
+    assert dict(compact.items()) == expected
+    assert compact[("Crate", 6, True, False, -1, 0)]["value_raw"] == 0.05
+    assert compact.get(("Team Captain", 5, True, False, 99, 0)) is None
+    assert compact.get(("Nope", 6, True, False, 0, 0), "x") == "x"
+    assert compact.get(("Team Captain", "x", True, False, 0, 0)) is None
+    with pytest.raises(KeyError):
+        compact[("Bad", 6, True, False, 0, 0)]
+
+
+def test_resolve_matches_dict_fallbacks():
+    compact = CompactPriceMap(PRICE_MAP)
+    dict_service = ValuationService(price_map={})
+    dict_service.price_map = PRICE_MAP
+    compact_service = ValuationService(price_map=PRICE_MAP)
+    assert isinstance(compact_service.price_map, CompactPriceMap)
+    for args in [
+        ("Team Captain", 5, True, False, 13, 2),
+        ("Team Captain", 5, True, False, 701, None),
+        ("Team Captain", 6, False),
+        ("Rocket Launcher", 11, True, True, None, 2),
+        ("Rocket Launcher", 11, True, True, 13, 3),
+        ("Rocket Launcher", 6),
+    ]:
+        expected = dict_service.get_price_info(*args)
+        assert compact_service.get_price_info(*args) == expected
+        key = args + (None,) * (6 - len(args))
+        key = key[:4] + (key[4] or 0, key[5] or 0)
+        assert compact.resolve(key) == expected
+
+
+def test_streamed_build_keeps_last_duplicate(tmp_path):
+    entries = [
+        (("Hat", 6, True, False, 0, 0), {"value_raw": 1.0, "currency": "metal"}),
+        (("Hat", 6, True, False, 0, 0), {"value_raw": 2.0, "currency": "metal"}),
+    ]
+    assert CompactPriceMap(entries)[entries[0][0]]["value_raw"] == 2.0
+
+    dump = {
+        "response": {
+            "items": {
+                "Hat": {
+                    "prices": {
+                        "6": {
+                            "Tradable": {
+                                "Craftable": [{"value_raw": 3, "currency": "metal"}]
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps(dump))
+    compact = CompactPriceMap(price_loader.iter_price_entries(path))
+    assert dict(compact.items()) == price_loader.build_price_map(path)
+    assert compact.nbytes() > 0
@@ -0,0 +1,202 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import card_events, repricer, scan_store
+from utils import valuation_service as vs
+
+STEAMID = "76561198000000001"
+PROFILE = {"username": "pyro", "avatar": "", "playtime": 10, "profile": ""}
+
+
+def _item(name, quality="Unique", quality_id=6, value=1.0, **extra):
+    item = {
+        "name": name,
+        "base_name": name,
+        "defindex": "9999",
+        "quality": quality,
+        "craftable": True,
+        "is_australium": False,
+        "unusual_effect_id": None,
+        "killstreak_tier": None,
+        "is_festivized": False,
+        "wear_name": None,
+        "paintkit_id": None,
+        "price": {"value_raw": value, "currency": "metal"},
+        "price_string": f"{value:.2f} ref",
+        "formatted_price": f"{value:.2f} ref",
+    }
+    if quality_id is not None:
+        item["quality_id"] = quality_id
+    item.update(extra)
+    return item
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = scan_store.ScanStore(tmp_path)
+    monkeypatch.setattr(scan_store, "_default_store", store)
+    monkeypatch.setattr(vs, "_default_service", None)
+    monkeypatch.setattr(card_events, "_default_events", card_events.CardEvents())
+    items = [
+        _item("Ubersaw"),
+        _item("Team Captain", "Unusual", None, 400.0, unusual_effect_id=13),
+        _item("Gift", quality_id=6, _hidden=True, price=None, price_string=""),
+    ]
+    store.save(
+        STEAMID, items, price_generation=0, meta={"profile": PROFILE, "scanned_at": 1}
+    )
+    return store
+
+
+def _service():
+    price_map = {
+        ("Ubersaw", 6, True, False, 0, 0): {"value_raw": 2.0, "currency": "metal"},
+        ("Team Captain", 5, True, False, 13, 0): {
+            "value_raw": 500.0,
+            "currency": "metal",
+        },
+        ("Gift", 6, True, False, 0, 0): {"value_raw": 9.0, "currency": "metal"},
+    }
+    service = vs.ValuationService(
+        price_map=price_map, currencies={"keys": {"price": {"value_raw": 50.0}}}
+    )
+    vs.swap_valuation_service(service)
+    return service
+
+
+def test_reprice_scan_rewrites_prices_and_keeps_scan_time(store):
+    service = _service()
+    result = repricer.reprice_scan(STEAMID)
+    assert result.repriced and result.changed == 2 and result.items == 3
+    assert result.value.total_value_raw == 502.0
+
+    items = {item["name"]: item for item in store.iter_items(STEAMID)}
+    assert items["Ubersaw"]["price"]["value_raw"] == 2.0
+    assert items["Ubersaw"]["price_string"] == "2.00 ref"
+    # Stored before ``quality_id`` existed: resolved from the quality name.
+    assert items["Team Captain"]["quality_id"] == 5
+    assert items["Team Captain"]["price_string"] == "10 Keys"
+    assert items["Gift"]["price"] is None
+
+    meta = store.meta(STEAMID)
+    assert meta["scanned_at"] == 1
+    assert meta["repriced_at"] > 1
+    assert meta["price_generation"] == service.generation
+    assert meta["profile"] == PROFILE
+    assert meta["value"]["total_value_raw"] == 502.0
+
+    assert not repricer.reprice_scan(STEAMID).repriced
+    assert repricer.reprice_scan(STEAMID, force=True).changed == 0
+    assert repricer.reprice_scan("76561198000000009") is None
+
+
+def test_scan_from_earlier_process_is_stale(store):
+    service = _service()
+    # Same generation number, but written before this service was loaded.
+    store.save(STEAMID, [], price_generation=service.generation, meta={"scanned_at": 1})
+    assert not repricer.is_current(store.meta(STEAMID), service)
+    results = repricer.reprice_scans()
+    assert [r.repriced for r in results] == [True]
+    assert repricer.is_current(store.meta(STEAMID), service)
+
+
+def test_card_events_stream():
+    events = card_events.CardEvents(max_queued=2)
+    stream = events.stream(heartbeat=0.01)
+    assert next(stream) == ": connected\n\n"
+    assert events.subscribers() == 1
+    assert next(stream) == ": keep-alive\n\n"
+    for n in range(3):
+        assert events.publish("card", {"n": n}) == 1
+    # The oldest event was dropped for the slow reader.
+    assert next(stream) == 'event: card\ndata: {"n": 1}\n\n'
+    stream.close()
+    assert events.subscribers() == 0
+
+
+def _asgi_request(asgi_app, path):
+    inbox = asyncio.Queue()
+    inbox.put_nowait({"type": "http.request", "body": b"", "more_body": False})
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("testserver", 80),
+    }
+    return asyncio.ensure_future(asgi_app(scope, inbox.get, send)), inbox, sent
+
+
+@pytest.mark.asyncio
+async def test_event_streams_do_not_hold_executor_threads(app):
+    # Fewer executor workers than open streams, as with Hypercorn's default.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+    events = card_events.CardEvents()
+    asgi_app = card_events.EventStreamApp(app, events, heartbeat=0.05, max_streams=5)
+    streams = [_asgi_request(asgi_app, "/api/events") for _ in range(5)]
+    await asyncio.sleep(0.1)
+    assert events.subscribers() == 5
+
+    task, _, sent = _asgi_request(asgi_app, "/api/constants")
+    await asyncio.wait_for(task, 5)
+    assert sent[0]["status"] == 200
+    task, _, sent = _asgi_request(asgi_app, "/api/events")
+    await asyncio.wait_for(task, 5)
+    assert sent[0]["status"] == 503
+
+    # Published from another thread, delivered to every stream.
+    assert await asyncio.to_thread(events.publish, "card", {"n": 1}) == 5
+    await asyncio.sleep(0.1)
+    for _, _, sent in streams:
+        assert sent[0]["status"] == 200
+        bodies = [m.get("body", b"") for m in sent[1:]]
+        assert bodies[0] == b": connected\n\n"
+        assert b'event: card\ndata: {"n": 1}\n\n' in bodies
+
+    # Streams end as soon as their client disconnects.
+    for _, inbox, _ in streams:
+        inbox.put_nowait({"type": "http.disconnect"})
+    await asyncio.wait_for(asyncio.gather(*(s[0] for s in streams)), 5)
+    assert events.subscribers() == 0
+
+
+@pytest.mark.asyncio
+async def test_event_stream_ends_after_max_age(app):
+    events = card_events.CardEvents()
+    asgi_app = card_events.EventStreamApp(app, events, heartbeat=0.01, max_age=0.05)
+    task, _, sent = _asgi_request(asgi_app, "/api/events")
+    await asyncio.wait_for(task, 5)
+    assert sent[-1] == {"type": "http.response.body", "body": b""}
+    assert events.subscribers() == 0
+
+
+@pytest.mark.asyncio
+async def test_reprice_endpoint_pushes_cards(async_client, store):
+    _service()
+    subscriber = card_events.get_card_events().subscribe()
+
+    resp = await async_client.post("/api/reprice", json={"ids": [STEAMID]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["repriced"] == 1 and data["changed_items"] == 2
+    assert data["results"][0]["steamid"] == STEAMID
+
+    message = subscriber.get_nowait()
+    assert message.startswith("event: card\n")
+    assert f"user-{STEAMID}" in message and "10 Keys 2.00 ref" in message
+
+    resp = await async_client.post("/api/reprice", json={})
+    assert resp.json()["skipped"] == 1
+    resp = await async_client.post("/api/reprice", json={"ids": "x"})
+    assert resp.status_code == 400
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import time
+
+import pytest
+
+from utils import scan
+from utils import steam_api_client as sac
+
+STATUS_DUMP = """hostname: Valve Matchmaking Server
+# userid name                uniqueid            connected ping loss state
+#      2 "Player One"        [U:1:22202]         12:34       50    0 active
+#      3 "Player Two"        [U:1:22202]         12:34       50    0 active
+"""
+
+
+def test_iter_tokens_reads_ids_vanity_and_status_dumps():
+    lines = [
+        "76561197960287930\n",
+        "\n",
+        "gaben\n",
+        "https://steamcommunity.com/id/someone/\n",
+        "https://steamcommunity.com/profiles/76561197960287931\n",
+        *STATUS_DUMP.splitlines(),
+        "gaben\n",
+    ]
+    assert list(scan.iter_tokens(lines)) == [
+        "76561197960287930",
+        "gaben",
+        "someone",
+        "76561197960287931",
+        "[U:1:22202]",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_acquisitions():
+    limiter = scan.RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+    assert time.monotonic() - start >= 0.055
+
+
+@pytest.fixture
+def fake_steam(monkeypatch):
+    calls = []
+
+    async def fake_fetch(steamid):
+        calls.append(steamid)
+        if steamid.endswith("1") and calls.count(steamid) == 1:
+            return "failed", {}
+        if steamid.endswith("2"):
+            return "private", {}
+        return "parsed", {"items": [{"id": 7}]}
+
+    async def fake_vanity(vanity):
+        return "76561197960287939" if vanity == "gaben" else None
+
+    monkeypatch.setattr(sac, "fetch_inventory_async", fake_fetch)
+    monkeypatch.setattr(sac, "resolve_vanity_url_async", fake_vanity)
+    monkeypatch.setattr(
+        scan,
+        "process_inventory",
+        lambda data, valuation_service=None: [
+            {"id": i["id"], "name": "Key", "price": {"value_raw": 60.0}}
+            for i in data["items"]
+        ],
+    )
+    return calls
+
+
+async def _collect(tokens, **kwargs):
+    return [r async for r in scan.scan_many(tokens, None, rate=0, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_scan_many_resolves_retries_and_values(fake_steam):
+    tokens = ["76561197960287930", "76561197960287931", "76561197960287932"]
+    results = await _collect(tokens + ["gaben", "nobody"], backoff=0)
+    by_input = {r["input"]: r for r in results}
+
+    assert by_input["76561197960287930"]["value_refined"] == 60.0
+    assert by_input["76561197960287931"]["status"] == "parsed"
+    assert fake_steam.count("76561197960287931") == 2
+    assert by_input["76561197960287932"]["status"] == "private"
+    assert by_input["gaben"]["steamid"] == "76561197960287939"
+    assert by_input["nobody"]["status"] == "unresolved"
+
+
+@pytest.mark.asyncio
+async def test_format_result_ndjson_and_csv(fake_steam):
+    (result,) = await _collect(["76561197960287930"])
+    columns = ("name", "price_refined")
+
+    record = json.loads("".join(scan.format_result(result, "ndjson", columns)))
+    assert record["items"] == [{"name": "Key", "price_refined": 60.0}]
+
+    header = scan.csv_header(columns)
+    body = "".join(scan.format_result(result, "csv", columns))
+    rows = list(csv.reader(io.StringIO(",".join(header) + "\n" + body)))
+    assert rows[1] == ["76561197960287930", "parsed", "Key", "60.0"]
+
+    summary = "".join(scan.format_result(result, "csv", columns, summary_only=True))
+    assert summary.strip() == "76561197960287930,76561197960287930,parsed,1,60.0"
+
+
+def test_main_streams_ndjson(monkeypatch, fake_steam, capsys):
+    monkeypatch.setattr(scan.local_data, "load_files", lambda **_: ({}, {}))
+    monkeypatch.setattr(scan, "get_valuation_service", lambda: None)
+    monkeypatch.setattr("sys.stdin", io.StringIO("76561197960287930\ngaben\n"))
+
+    assert scan.main(["--rate", "0", "--summary-only"]) == 0
+    out = capsys.readouterr()
+    records = [json.loads(line) for line in out.out.splitlines()]
+    assert {r["steamid"] for r in records} == {
+        "76561197960287930",
+        "76561197960287939",
+    }
+    assert "items" not in records[0]
+    assert "Scanned 2 users" in out.err
@@ -0,0 +1,93 @@
+import importlib
+import json
+import time
+
+import pytest
+
+from utils import scan_profiler
+
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_sampling_profiler_collapses_stacks():
+    profiler = scan_profiler.SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy_loop(0.1)
+    profiler.stop()
+    folded = profiler.collapsed()
+    assert "_busy_loop (tests/test_scan_profiler.py:" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert ";" in stack
+
+
+def test_admin_authorized(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert not scan_profiler.admin_authorized("anything")
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    assert scan_profiler.admin_authorized("secret")
+    assert not scan_profiler.admin_authorized("wrong")
+    assert not scan_profiler.admin_authorized(None)
+
+
+def test_capture_records_inventories_only_while_active(tmp_path, monkeypatch):
+    monkeypatch.setattr(scan_profiler, "PROFILE_DIR", tmp_path)
+    scan_profiler.record_inventory("1", "parsed", {"items": []})
+    with scan_profiler.capture("unit") as capture:
+        scan_profiler.record_inventory("2", "parsed", {"items": [{"id": 1}]})
+    assert list(capture.inventories) == ["2"]
+    saved = tmp_path / capture.profile_id
+    assert json.loads((saved / "inventory_2.json").read_text()) == {
+        "items": [{"id": 1}]
+    }
+    assert json.loads((saved / "meta.json").read_text())["label"] == "unit"
+    assert scan_profiler.load_profile(capture.profile_id) is not None
+    assert scan_profiler.load_profile("../../etc") is None
+
+
+@pytest.mark.asyncio
+async def test_api_users_profile_requires_admin(monkeypatch, tmp_path, async_client):
+    mod = importlib.import_module("app")
+    monkeypatch.setattr(scan_profiler, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(mod.sac, "convert_to_steam64", lambda x: x)
+
+    async def fake_summary(_id):
+        return {"username": "u", "avatar": "", "playtime": 0, "profile": ""}
+
+    async def fake_fetch(steamid):
+        return "parsed", {"items": [{"defindex": 5021}]}
+
+    monkeypatch.setattr(mod, "get_player_summary", fake_summary)
+    monkeypatch.setattr(mod.sac, "fetch_inventory_async", fake_fetch)
+    monkeypatch.setattr(mod.ip, "process_inventory", lambda data, **_: [])
+    monkeypatch.setattr(mod.ip, "get_valuation_service", lambda: None)
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+    resp = await async_client.post("/api/users?profile=1", json={"ids": ["1"]})
+    assert resp.status_code == 403
+
+    resp = await async_client.post(
+        "/api/users?profile=1",
+        json={"ids": ["1"]},
+        headers={"X-Admin-Token": "secret"},
+    )
+    assert resp.status_code == 200
+    profile = resp.json()["profile"]
+    assert profile["inventories"] == {"1": "parsed"}
+    assert (tmp_path / profile["id"] / "inventory_1.json").exists()
+
+    resp = await async_client.get(
+        f"/debug/profiles/{profile['id']}", headers={"X-Admin-Token": "secret"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+
+    resp = await async_client.post(
+        "/retry/1?profile=1", headers={"X-Admin-Token": "secret"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["X-Profile-Id"]
@@ -0,0 +1,73 @@
+from utils import local_data as ld
+from utils import schema_cache, schema_snapshot
+from utils.inventory import extract_attr_classes as eac
+from utils.inventory import extractors_grade_tier as egt
+from utils.inventory import processor
+
+
+def test_derived_rebuilds_once_per_generation(monkeypatch):
+    calls = []
+    table = schema_cache.Derived(lambda: calls.append(1) or len(calls), ("ITEMS",))
+    monkeypatch.setattr(ld, "ITEMS", {}, False)
+    assert table() == 1
+    assert table() == 1
+    monkeypatch.setattr(ld, "SCHEMA_GENERATION", ld.SCHEMA_GENERATION + 1)
+    assert table() == 2
+    monkeypatch.setattr(ld, "ITEMS", {}, False)
+    assert table() == 3
+    table.invalidate()
+    assert table() == 4
+    assert table.builds == 4
+
+
+def test_derived_follows_bound_snapshot(monkeypatch):
+    monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {142: {"attribute_class": "old"}})
+    with schema_snapshot.use():
+        assert eac.refresh_attr_classes().paint == {"old"}
+        monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {142: {"attribute_class": "new"}})
+        # A reload mid-scan does not change the tables the scan reads.
+        assert eac.refresh_attr_classes().paint == {"old"}
+        assert schema_snapshot.current().schema_attributes[142] == {
+            "attribute_class": "new"
+        }
+    assert eac.refresh_attr_classes().paint == {"new"}
+    builds = eac._attr_class_sets.builds
+    with schema_snapshot.use():
+        assert eac.refresh_attr_classes().paint == {"new"}
+    assert eac._attr_class_sets.builds == builds
+
+
+def test_derived_mapping_follows_table(monkeypatch):
+    table = schema_cache.Derived(lambda: {"gen": ld.SCHEMA_GENERATION}, ())
+    view = schema_cache.DerivedMapping(table)
+    before = view["gen"]
+    monkeypatch.setattr(ld, "SCHEMA_GENERATION", before + 1)
+    assert view.get("gen") == before + 1
+    assert dict(view) == {"gen": before + 1}
+
+
+def test_schema_reload_rebuilds_attr_classes(monkeypatch):
+    monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {142: {"attribute_class": "a"}})
+    classes = eac.refresh_attr_classes()
+    assert classes.paint == {"a"}
+    assert eac.PAINT_CLASSES == {"a"}
+    assert processor._get_special_attr_defindexes() is (
+        processor._get_special_attr_defindexes()
+    )
+
+    monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {261: {"attribute_class": "b"}})
+    assert eac.refresh_attr_classes().paint == {"b"}
+    assert eac.PAINT_CLASSES == {"b"}
+    # Values handed out earlier are never changed underneath their reader.
+    assert classes.paint == {"a"}
+    assert isinstance(classes.paint, frozenset)
+
+
+def test_grade_endpoint_memo_reset_on_new_generation(monkeypatch):
+    egt._grade_endpoint_lookups()[5021] = "Mercenary Grade"
+    assert egt._grade_endpoint_lookups()[5021] == "Mercenary Grade"
+    monkeypatch.setattr(ld, "SCHEMA_GENERATION", ld.SCHEMA_GENERATION + 1)
+    assert 5021 not in egt._grade_endpoint_lookups()
+    assert "utils.inventory.processor._get_special_attr_defindexes" in (
+        schema_cache.snapshot()
+    )
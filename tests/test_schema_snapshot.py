@@ -0,0 +1,74 @@
+import dataclasses
+from types import MappingProxyType
+
+import pytest
+
+from utils import local_data as ld
+from utils import schema_snapshot
+from utils.inventory import extract_attr_classes as eac
+
+
+def test_snapshot_tables_are_read_only(monkeypatch):
+    monkeypatch.setattr(ld, "QUALITIES_BY_INDEX", {6: "Unique"})
+    snap = schema_snapshot.current()
+    assert snap.qualities_by_index[6] == "Unique"
+    assert isinstance(snap.qualities_by_index, MappingProxyType)
+    with pytest.raises(TypeError):
+        snap.qualities_by_index[6] = "Strange"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snap.generation = 99
+
+
+def test_current_recaptures_only_when_tables_change(monkeypatch):
+    monkeypatch.setattr(ld, "EFFECT_NAMES", {"13": "Burning Flames"})
+    first = schema_snapshot.current()
+    assert schema_snapshot.current() is first
+    monkeypatch.setattr(ld, "EFFECT_NAMES", {"13": "Scorching Flames"})
+    second = schema_snapshot.current()
+    assert second is not first
+    assert second.effect_names["13"] == "Scorching Flames"
+    assert first.effect_names["13"] == "Burning Flames"
+
+
+def test_bound_snapshot_survives_reload(monkeypatch):
+    monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {142: {"attribute_class": "old"}})
+    with schema_snapshot.use() as snap:
+        monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {142: {"attribute_class": "new"}})
+        assert schema_snapshot.active() is snap
+        assert eac.get_attr_class(142) == "old"
+        with schema_snapshot.use():
+            assert schema_snapshot.active() is snap
+    assert eac.get_attr_class(142) == "new"
+
+
+def test_explicit_snapshot_is_used(monkeypatch):
+    monkeypatch.setattr(ld, "SCHEMA_ATTRIBUTES", {})
+    custom = dataclasses.replace(
+        schema_snapshot.current(),
+        schema_attributes=MappingProxyType({7: {"attribute_class": "x"}}),
+    )
+    with schema_snapshot.use(custom):
+        assert eac.get_attr_class(7) == "x"
+    assert eac.get_attr_class(7) is None
+
+
+def test_load_files_publishes_after_reload(monkeypatch):
+    monkeypatch.setattr(ld, "ITEMS_BY_DEFINDEX", {1: {"name": "old"}})
+    before = schema_snapshot.current()
+    seen = {}
+
+    def fake_load(**_):
+        assert ld.RELOAD_LOCK.locked()
+        ld.ITEMS_BY_DEFINDEX = {1: {"name": "new"}}
+        # Half-way through a reload readers still get the old generation.
+        seen["mid"] = schema_snapshot.current()
+        ld.SCHEMA_GENERATION += 1
+        return ld.SCHEMA_ATTRIBUTES, ld.ITEMS_BY_DEFINDEX
+
+    monkeypatch.setattr(ld, "_load_files", fake_load)
+    monkeypatch.setattr(ld, "SCHEMA_GENERATION", ld.SCHEMA_GENERATION)
+    ld.load_files()
+    after = schema_snapshot.current()
+    assert seen["mid"] is before
+    assert after.generation == before.generation + 1
+    assert after.items_by_defindex[1]["name"] == "new"
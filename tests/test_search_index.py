@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from utils import scan_store, search_index
+
+ALICE = "76561197960287930"
+BOB = "76561197960287931"
+
+
+def _items():
+    return [
+        {
+            "id": 1,
+            "display_name": "Burning Flames Team Captain",
+            "quality": "Unusual",
+            "unusual_effect_name": "Burning Flames",
+            "defindex": 378,
+            "price": {"value_raw": 5000.0},
+        },
+        {
+            "id": 2,
+            "display_name": "Mann Co. Supply Crate Key",
+            "quality": "Unique",
+            "defindex": 5021,
+            "price": {"value_raw": 60.0},
+        },
+        {
+            "id": 3,
+            "display_name": "Professional Killstreak Rocket Launcher",
+            "quality": "Strange",
+            "sheen_name": "Hot Rod",
+            "killstreak_effect": "Tornado",
+            "defindex": 205,
+            "price": {"value_raw": 30.0},
+        },
+    ]
+
+
+@pytest.fixture
+def index(tmp_path):
+    store = scan_store.ScanStore(tmp_path)
+    store.save(ALICE, _items())
+    store.save(BOB, _items()[1:])
+    idx = search_index.SearchIndex(store)
+    assert idx.refresh() == {"indexed": 2, "removed": 0}
+    return idx
+
+
+def test_search_by_text_facets_and_price(index):
+    result = index.search("flames")
+    assert result["total"] == 1
+    assert result["items"][0]["steamid"] == ALICE
+
+    result = index.search("key")
+    assert {i["steamid"] for i in result["items"]} == {ALICE, BOB}
+    assert result["users"] == 2
+
+    assert index.search(filters={"killstreaker": "tornado"})["total"] == 2
+    assert index.search(filters={"quality": "unusual", "defindex": 5021})["total"] == 0
+    assert index.search(min_price=50, max_price=100)["total"] == 2
+    assert index.search("key", steamid=BOB)["total"] == 1
+
+    ordered = [i["price_refined"] for i in index.search()["items"]]
+    assert ordered == sorted(ordered, reverse=True)
+    with pytest.raises(ValueError):
+        index.search(filters={"bogus": 1})
+
+
+def test_refresh_reindexes_only_changed_users(index):
+    store = index.store
+    assert index.refresh() == {"indexed": 0, "removed": 0}
+
+    store.save(BOB, [{"id": 9, "display_name": "Burning Flames Hat"}])
+    path = store.path(BOB)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert index.refresh() == {"indexed": 1, "removed": 0}
+    assert index.search("flames")["users"] == 2
+    assert index.search("key")["total"] == 1
+
+    store.delete(ALICE)
+    assert index.refresh() == {"indexed": 0, "removed": 1}
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint(async_client):
+    scan_store.get_scan_store().save(ALICE, _items())
+    resp = await async_client.get("/api/search?q=captain&effect=Burning+Flames")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1
+    assert body["items"][0]["price_refined"] == 5000.0
+    assert "took_ms" in body
@@ -0,0 +1,99 @@
+import functools
+from collections import Counter
+
+import httpx
+import pytest
+
+from scripts import load_driver
+from scripts.standin_server import StandInApp, StandInConfig
+from scripts.synthetic_data import synthetic_items
+from utils import steam_api_client as sac
+
+STEAMID = "76561197960287930"
+
+
+@pytest.fixture
+def standin():
+    return StandInApp(StandInConfig(inventory_size=25), synthetic_items(40))
+
+
+def _client(app, **kwargs):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://standin", **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_serves_steam_and_backpack_endpoints(standin):
+    async with _client(standin) as client:
+        items = await client.get(
+            "/IEconItems_440/GetPlayerItems/v0001/", params={"steamid": STEAMID}
+        )
+        prices = await client.get("/IGetPrices/v4", params={"raw": 1})
+        currencies = await client.get("/IGetCurrencies/v1")
+        missing = await client.get("/nope")
+
+    assert items.json()["result"]["status"] == 1
+    assert len(items.json()["result"]["items"]) == 25
+    assert prices.json()["response"]["items"]
+    assert "keys" in currencies.json()["response"]["currencies"]
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_and_error_rates():
+    app = StandInApp(StandInConfig(rate_limit_rate=1.0), synthetic_items(4))
+    async with _client(app) as client:
+        resp = await client.get("/IGetCurrencies/v1")
+    assert resp.status_code == 429
+
+    app = StandInApp(StandInConfig(error_rate=1.0), synthetic_items(4))
+    async with _client(app) as client:
+        resp = await client.get("/IGetCurrencies/v1")
+    assert resp.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_steam_client_uses_configured_base_url(monkeypatch, standin):
+    monkeypatch.setattr(sac, "STEAM_API_KEY", "x")
+    monkeypatch.setattr(sac, "STEAM_API_BASE_URL", "http://standin")
+    monkeypatch.setattr(
+        sac.httpx,
+        "AsyncClient",
+        functools.partial(
+            httpx.AsyncClient, transport=httpx.ASGITransport(app=standin)
+        ),
+    )
+
+    status, inventory = await sac.fetch_inventory_async(STEAMID)
+    players = await sac.get_player_summaries_async([STEAMID])
+    hours = await sac.get_tf2_playtime_hours_async(STEAMID)
+    steamid = await sac.resolve_vanity_url_async("someone")
+
+    assert status == "parsed"
+    assert len(inventory["items"]) == 25
+    assert players[0]["steamid"] == STEAMID
+    assert hours >= 0
+    assert steamid and steamid.isdigit()
+
+
+def test_percentile_nearest_rank():
+    samples = [i / 1000 for i in range(1, 101)]
+    assert load_driver.percentile(samples, 50) == 0.05
+    assert load_driver.percentile(samples, 99) == 0.099
+    assert load_driver.percentile([], 95) == 0.0
+    summary = load_driver.summarize(samples, Counter({200: 100}), 2.0)
+    assert summary["throughput_rps"] == 50.0
+    assert summary["p95_ms"] == 95.0
+
+
+@pytest.mark.asyncio
+async def test_run_load_counts_every_request():
+    async def echo(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async with _client(echo) as client:
+        summary = await load_driver.run_load(client, total=12, concurrency=4)
+    assert summary["requests"] == 12
+    assert summary["statuses"] == {"200": 12}
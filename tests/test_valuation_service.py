@@ -1,4 +1,4 @@
-from utils.valuation_service import ValuationService
+from utils.valuation_service import ValuationService, price_key
 from utils import local_data
 
 
@@ -50,3 +50,54 @@ def test_killstreak_tier_lookup(monkeypatch):
     service = ValuationService(price_map=price_map)
     local_data.CURRENCIES = {"keys": {"price": {"value_raw": 50.0}}}
     assert service.format_price("Item", 6, True, killstreak_tier=2) == "2 Keys"
+
+
+def test_value_inventory_memoizes_and_totals(monkeypatch):
+    price_map = {
+        ("Item", 6, True, False, 0, 0): {"value_raw": 30.0, "currency": "metal"},
+        ("Hat", 5, True, False, 13, 0): {"value_raw": 120.0, "currency": "keys"},
+    }
+    service = ValuationService(
+        price_map=price_map, currencies={"keys": {"price": {"value_raw": 50.0}}}
+    )
+    resolved = []
+    original = service._resolve
+    monkeypatch.setattr(
+        service, "_resolve", lambda key: resolved.append(key) or original(key)
+    )
+    keys = [
+        price_key("Item", 6, killstreak_tier=2),  # falls back to no killstreak
+        price_key("Item", 6, killstreak_tier=2),
+        price_key("Hat", 5, effect_id=13),
+        price_key("Missing", 6),
+        None,
+    ]
+    result = service.value_inventory(keys)
+
+    assert result.items[0] == (price_map[("Item", 6, True, False, 0, 0)], "30.00 ref")
+    assert result.items[1] is result.items[0]
+    assert result.items[2][1] == "2 Keys 20.00 ref"
+    assert result.items[3:] == [(None, ""), (None, "")]
+    assert result.priced == 3 and result.unpriced == 2
+    assert result.total_value_raw == 180.0
+    assert result.total_string == "3 Keys 30.00 ref"
+    assert result.lookups == len(resolved) == 3
+
+
+def test_batch_matches_single_lookups():
+    price_map = {
+        ("Item", 6, True, False, 0, 2): {"value_raw": 100.0, "currency": "keys"},
+        ("Hat", 5, True, False, 0, 0): {"value_raw": 7.5, "currency": "metal"},
+    }
+    service = ValuationService(
+        price_map=price_map, currencies={"keys": {"price": {"value_raw": 50.0}}}
+    )
+    batch = service.batch()
+    for args, kwargs in [
+        (("Item", 6, True), {"killstreak_tier": 2}),
+        (("Hat", 5, True), {"effect_id": 13}),
+        (("Hat", 5, False), {}),
+    ]:
+        info, formatted = batch.value(price_key(*args, **kwargs))
+        assert info == service.get_price_info(*args, **kwargs)
+        assert formatted == service.format_price(*args, **kwargs)
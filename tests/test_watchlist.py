@@ -0,0 +1,119 @@
+import pytest
+
+from utils import scan_store, watchlist
+
+STEAMID = "76561197960287930"
+
+
+def test_diff_items_reports_new_unusuals_and_removed():
+    old = [{"id": 1, "name": "Key"}, {"id": 2, "name": "Hat"}]
+    new = [
+        {"id": 2, "name": "Hat"},
+        {"id": 3, "name": "Cap", "unusual_effect_name": "Burning Flames"},
+    ]
+    changes = watchlist.diff_items(old, new)
+    assert [i["id"] for i in changes["added"]] == [3]
+    assert [i["id"] for i in changes["removed"]] == [1]
+    assert changes["new_unusuals"][0]["unusual_effect_name"] == "Burning Flames"
+
+
+def test_diff_items_matches_modified_items_by_original_id():
+    old = [{"id": 10, "original_id": 1, "name": "Hat"}, {"id": 20, "name": "Key"}]
+    new = [
+        {"id": 11, "original_id": 1, "name": "Hat", "custom_name": "Renamed"},
+        {"id": 20, "name": "Key"},
+    ]
+    assert watchlist.diff_items(old, new) == {
+        "added": [],
+        "removed": [],
+        "new_unusuals": [],
+    }
+
+
+def test_watchlist_persists_and_schedules(tmp_path):
+    wl = watchlist.Watchlist(tmp_path / "w.json")
+    entry = wl.add(STEAMID, interval=10)
+    assert entry["interval"] == watchlist.MIN_INTERVAL
+    with pytest.raises(ValueError):
+        wl.add("bogus")
+    assert wl.due(now=entry["next_due"]) == [STEAMID]
+
+    wl.record(STEAMID, "parsed", None)
+    reloaded = watchlist.Watchlist(tmp_path / "w.json")
+    got = reloaded.get(STEAMID)
+    assert got["last_status"] == "parsed"
+    assert got["next_due"] > got["last_scan"] + watchlist.MIN_INTERVAL * 0.8
+    assert reloaded.due() == []
+    assert reloaded.remove(STEAMID)
+    assert wl.entries() == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rescans_due_entries_and_records_changes(tmp_path):
+    store = scan_store.ScanStore(tmp_path / "scans")
+    store.save(STEAMID, [{"id": 1}, {"id": 2}])
+    wl = watchlist.Watchlist(tmp_path / "w.json")
+    wl.add(STEAMID, interval=600)
+    wl._entries[STEAMID]["next_due"] = 0
+
+    async def scan_fn(steamid):
+        store.save(steamid, [{"id": 2}, {"id": 3, "unusual_effect_name": "Sunbeams"}])
+
+    scheduler = watchlist.WatchlistScheduler(wl, scan_fn, rate=0, store=store)
+    results = await scheduler.run_once()
+    assert results[0]["status"] == "parsed"
+    change = wl.get(STEAMID)["changes"][0]
+    assert [i["id"] for i in change["new_unusuals"]] == [3]
+    assert [i["id"] for i in change["removed"]] == [1]
+    assert await scheduler.run_once() == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_marks_failed_scan(tmp_path):
+    store = scan_store.ScanStore(tmp_path / "scans")
+    wl = watchlist.Watchlist(tmp_path / "w.json")
+    wl.add(STEAMID)
+
+    async def scan_fn(steamid):
+        raise RuntimeError("boom")
+
+    scheduler = watchlist.WatchlistScheduler(wl, scan_fn, rate=0, store=store)
+    result = await scheduler.rescan(STEAMID)
+    assert result["status"] == "failed"
+    assert wl.get(STEAMID)["last_status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_records_private_inventory(tmp_path):
+    store = scan_store.ScanStore(tmp_path / "scans")
+    wl = watchlist.Watchlist(tmp_path / "w.json")
+    wl.add(STEAMID)
+
+    async def scan_fn(steamid):
+        return {"steamid": steamid, "status": "private", "items": []}
+
+    scheduler = watchlist.WatchlistScheduler(wl, scan_fn, rate=0, store=store)
+    assert (await scheduler.rescan(STEAMID))["status"] == "private"
+    assert wl.get(STEAMID)["last_status"] == "private"
+
+
+@pytest.mark.asyncio
+async def test_watchlist_endpoints(async_client):
+    resp = await async_client.post(
+        "/api/watchlist", json={"ids": [STEAMID, "nope"], "interval": 3600}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["invalid"] == ["nope"]
+
+    resp = await async_client.get("/api/watchlist")
+    entries = resp.json()["entries"]
+    assert [e["steamid"] for e in entries] == [STEAMID]
+    assert entries[0]["scan"] is None
+
+    resp = await async_client.get(f"/api/watchlist/{STEAMID}")
+    assert resp.json()["interval"] == 3600
+
+    resp = await async_client.delete(f"/api/watchlist/{STEAMID}")
+    assert resp.status_code == 200
+    resp = await async_client.delete(f"/api/watchlist/{STEAMID}")
+    assert resp.status_code == 404
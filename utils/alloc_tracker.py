@@ -0,0 +1,171 @@
+"""Opt-in ``tracemalloc`` reports for each scan's processing stages.
+
+When enabled (``TRACK_ALLOCATIONS=1`` or ``--track-allocations``) the app
+wraps ``process_inventory``, ``stack_items`` and ``_user.html`` rendering in
+:func:`stage`, which snapshots the traced heap before and after the block and
+records the net retained size, the peak during the block, the RSS change
+and the top allocation sites by retained size.  ``tracemalloc`` counters are
+process-wide and each request runs in its own thread, so stages hold a lock
+while tracking is on and concurrent scans take turns through them.  Reports
+for the most recent :data:`MAX_REPORTS` scans are kept in memory and served
+at ``/debug/allocations``.
+
+Disabled, :func:`stage` returns a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List
+
+import psutil
+
+MAX_REPORTS = 20
+TOP_SITES = 10
+
+ENABLED = False
+_REPORTS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LOCK = threading.Lock()
+# Serializes tracked stages; the traced heap is shared by all threads.
+_STAGE_LOCK = threading.Lock()
+_NOOP = contextlib.nullcontext()
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def enable(frames: int = 1) -> None:
+    """Start ``tracemalloc`` and begin recording stage reports."""
+
+    global ENABLED
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    ENABLED = True
+
+
+def disable() -> None:
+    """Stop recording and stop ``tracemalloc``."""
+
+    global ENABLED
+    ENABLED = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def enable_from_env() -> bool:
+    """Enable tracking when ``TRACK_ALLOCATIONS=1`` and return the state."""
+
+    if os.getenv("TRACK_ALLOCATIONS", "0") == "1":
+        enable()
+    return ENABLED
+
+
+def begin_scan(steamid: str) -> None:
+    """Start a fresh report for ``steamid``, evicting the oldest if full."""
+
+    if not ENABLED:
+        return
+    with _LOCK:
+        _REPORTS.pop(str(steamid), None)
+        _REPORTS[str(steamid)] = {
+            "steamid": str(steamid),
+            "started": time.time(),
+            "stages": [],
+        }
+        while len(_REPORTS) > MAX_REPORTS:
+            _REPORTS.popitem(last=False)
+
+
+def _top_sites(
+    after: tracemalloc.Snapshot, before: tracemalloc.Snapshot
+) -> List[Dict[str, Any]]:
+    stats = after.compare_to(before, "lineno")
+    stats.sort(key=lambda s: s.size_diff, reverse=True)
+    sites = []
+    for stat in stats[:TOP_SITES]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+        )
+    return sites
+
+
+@contextlib.contextmanager
+def _tracked(name: str, steamid: str) -> Iterator[None]:
+    with _STAGE_LOCK:
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        before = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            current_after, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            rss_after = process.memory_info().rss
+            entry = {
+                "stage": name,
+                "elapsed_ms": round(elapsed * 1000, 2),
+                "retained_kb": round((current_after - current_before) / 1024, 1),
+                "peak_kb": round((peak - current_before) / 1024, 1),
+                "rss_delta_kb": round((rss_after - rss_before) / 1024, 1),
+                "top_sites": _top_sites(after, before),
+            }
+            with _LOCK:
+                report = _REPORTS.get(str(steamid))
+                if report is not None:
+                    report["stages"].append(entry)
+
+
+def stage(name: str, steamid: str | None) -> contextlib.AbstractContextManager:
+    """Return a context manager recording ``name`` into ``steamid``'s report."""
+
+    if not ENABLED or steamid is None:
+        return _NOOP
+    return _tracked(name, str(steamid))
+
+
+def recent() -> List[Dict[str, Any]]:
+    """Return stored reports, most recent scan first."""
+
+    with _LOCK:
+        reports = [dict(r, stages=list(r["stages"])) for r in _REPORTS.values()]
+    reports.reverse()
+    return reports
+
+
+def reset() -> None:
+    """Discard stored reports."""
+
+    with _LOCK:
+        _REPORTS.clear()
+
+
+__all__ = [
+    "MAX_REPORTS",
+    "TOP_SITES",
+    "enable",
+    "disable",
+    "enable_from_env",
+    "begin_scan",
+    "stage",
+    "recent",
+    "reset",
+]
@@ -0,0 +1,265 @@
+"""Server-sent events pushing refreshed user cards to open pages.
+
+``GET /api/events`` subscribes a page to :func:`get_card_events`.  Under
+Hypercorn the Flask app is wrapped in :class:`EventStreamApp`, which answers
+that path on the event loop: each stream awaits its own
+:class:`asyncio.Queue` and ends when the client disconnects, a write fails
+or :data:`MAX_AGE_S` passes (``EventSource`` reconnects by itself).  Open
+streams therefore hold no worker thread, and every other request goes to
+the WSGI app exactly as Hypercorn would run it.  At most :data:`MAX_STREAMS`
+streams are served at once.
+
+The Flask view remains for the development server.  Its generator,
+:meth:`CardEvents.stream`, blocks a server thread on a :class:`queue.Queue`
+and also ends after :data:`MAX_AGE_S`.
+
+:meth:`CardEvents.publish` may be called from any thread or event loop.  A
+full queue drops its oldest event, so a slow page cannot hold memory for
+the whole server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import queue
+import threading
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from hypercorn.app_wrappers import WSGIWrapper
+
+MAX_QUEUED = 256
+HEARTBEAT_S = 15.0
+MAX_AGE_S = 300.0
+MAX_STREAMS = 200
+EVENTS_PATH = "/api/events"
+
+_HEADERS = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+]
+
+
+def format_event(event: str, data: Any) -> str:
+    """Return one ``text/event-stream`` message."""
+
+    lines = json.dumps(data).splitlines() or [""]
+    return f"event: {event}\n" + "".join(f"data: {line}\n" for line in lines) + "\n"
+
+
+def _put_latest(q: queue.Queue | asyncio.Queue, message: str) -> None:
+    while True:
+        try:
+            q.put_nowait(message)
+            return
+        except (queue.Full, asyncio.QueueFull):
+            with contextlib.suppress(queue.Empty, asyncio.QueueEmpty):
+                q.get_nowait()
+
+
+class CardEvents:
+    """Fan-out of events to every open ``/api/events`` stream."""
+
+    def __init__(self, max_queued: int = MAX_QUEUED) -> None:
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        # Each queue with the event loop it belongs to, or ``None``.
+        self._subscribers: List[Tuple[Any, asyncio.AbstractEventLoop | None]] = []
+
+    def subscribe(
+        self, loop: asyncio.AbstractEventLoop | None = None
+    ) -> queue.Queue | asyncio.Queue:
+        """Return a new subscriber queue.
+
+        With ``loop`` it is an :class:`asyncio.Queue` filled on that loop,
+        otherwise a thread-safe :class:`queue.Queue`.
+        """
+
+        q: queue.Queue | asyncio.Queue
+        q = (
+            queue.Queue(self.max_queued)
+            if loop is None
+            else asyncio.Queue(self.max_queued)
+        )
+        with self._lock:
+            self._subscribers.append((q, loop))
+        return q
+
+    def unsubscribe(self, q: queue.Queue | asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[0] is not q]
+
+    def publish(self, event: str, data: Dict[str, Any]) -> int:
+        """Queue ``event`` for every subscriber; return how many got it."""
+
+        message = format_event(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q, loop in subscribers:
+            if loop is None:
+                _put_latest(q, message)
+                continue
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(_put_latest, q, message)
+        return len(subscribers)
+
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(
+        self, heartbeat: float = HEARTBEAT_S, max_age: float = MAX_AGE_S
+    ) -> Iterator[str]:
+        """Yield queued messages, with a comment line every ``heartbeat`` s.
+
+        The subscription ends when the generator is closed or after
+        ``max_age`` seconds.
+        """
+
+        q = self.subscribe()
+        deadline = time.monotonic() + max_age
+        try:
+            yield ": connected\n\n"
+            while (left := deadline - time.monotonic()) > 0:
+                try:
+                    yield q.get(timeout=min(heartbeat, left))
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(q)
+
+
+class EventStreamApp:
+    """ASGI app serving :data:`EVENTS_PATH` itself and the rest with ``wsgi_app``.
+
+    Other requests run through Hypercorn's own WSGI wrapper in the loop's
+    default executor, as when ``wsgi_app`` is served directly.
+    """
+
+    def __init__(
+        self,
+        wsgi_app: Callable,
+        events: CardEvents | None = None,
+        *,
+        heartbeat: float = HEARTBEAT_S,
+        max_age: float = MAX_AGE_S,
+        max_streams: int = MAX_STREAMS,
+        max_body_size: int = 16 * 1024 * 1024,
+    ) -> None:
+        self._wsgi = WSGIWrapper(wsgi_app, max_body_size)
+        self._events = events
+        self.heartbeat = heartbeat
+        self.max_age = max_age
+        self.max_streams = max_streams
+        self._streams = 0
+
+    @property
+    def events(self) -> CardEvents:
+        return self._events or get_card_events()
+
+    async def __call__(self, scope: Dict[str, Any], receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif (
+            scope["type"] == "http"
+            and scope["path"] == EVENTS_PATH
+            and scope["method"] == "GET"
+        ):
+            await self._serve_events(receive, send)
+        else:
+            loop = asyncio.get_running_loop()
+
+            def call_soon(func: Callable, *args: Any) -> Any:
+                return asyncio.run_coroutine_threadsafe(func(*args), loop).result()
+
+            await self._wsgi(
+                scope,
+                receive,
+                send,
+                partial(loop.run_in_executor, None),
+                call_soon,
+            )
+
+    @staticmethod
+    async def _lifespan(receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _serve_events(self, receive, send) -> None:
+        if self._streams >= self.max_streams:
+            await send({"type": "http.response.start", "status": 503, "headers": []})
+            await send({"type": "http.response.body", "body": b"too many streams"})
+            return
+        loop = asyncio.get_running_loop()
+        self._streams += 1
+        q = self.events.subscribe(loop)
+        disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+        deadline = loop.time() + self.max_age
+        try:
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": _HEADERS}
+            )
+            message = ": connected\n\n"
+            while True:
+                try:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": message.encode("utf-8"),
+                            "more_body": True,
+                        }
+                    )
+                except Exception:  # the client is gone
+                    return
+                left = deadline - loop.time()
+                if left <= 0:
+                    break
+                get = asyncio.ensure_future(q.get())
+                done, _ = await asyncio.wait(
+                    {get, disconnected},
+                    timeout=min(self.heartbeat, left),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    get.cancel()
+                    return
+                if get in done:
+                    message = get.result()
+                else:
+                    get.cancel()
+                    message = ": keep-alive\n\n"
+            with contextlib.suppress(Exception):
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            disconnected.cancel()
+            self.events.unsubscribe(q)
+            self._streams -= 1
+
+
+async def _wait_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+_default_events: CardEvents | None = None
+
+
+def get_card_events() -> CardEvents:
+    """Return singleton :class:`CardEvents` instance."""
+
+    global _default_events
+    if _default_events is None:
+        _default_events = CardEvents()
+    return _default_events
+
+
+__all__ = ["CardEvents", "EventStreamApp", "format_event", "get_card_events"]
@@ -0,0 +1,232 @@
+"""Incremental SteamID ingestion from a TF2 ``console.log``.
+
+``console.log`` (written with ``-condebug``) collects the ``status`` output
+of every server joined.  :class:`ConsoleLogTail` reads only the bytes
+appended since the previous run, remembering the byte offset and the
+players already seen in a small JSON state file, and returns just the
+newly seen SteamIDs.  Progress is saved by :meth:`ConsoleLogTail.commit`
+once the IDs were handled, so players from a failed scan are reported
+again on the next run::
+
+    python -m utils.console_log ~/tf/console.log                 # print new IDs
+    python -m utils.console_log ~/tf/console.log --scan --follow  # scan them
+
+A rotated or truncated log (different inode or smaller than the saved
+offset) is read again from the start; already seen players are still
+skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from . import export, local_data, scan
+from . import steam_api_client as sac
+from .valuation_service import get_valuation_service
+
+STATE_FILE = Path("cache/console_log_state.json")
+CHUNK_SIZE = 64 * 1024
+# Lines longer than this cannot hold a status row and are dropped unparsed.
+MAX_LINE_BYTES = 64 * 1024
+_ID_MARKERS = ("[U:1:", "STEAM_", "7656119", "steamcommunity")
+
+
+def _canonical(token: str) -> str:
+    """Return SteamID64 for offline-convertible tokens, else ``token``."""
+
+    if sac.VANITY_RE.fullmatch(token) and not sac.STEAMID64_RE.fullmatch(token):
+        return token
+    try:
+        return sac.convert_to_steam64(token)
+    except ValueError:
+        return token
+
+
+class StreamingIdParser:
+    """Extract Steam ID tokens from text fed in arbitrary byte chunks.
+
+    Tokens never span lines, so each complete line is passed to
+    :func:`extract_steam_ids` and a trailing partial line is buffered until
+    the next :meth:`feed`.  ``consumed`` counts the bytes fed up to the
+    start of that partial line, including dropped overlong lines.
+    """
+
+    def __init__(self) -> None:
+        self._partial = b""
+        self._skipping = False
+        self.consumed = 0
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """Return tokens from the complete lines in ``chunk``."""
+
+        data = self._partial + chunk
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            if len(data) > MAX_LINE_BYTES:
+                # Drop the overlong line up to its newline in a later chunk.
+                self.consumed += len(data)
+                self._partial = b""
+                self._skipping = True
+            else:
+                self._partial = data
+            return []
+        complete, self._partial = data[: cut + 1], data[cut + 1 :]
+        self.consumed += len(complete)
+        if self._skipping:
+            complete = complete[complete.index(b"\n") + 1 :]
+            self._skipping = False
+        tokens: List[str] = []
+        for raw in complete.splitlines():
+            if len(raw) > MAX_LINE_BYTES:
+                continue
+            line = raw.decode("utf-8", errors="replace")
+            # Cheap pre-check; most console lines hold no IDs at all.
+            if any(marker in line for marker in _ID_MARKERS):
+                tokens.extend(sac.extract_steam_ids(line))
+        return tokens
+
+
+class ConsoleLogTail:
+    """Read new lines of ``log_path`` and report players not seen before."""
+
+    def __init__(self, log_path: Path, state_path: Path | None = None) -> None:
+        self.log_path = Path(log_path)
+        self.state_path = state_path or STATE_FILE
+        self.offset = 0
+        self.inode: int | None = None
+        self.seen: set[str] = set()
+        self._pending: tuple[int, int, List[str]] | None = None
+        self._load_state()
+
+    def _load_state(self) -> None:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return
+        if state.get("path") == str(self.log_path.resolve()):
+            self.offset = int(state.get("offset", 0))
+            self.inode = state.get("inode")
+        self.seen = set(state.get("seen", []))
+
+    def save_state(self) -> None:
+        state: Dict[str, Any] = {
+            "path": str(self.log_path.resolve()),
+            "inode": self.inode,
+            "offset": self.offset,
+            "seen": sorted(self.seen),
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.state_path)
+
+    def poll(self) -> List[str]:
+        """Return IDs not seen before, appended since the last :meth:`commit`.
+
+        Nothing is recorded until :meth:`commit`; polling again without it
+        returns the same IDs.
+        """
+
+        self._pending = None
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            return []
+        offset = self.offset
+        if stat.st_ino != self.inode or stat.st_size < offset:
+            offset = 0
+
+        parser = StreamingIdParser()
+        new: List[str] = []
+        found: set[str] = set()
+        with self.log_path.open("rb") as handle:
+            handle.seek(offset)
+            while True:
+                chunk = handle.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                for token in parser.feed(chunk):
+                    steamid = _canonical(token)
+                    if steamid not in self.seen and steamid not in found:
+                        found.add(steamid)
+                        new.append(steamid)
+        # Resume at the start of any unfinished last line.
+        self._pending = (stat.st_ino, offset + parser.consumed, new)
+        return new
+
+    def commit(self) -> None:
+        """Mark the IDs of the last :meth:`poll` as handled and save state."""
+
+        if self._pending is None:
+            return
+        self.inode, self.offset, new = self._pending
+        self.seen.update(new)
+        self._pending = None
+        self.save_state()
+
+
+async def _scan(ids: Iterable[str], args: argparse.Namespace) -> None:
+    columns = export.parse_columns(args.columns)
+    results = scan.scan_many(
+        ids,
+        get_valuation_service(),
+        concurrency=args.concurrency,
+        rate=args.rate,
+    )
+    async for result in results:
+        sys.stdout.writelines(
+            scan.format_result(result, "ndjson", columns, args.summary_only)
+        )
+        sys.stdout.flush()
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.console_log", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "log",
+        type=Path,
+        nargs="?",
+        default=os.getenv("TF2_CONSOLE_LOG"),
+        help="Path to console.log (default: $TF2_CONSOLE_LOG)",
+    )
+    parser.add_argument("--state", type=Path, default=STATE_FILE)
+    parser.add_argument("--follow", action="store_true", help="Keep polling")
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument(
+        "--scan", action="store_true", help="Scan new players and print NDJSON"
+    )
+    parser.add_argument("--columns")
+    parser.add_argument("--summary-only", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    if args.log is None:
+        parser.error("console.log path required (or set TF2_CONSOLE_LOG)")
+
+    if args.scan:
+        local_data.load_files(auto_refetch=False)
+
+    tail = ConsoleLogTail(args.log, args.state)
+    while True:
+        new = tail.poll()
+        if new and args.scan:
+            asyncio.run(_scan(new, args))
+        elif new:
+            print("\n".join(new), flush=True)
+        tail.commit()
+        if not args.follow:
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""Streaming NDJSON and CSV serialization for enriched items.
+
+Shared by the bulk scanner (``python -m utils.scan``) and the inventory
+export endpoint.  Every function yields one line at a time so output size
+never depends on how many items or users are being written.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+FORMATS = ("ndjson", "csv")
+
+DEFAULT_ITEM_COLUMNS = (
+    "id",
+    "defindex",
+    "name",
+    "quality",
+    "unusual_effect_name",
+    "killstreak_tier_name",
+    "paint_name",
+    "wear_name",
+    "craftable",
+    "quantity",
+    "price_refined",
+    "price_string",
+)
+
+# Derived columns that are not plain keys of an enriched item.
+_DERIVED = {
+    "price_refined": lambda item: (item.get("price") or {}).get("value_raw"),
+    "quantity": lambda item: item.get("quantity", 1),
+}
+
+
+def parse_columns(spec: str | None) -> tuple[str, ...]:
+    """Return column names from a comma separated ``spec`` or the defaults."""
+
+    if not spec:
+        return DEFAULT_ITEM_COLUMNS
+    columns = tuple(c.strip() for c in spec.split(",") if c.strip())
+    return columns or DEFAULT_ITEM_COLUMNS
+
+
+def column_value(item: Dict[str, Any], column: str) -> Any:
+    """Return ``column`` of ``item``, resolving derived columns."""
+
+    derived = _DERIVED.get(column)
+    return derived(item) if derived else item.get(column)
+
+
+def project(item: Dict[str, Any], columns: Sequence[str]) -> Dict[str, Any]:
+    """Return a dict holding only ``columns`` of ``item``."""
+
+    return {column: column_value(item, column) for column in columns}
+
+
+def item_value(item: Dict[str, Any]) -> float:
+    """Return the refined value of ``item`` multiplied by its quantity."""
+
+    try:
+        value = float(column_value(item, "price_refined") or 0)
+        return value * int(item.get("quantity", 1) or 1)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Leading characters a spreadsheet would read as the start of a formula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        # Item and profile names are user text; keep them inert in Excel.
+        return "'" + value
+    return value
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield each record as one JSON line."""
+
+    for record in records:
+        yield json.dumps(record, default=str) + "\n"
+
+
+def iter_csv(
+    header: Sequence[str] | None, rows: Iterable[Sequence[Any]]
+) -> Iterator[str]:
+    """Yield ``header`` (unless ``None``) then each row as a CSV line."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(row: Sequence[Any]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([_cell(v) for v in row])
+        return buffer.getvalue()
+
+    if header is not None:
+        yield line(header)
+    for row in rows:
+        yield line(row)
+
+
+def iter_items(
+    items: Iterable[Dict[str, Any]],
+    fmt: str = "ndjson",
+    columns: Sequence[str] = DEFAULT_ITEM_COLUMNS,
+) -> Iterator[str]:
+    """Yield ``items`` serialized as ``fmt`` restricted to ``columns``."""
+
+    if fmt == "csv":
+        return iter_csv(columns, ([column_value(i, c) for c in columns] for i in items))
+    if fmt == "ndjson":
+        return iter_ndjson(project(i, columns) for i in items)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def content_type(fmt: str) -> str:
+    """Return the MIME type for ``fmt``."""
+
+    return "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+
+__all__ = [
+    "FORMATS",
+    "DEFAULT_ITEM_COLUMNS",
+    "parse_columns",
+    "column_value",
+    "project",
+    "item_value",
+    "iter_ndjson",
+    "iter_csv",
+    "iter_items",
+    "content_type",
+]
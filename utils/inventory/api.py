@@ -1,8 +1,10 @@
 from typing import Any, Dict, List
 import json
+import time
 from pathlib import Path
 
-from .. import local_data
+from .. import local_data, schema_snapshot
+from ..metrics import INVENTORY_ENRICH_SECONDS, ITEM_ENRICH_SECONDS
 
 # Prefer the canonical valuation service module but fall back to older paths.
 try:  # pragma: no cover - import shim
@@ -25,6 +27,7 @@ from .extractors_misc import _PARTS_BY_ID
 def enrich_inventory(
     data: Dict[str, Any],
     valuation_service: ValuationService | None = None,
+    schema: schema_snapshot.SchemaSnapshot | None = None,
 ) -> List[Dict[str, Any]]:
     """Return a list of inventory items enriched with schema info.
 
@@ -36,6 +39,10 @@ def enrich_inventory(
         Optional :class:`ValuationService` used to look up prices. Defaults to
         :func:`~utils.valuation_service.get_valuation_service`, which provides
         a singleton service.
+    schema:
+        Optional :class:`~utils.schema_snapshot.SchemaSnapshot` every item is
+        resolved against. Defaults to the current snapshot, so a schema
+        reload during the scan does not mix generations.
     """
     if valuation_service is None:
         valuation_service = get_valuation_service()
@@ -44,61 +51,68 @@ def enrich_inventory(
         return []
 
     items: List[Dict[str, Any]] = []
-
-    for asset in items_raw:
-        item = _process_item(asset, valuation_service)
-        if not item:
-            continue
-
-        quality_flag = item.get("quality")
-        if (
-            quality_flag == 11
-            or quality_flag == "Strange"
-            or asset.get("quality") == 11
-        ):
-            attrs = item.get("attributes")
-            if not isinstance(attrs, list):
-                attrs = asset.get("attributes", [])
-            parts_found: set[str] = set()
-            for attr in attrs:
-                if attr.get("defindex") == 214:
-                    try:
-                        idx = int(attr.get("value"))
-                    except (TypeError, ValueError):
-                        continue
-                    name = _PARTS_BY_ID.get(idx)
-                    if name:
-                        parts_found.add(name)
-            if parts_found:
-                existing = item.get("strange_parts", [])
-                if not isinstance(existing, list):
-                    existing = []
-                all_parts = set(existing) | parts_found
-                item["strange_parts"] = sorted(all_parts)
-
-        spells_raw = item.get("spells", [])
-        if isinstance(spells_raw, dict):
-            spells_list = spells_raw.get("list", [])
-        elif isinstance(spells_raw, list):
-            spells_list = spells_raw
-        else:
-            spells_list = []
-
-        item["modal_spells"] = spells_list
-        item["spells"] = spells_list  # backward compatibility for JS
-        items.append(item)
-
+    started = time.perf_counter()
+
+    with schema_snapshot.use(schema):
+        batch = valuation_service.batch()
+        for asset in items_raw:
+            item_started = time.perf_counter()
+            item = _process_item(asset, valuation_service, batch)
+            ITEM_ENRICH_SECONDS.observe(time.perf_counter() - item_started)
+            if not item:
+                continue
+
+            quality_flag = item.get("quality")
+            if (
+                quality_flag == 11
+                or quality_flag == "Strange"
+                or asset.get("quality") == 11
+            ):
+                attrs = item.get("attributes")
+                if not isinstance(attrs, list):
+                    attrs = asset.get("attributes", [])
+                parts_found: set[str] = set()
+                for attr in attrs:
+                    if attr.get("defindex") == 214:
+                        try:
+                            idx = int(attr.get("value"))
+                        except (TypeError, ValueError):
+                            continue
+                        name = _PARTS_BY_ID.get(idx)
+                        if name:
+                            parts_found.add(name)
+                if parts_found:
+                    existing = item.get("strange_parts", [])
+                    if not isinstance(existing, list):
+                        existing = []
+                    all_parts = set(existing) | parts_found
+                    item["strange_parts"] = sorted(all_parts)
+
+            spells_raw = item.get("spells", [])
+            if isinstance(spells_raw, dict):
+                spells_list = spells_raw.get("list", [])
+            elif isinstance(spells_raw, list):
+                spells_list = spells_raw
+            else:
+                spells_list = []
+
+            item["modal_spells"] = spells_list
+            item["spells"] = spells_list  # backward compatibility for JS
+            items.append(item)
+
+    INVENTORY_ENRICH_SECONDS.observe(time.perf_counter() - started)
     return items
 
 
 def process_inventory(
     data: Dict[str, Any],
     valuation_service: ValuationService | None = None,
+    schema: schema_snapshot.SchemaSnapshot | None = None,
 ) -> List[Dict[str, Any]]:
     """Return enriched items sorted by descending price."""
     if valuation_service is None:
         valuation_service = get_valuation_service()
-    items = enrich_inventory(data, valuation_service)
+    items = enrich_inventory(data, valuation_service, schema)
 
     def _sort_key(item: Dict[str, Any]) -> tuple[float, str]:
         price_info = item.get("price") or {}
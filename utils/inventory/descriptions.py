@@ -0,0 +1,96 @@
+"""One-pass parsing of Steam item description entries.
+
+Killstreak tier, killstreaker and trade hold fallbacks all read
+``asset["descriptions"]``.  :func:`describe` walks that list once per asset
+and returns every fact together; ``_process_item`` calls it once per item
+and passes the facts to those extractors.  Each description text is
+unescaped, its HTML stripped and matched against one combined pattern, and
+the result is memoized by the raw text.  Descriptions repeat across items
+(every Professional Killstreak weapon carries the same lines), so most
+texts are parsed once per process.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from html import unescape
+from typing import Any, Dict, NamedTuple, Tuple
+
+_TAG_RE = re.compile(r"<[^>]+>")
+# The killstreaker is captured in a lookahead so tier phrases later on the
+# same text are still found.
+_FACTS_RE = re.compile(
+    r"(?P<tier3>Professional Killstreak)"
+    r"|(?P<tier2>Specialized Killstreak)"
+    r"|(?P<tier1>Killstreaks? Active)"
+    r"|Killstreaker:?\s*(?=(?P<effect>.+))",
+    re.I,
+)
+
+
+class DescriptionFacts(NamedTuple):
+    killstreak_tier: int | None
+    killstreaker: str | None
+    trade_hold: int | None
+
+
+EMPTY = DescriptionFacts(None, None, None)
+
+
+@lru_cache(maxsize=4096)
+def parse_text(value: str) -> Tuple[int | None, str | None]:
+    """Return ``(killstreak_tier, killstreaker)`` found in one description."""
+
+    text = _TAG_RE.sub("", unescape(value))
+    tier = None
+    effect = None
+    for match in _FACTS_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "effect":
+            if effect is None:
+                effect = match.group("effect").strip()
+        else:
+            tier = max(tier or 0, int(kind[-1]))
+    return tier, effect
+
+
+def _hold_timestamp(app_data: Any) -> int | None:
+    if not isinstance(app_data, dict):
+        return None
+    ts = app_data.get("steam_market_tradeable_after") or app_data.get(
+        "steam_market_marketable_after"
+    )
+    try:
+        return int(ts) if ts is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def describe(asset: Dict[str, Any]) -> DescriptionFacts:
+    """Return facts from ``asset["descriptions"]``.
+
+    Like the per-extractor loops this replaces, each fact comes from the
+    first description providing it.
+    """
+
+    descriptions = asset.get("descriptions")
+    if not descriptions:
+        return EMPTY
+    tier = effect = hold = None
+    for desc in descriptions:
+        if not isinstance(desc, dict):
+            continue
+        value = desc.get("value")
+        if isinstance(value, str) and value:
+            text_tier, text_effect = parse_text(value)
+            if tier is None:
+                tier = text_tier
+            if effect is None:
+                effect = text_effect
+        if hold is None:
+            hold = _hold_timestamp(desc.get("app_data"))
+    return DescriptionFacts(tier, effect, hold)
+
+
+__all__ = ["DescriptionFacts", "describe", "parse_text"]
@@ -1,50 +1,72 @@
-from typing import Any
+from typing import Any, NamedTuple
 
-from .. import local_data
+from .. import schema_cache
+from ..schema_snapshot import active as _schema
 
-# Sets derived from ``local_data.SCHEMA_ATTRIBUTES``. They may be empty if
-# schema data has not been loaded yet.
-UNUSUAL_CLASSES: set[str] = set()
-KILLSTREAK_TIER_CLASSES: set[str] = set()
-KILLSTREAK_SHEEN_CLASSES: set[str] = set()
-KILLSTREAK_EFFECT_CLASSES: set[str] = set()
-PAINT_CLASSES: set[str] = set()
-WEAR_CLASSES: set[str] = set()
-PATTERN_SEED_LO_CLASSES: set[str] = set()
-PATTERN_SEED_HI_CLASSES: set[str] = set()
-PAINTKIT_CLASSES: set[str] = set()
-CRATE_SERIES_CLASSES: set[str] = set()
 
+class AttrClasses(NamedTuple):
+    """Attribute class names of the special attributes, per schema."""
 
-def refresh_attr_classes() -> None:
-    """Populate attribute class sets from ``local_data.SCHEMA_ATTRIBUTES``."""
+    unusual: frozenset[str] = frozenset()
+    killstreak_tier: frozenset[str] = frozenset()
+    killstreak_sheen: frozenset[str] = frozenset()
+    killstreak_effect: frozenset[str] = frozenset()
+    paint: frozenset[str] = frozenset()
+    wear: frozenset[str] = frozenset()
+    pattern_seed_lo: frozenset[str] = frozenset()
+    pattern_seed_hi: frozenset[str] = frozenset()
+    paintkit: frozenset[str] = frozenset()
+    crate_series: frozenset[str] = frozenset()
 
-    mapping = local_data.SCHEMA_ATTRIBUTES or {}
 
-    def cls(idx: int) -> str | None:
-        info = mapping.get(idx)
-        if isinstance(info, dict):
-            return info.get("attribute_class")
-        return None
+# ``PAINT_CLASSES`` and the like, read from the current sets on each access.
+_LEGACY_NAMES = {f"{field.upper()}_CLASSES": field for field in AttrClasses._fields}
+
+
+@schema_cache.derived("SCHEMA_ATTRIBUTES")
+def _attr_class_sets() -> AttrClasses:
+    mapping = _schema().schema_attributes
+
+    def cls(*indexes: int) -> frozenset[str]:
+        found = set()
+        for idx in indexes:
+            info = mapping.get(idx)
+            if isinstance(info, dict) and info.get("attribute_class"):
+                found.add(info["attribute_class"])
+        return frozenset(found)
+
+    # A new immutable value per schema, so readers never see a partial one.
+    return AttrClasses(
+        unusual=cls(134, 2041),
+        killstreak_tier=cls(2025),
+        killstreak_sheen=cls(2014),
+        killstreak_effect=cls(2013),
+        paint=cls(142, 261),
+        wear=cls(725, 749),
+        pattern_seed_lo=cls(866),
+        pattern_seed_hi=cls(867),
+        paintkit=cls(834),
+        crate_series=cls(187),
+    )
+
+
+def refresh_attr_classes() -> AttrClasses:
+    """Return attribute class sets of the active schema snapshot.
 
-    global UNUSUAL_CLASSES, KILLSTREAK_TIER_CLASSES, KILLSTREAK_SHEEN_CLASSES
-    global KILLSTREAK_EFFECT_CLASSES, PAINT_CLASSES, WEAR_CLASSES
-    global PATTERN_SEED_LO_CLASSES, PATTERN_SEED_HI_CLASSES
-    global PAINTKIT_CLASSES, CRATE_SERIES_CLASSES
+    The sets are recomputed only for a schema snapshot not seen recently.
+    Keep the returned value for the duration of one lookup instead of
+    importing the module-level ``*_CLASSES`` names, which are evaluated once
+    at import.
+    """
 
-    UNUSUAL_CLASSES = {cls(134), cls(2041)} - {None}
-    KILLSTREAK_TIER_CLASSES = {cls(2025)} - {None}
-    KILLSTREAK_SHEEN_CLASSES = {cls(2014)} - {None}
-    KILLSTREAK_EFFECT_CLASSES = {cls(2013)} - {None}
-    PAINT_CLASSES = {cls(142), cls(261)} - {None}
-    WEAR_CLASSES = {cls(725), cls(749)} - {None}
-    PATTERN_SEED_LO_CLASSES = {cls(866)} - {None}
-    PATTERN_SEED_HI_CLASSES = {cls(867)} - {None}
-    PAINTKIT_CLASSES = {cls(834)} - {None}
-    CRATE_SERIES_CLASSES = {cls(187)} - {None}
+    return _attr_class_sets()
 
 
-refresh_attr_classes()
+def __getattr__(name: str) -> frozenset[str]:
+    field = _LEGACY_NAMES.get(name)
+    if field is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(refresh_attr_classes(), field)
 
 
 def get_attr_class(idx: Any) -> str | None:
@@ -54,23 +76,14 @@ def get_attr_class(idx: Any) -> str | None:
         idx_int = int(idx)
     except (TypeError, ValueError):
         return None
-    info = local_data.SCHEMA_ATTRIBUTES.get(idx_int)
+    info = _schema().schema_attributes.get(idx_int)
     if isinstance(info, dict):
         return info.get("attribute_class")
     return None
 
 
 __all__ = [
+    "AttrClasses",
     "refresh_attr_classes",
     "get_attr_class",
-    "UNUSUAL_CLASSES",
-    "KILLSTREAK_TIER_CLASSES",
-    "KILLSTREAK_SHEEN_CLASSES",
-    "KILLSTREAK_EFFECT_CLASSES",
-    "PAINT_CLASSES",
-    "WEAR_CLASSES",
-    "PATTERN_SEED_LO_CLASSES",
-    "PATTERN_SEED_HI_CLASSES",
-    "PAINTKIT_CLASSES",
-    "CRATE_SERIES_CLASSES",
 ]
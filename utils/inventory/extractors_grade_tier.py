@@ -5,7 +5,9 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable
 import re
 
-from .. import local_data
+from .. import local_data, schema_cache
+from ..schema_snapshot import active as _schema
+from ..metrics import record_cache
 from ..schema_provider import SchemaProvider
 
 
@@ -84,23 +86,34 @@ def _grade_provider() -> SchemaProvider:
     return _GRADE_PROVIDER
 
 
+@schema_cache.derived()
+def _grade_endpoint_lookups() -> dict[int, str | None]:
+    """Return the endpoint memo, emptied once per schema generation."""
+
+    _GRADE_ENDPOINT_LOOKUPS.clear()
+    return _GRADE_ENDPOINT_LOOKUPS
+
+
 def _resolve_grade_from_defindex(defindex: int | None) -> tuple[str | None, str]:
     """Resolve grade from cached v2 map and defindex endpoint fallback."""
 
     if defindex is None:
         return None, "none"
 
-    cached = local_data.ITEM_GRADE_BY_DEFINDEX.get(int(defindex))
+    cached = _schema().item_grade_by_defindex.get(int(defindex))
     normalized = _normalize_grade_name(cached)
     if normalized:
         return normalized, "schema_grade_v2"
 
-    if int(defindex) in _GRADE_ENDPOINT_LOOKUPS:
-        normalized = _normalize_grade_name(_GRADE_ENDPOINT_LOOKUPS[int(defindex)])
+    lookups = _grade_endpoint_lookups()
+    if int(defindex) in lookups:
+        record_cache("grade_endpoint", True)
+        normalized = _normalize_grade_name(lookups[int(defindex)])
         return normalized, "grade_endpoint" if normalized else "none"
 
+    record_cache("grade_endpoint", False)
     fetched = _grade_provider().get_item_grade_from_defindex(int(defindex))
-    _GRADE_ENDPOINT_LOOKUPS[int(defindex)] = fetched
+    lookups[int(defindex)] = fetched
     normalized = _normalize_grade_name(fetched)
     if normalized:
         return normalized, "grade_endpoint"
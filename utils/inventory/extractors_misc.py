@@ -2,38 +2,47 @@ from typing import Any, Dict, Tuple, List
 import logging
 import json
 from pathlib import Path
-from .. import local_data
+from .. import schema_cache
+from ..schema_snapshot import active as _schema
 from ..constants import SPELL_MAP
+from .descriptions import DescriptionFacts, describe
 from .extract_attr_classes import (
     refresh_attr_classes,
     get_attr_class,
-    CRATE_SERIES_CLASSES,
 )
 
 logger = logging.getLogger(__name__)
 
 SCHEMA_DIR = Path("cache/schema")
-try:  # graceful fallback if the optional file is missing
-    with open(SCHEMA_DIR / "strange_parts.json") as fp:
-        _PARTS_BY_ID = {int(v[2:]): k for k, v in json.load(fp).items()}
-except FileNotFoundError:  # pragma: no cover - only used in dev/test
-    _PARTS_BY_ID = {}
+
+
+@schema_cache.derived()
+def _strange_parts_by_id() -> Dict[int, str]:
+    try:  # graceful fallback if the optional file is missing
+        with open(SCHEMA_DIR / "strange_parts.json") as fp:
+            return {int(v[2:]): k for k, v in json.load(fp).items()}
+    except FileNotFoundError:  # pragma: no cover - only used in dev/test
+        return {}
+
+
+# Imported by name elsewhere, so a view that follows schema reloads.
+_PARTS_BY_ID = schema_cache.DerivedMapping(_strange_parts_by_id)
 
 
 def _extract_crate_series(asset: Dict[str, Any]) -> str | None:
     """Return crate series name if present."""
 
-    refresh_attr_classes()
+    classes = refresh_attr_classes()
     for attr in asset.get("attributes", []):
         idx = attr.get("defindex")
         attr_class = get_attr_class(idx)
-        if attr_class in CRATE_SERIES_CLASSES:
+        if attr_class in classes.crate_series:
             val = int(attr.get("float_value", 0))
-            return local_data.CRATE_SERIES_NAMES.get(str(val))
+            return _schema().crate_series_names.get(str(val))
         elif idx == 187:
             logger.warning("Using numeric fallback for crate series index %s", idx)
             val = int(attr.get("float_value", 0))
-            return local_data.CRATE_SERIES_NAMES.get(str(val))
+            return _schema().crate_series_names.get(str(val))
     return None
 
 
@@ -149,7 +158,7 @@ def _extract_strange_parts(asset: Dict[str, Any]) -> List[str]:
             name = info.get("name")
         if not name:
             defindex = str(attr.get("defindex"))
-            name = local_data.STRANGE_PART_NAMES.get(defindex)
+            name = _schema().strange_part_names.get(defindex)
         if not name:
             continue
         lname = name.lower()
@@ -203,8 +212,13 @@ def _extract_kill_eater_info(
     return counts, types
 
 
-def _trade_hold_timestamp(asset: dict) -> int | None:
-    """Return a trade hold expiry timestamp if present."""
+def _trade_hold_timestamp(
+    asset: dict, facts: DescriptionFacts | None = None
+) -> int | None:
+    """Return a trade hold expiry timestamp if present.
+
+    ``facts`` are the asset's :func:`describe` result when already known.
+    """
 
     ts = asset.get("steam_market_tradeable_after") or asset.get(
         "steam_market_marketable_after"
@@ -215,21 +229,7 @@ def _trade_hold_timestamp(asset: dict) -> int | None:
     except (TypeError, ValueError):
         pass
 
-    for desc in asset.get("descriptions", []):
-        if not isinstance(desc, dict):
-            continue
-        app_data = desc.get("app_data")
-        if not isinstance(app_data, dict):
-            continue
-        ts = app_data.get("steam_market_tradeable_after") or app_data.get(
-            "steam_market_marketable_after"
-        )
-        try:
-            if ts is not None:
-                return int(ts)
-        except (TypeError, ValueError):
-            continue
-    return None
+    return (describe(asset) if facts is None else facts).trade_hold
 
 
 def _has_trade_hold(asset: dict) -> bool:
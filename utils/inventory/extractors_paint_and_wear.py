@@ -2,15 +2,17 @@ from typing import Any, Dict, Tuple
 import logging
 import re
 
-from .. import local_data
+from ..schema_snapshot import active as _schema
 from ..constants import PAINT_COLORS
-from ..helpers import best_match_from_keys
 from ..wear_helpers import _decode_seed_info
+from .paintkit_index import (
+    get_index as _paintkit_index,
+    paint_slug,
+    slug_to_name as _slug_to_paintkit_name,
+)
 from .extract_attr_classes import (
     refresh_attr_classes,
     get_attr_class,
-    PAINT_CLASSES,
-    PAINTKIT_CLASSES,
 )
 
 logger = logging.getLogger(__name__)
@@ -19,13 +21,13 @@ logger = logging.getLogger(__name__)
 def _extract_paint(asset: Dict[str, Any]) -> Tuple[str | None, str | None]:
     """Return paint name and hex color if present."""
 
-    refresh_attr_classes()
+    classes = refresh_attr_classes()
     for attr in asset.get("attributes", []):
         idx = attr.get("defindex")
         attr_class = get_attr_class(idx)
-        if attr_class in PAINT_CLASSES:
+        if attr_class in classes.paint:
             val = int(attr.get("float_value", 0))
-            name = local_data.PAINT_NAMES.get(str(val))
+            name = _schema().paint_names.get(str(val))
             hex_color = PAINT_COLORS.get(val, (None, None))[1]
             if not name:
                 name = PAINT_COLORS.get(val, (None, None))[0]
@@ -35,7 +37,7 @@ def _extract_paint(asset: Dict[str, Any]) -> Tuple[str | None, str | None]:
         elif idx in (142, 261):
             logger.warning("Using numeric fallback for paint index %s", idx)
             val = int(attr.get("float_value", 0))
-            name = local_data.PAINT_NAMES.get(str(val))
+            name = _schema().paint_names.get(str(val))
             hex_color = PAINT_COLORS.get(val, (None, None))[1]
             if not name:
                 name = PAINT_COLORS.get(val, (None, None))[0]
@@ -72,9 +74,7 @@ def _extract_econ_tag(
         ):
             continue
         raw = (
-            tag.get("localized_tag_name")
-            or tag.get("name")
-            or tag.get("internal_name")
+            tag.get("localized_tag_name") or tag.get("name") or tag.get("internal_name")
         )
         if isinstance(raw, str) and raw.strip():
             return raw.strip()
@@ -115,7 +115,7 @@ def _wear_name_from_id(wear_id: int) -> str | None:
 
     if wear_id < 1 or wear_id > 5:
         return None
-    mapping = local_data.WEAR_NAMES_BY_ID
+    mapping = _schema().wear_names_by_id
     return mapping.get(wear_id) or mapping.get(str(wear_id))
 
 
@@ -169,26 +169,17 @@ def _extract_wear_float(asset: Dict[str, Any]) -> float | None:
     return resolve_wear(asset).get("wear_float")
 
 
-def _slug_to_paintkit_name(slug: str) -> str:
-    """Return a human readable paintkit name from schema slug."""
-
-    if slug.endswith("_mk_ii"):
-        base = slug[:-6]
-        return base.replace("_", " ").title() + " Mk.II"
-    return slug.replace("_", " ").title()
-
-
 def _extract_paintkit(
     asset: Dict[str, Any], schema_entry: Dict[str, Any]
 ) -> tuple[int | None, str | None]:
     """Return ``(paintkit_id, name)`` or ``(None, None)`` if not present."""
 
-    refresh_attr_classes()
+    classes = refresh_attr_classes()
     paintkit_id = None
     for attr in asset.get("attributes", []):
         idx = attr.get("defindex")
         attr_class = get_attr_class(idx)
-        if idx == 834 or attr_class in PAINTKIT_CLASSES:
+        if idx == 834 or attr_class in classes.paintkit:
             raw = attr.get("value")
             if raw is None:
                 raw = attr.get("float_value")
@@ -199,16 +190,16 @@ def _extract_paintkit(
                 paintkit_id = None
                 continue
             if paintkit_id is not None:
-                if idx == 834 and attr_class not in PAINTKIT_CLASSES:
+                if idx == 834 and attr_class not in classes.paintkit:
                     logger.warning("Using numeric fallback for paintkit index %s", idx)
-                name = local_data.PAINTKIT_NAMES_BY_ID.get(str(paintkit_id))
+                name = _schema().paintkit_names_by_id.get(str(paintkit_id))
                 return paintkit_id, (name or "Unknown")
 
     if paintkit_id is None:
         for attr in asset.get("attributes", []):
             idx = attr.get("defindex")
             attr_class = get_attr_class(idx)
-            if idx == 834 or attr_class in PAINTKIT_CLASSES:
+            if idx == 834 or attr_class in classes.paintkit:
                 raw = attr.get("float_value")
                 try:
                     paintkit_id = int(float(raw)) if raw is not None else None
@@ -217,7 +208,7 @@ def _extract_paintkit(
                     continue
                 if paintkit_id is not None:
                     logger.warning("Using numeric fallback for paintkit index %s", idx)
-                    name = local_data.PAINTKIT_NAMES_BY_ID.get(str(paintkit_id))
+                    name = _schema().paintkit_names_by_id.get(str(paintkit_id))
                     return paintkit_id, (name or "Unknown")
 
     # Legacy fallback: some payloads expose paintkit ids under defindex 749.
@@ -239,36 +230,16 @@ def _extract_paintkit(
         paintkit_id = int(raw_float)
         if paintkit_id is not None:
             logger.warning("Using numeric fallback for paintkit index %s", 749)
-            name = local_data.PAINTKIT_NAMES_BY_ID.get(str(paintkit_id))
+            name = _schema().paintkit_names_by_id.get(str(paintkit_id))
             return paintkit_id, (name or "Unknown")
 
     schema_name = schema_entry.get("name")
     if isinstance(schema_name, str):
-        prefixes = (
-            "warbird_",
-            "concealedkiller_",
-            "craftsmann_",
-        )
-        for prefix in prefixes:
-            if schema_name.startswith(prefix):
-                suffix = schema_name[len(prefix) :]
-                parts = suffix.split("_", 1)
-                if len(parts) == 2:
-                    paint_slug = parts[1]
-                else:
-                    paint_slug = suffix
-                warpaint_name = _slug_to_paintkit_name(paint_slug)
-                warpaint_id = local_data.PAINTKIT_NAMES.get(warpaint_name)
-                if warpaint_id is None:
-                    match = best_match_from_keys(
-                        warpaint_name, local_data.PAINTKIT_NAMES.keys()
-                    )
-                    if match:
-                        warpaint_id = local_data.PAINTKIT_NAMES.get(match)
-                        warpaint_name = match
-                if warpaint_id is not None:
-                    return warpaint_id, warpaint_name
-                break
+        slug = paint_slug(schema_name)
+        if slug is not None:
+            warpaint_id, warpaint_name = _paintkit_index().resolve_slug(slug)
+            if warpaint_id is not None:
+                return warpaint_id, warpaint_name
 
     return None, None
 
@@ -1,21 +1,18 @@
 from typing import Any, Dict, Tuple
 import logging
-import re
-from html import unescape
 
 from .. import local_data
+from ..schema_snapshot import active as _schema
 from ..constants import (
     KILLSTREAK_TIERS,
     SHEEN_NAMES,
     KILLSTREAK_SHEEN_COLORS,
     KILLSTREAK_EFFECTS,
 )
+from .descriptions import DescriptionFacts, describe
 from .extract_attr_classes import (
     refresh_attr_classes,
     get_attr_class,
-    KILLSTREAK_TIER_CLASSES,
-    KILLSTREAK_SHEEN_CLASSES,
-    KILLSTREAK_EFFECT_CLASSES,
 )
 
 logger = logging.getLogger(__name__)
@@ -61,7 +58,7 @@ def _extract_unusual_effect(asset: Dict[str, Any]) -> dict | None:
         if not effect_id:
             continue
 
-        effect_name = local_data.EFFECT_NAMES.get(str(effect_id)) or EFFECTS_MAP.get(
+        effect_name = _schema().effect_names.get(str(effect_id)) or EFFECTS_MAP.get(
             effect_id
         )
         return {"id": effect_id, "name": effect_name}
@@ -69,14 +66,19 @@ def _extract_unusual_effect(asset: Dict[str, Any]) -> dict | None:
     return None
 
 
-def _extract_killstreak_tier(asset: Dict[str, Any]) -> int | None:
-    """Return killstreak tier id if present."""
+def _extract_killstreak_tier(
+    asset: Dict[str, Any], facts: DescriptionFacts | None = None
+) -> int | None:
+    """Return killstreak tier id if present.
 
-    refresh_attr_classes()
+    ``facts`` are the asset's :func:`describe` result when already known.
+    """
+
+    classes = refresh_attr_classes()
     for attr in asset.get("attributes", []):
         idx = attr.get("defindex")
         attr_class = get_attr_class(idx)
-        if attr_class in KILLSTREAK_TIER_CLASSES or idx == 2025:
+        if attr_class in classes.killstreak_tier or idx == 2025:
             raw = (
                 attr.get("float_value") if "float_value" in attr else attr.get("value")
             )
@@ -89,19 +91,7 @@ def _extract_killstreak_tier(asset: Dict[str, Any]) -> int | None:
                 logger.warning("Unknown killstreak tier id: %s", val)
             return val
 
-    for desc in asset.get("descriptions", []):
-        if not isinstance(desc, dict):
-            continue
-        text = unescape(desc.get("value", ""))
-        text = re.sub(r"<[^>]+>", "", text)
-        if re.search(r"Professional Killstreak", text, re.I):
-            return 3
-        if re.search(r"Specialized Killstreak", text, re.I):
-            return 2
-        if re.search(r"Killstreaks? Active", text, re.I):
-            return 1
-
-    return None
+    return (describe(asset) if facts is None else facts).killstreak_tier
 
 
 def _extract_killstreak(
@@ -109,7 +99,7 @@ def _extract_killstreak(
 ) -> Tuple[str | None, str | None, int | None]:
     """Return killstreak tier name, sheen name and sheen id if present."""
 
-    refresh_attr_classes()
+    classes = refresh_attr_classes()
     tier = None
     sheen = None
     sheen_id = None
@@ -124,13 +114,11 @@ def _extract_killstreak(
             logger.debug("Invalid killstreak attribute value: %r", val_raw)
             continue
         attr_class = get_attr_class(idx)
-        if attr_class in KILLSTREAK_TIER_CLASSES:
-            tier = local_data.KILLSTREAK_NAMES.get(str(val)) or KILLSTREAK_TIERS.get(
-                val
-            )
+        if attr_class in classes.killstreak_tier:
+            tier = _schema().killstreak_names.get(str(val)) or KILLSTREAK_TIERS.get(val)
             if tier is None:
                 logger.warning("Unknown killstreak tier id: %s", val)
-        elif attr_class in KILLSTREAK_SHEEN_CLASSES:
+        elif attr_class in classes.killstreak_sheen:
             sheen_id = val
             sheen = SHEEN_NAMES.get(val)
             if sheen is None:
@@ -138,9 +126,9 @@ def _extract_killstreak(
         elif idx in (2025, 2014):
             logger.warning("Using numeric fallback for killstreak index %s", idx)
             if idx == 2025:
-                tier = local_data.KILLSTREAK_NAMES.get(
-                    str(val)
-                ) or KILLSTREAK_TIERS.get(val)
+                tier = _schema().killstreak_names.get(str(val)) or KILLSTREAK_TIERS.get(
+                    val
+                )
                 if tier is None:
                     logger.warning("Unknown killstreak tier id: %s", val)
             else:
@@ -151,16 +139,21 @@ def _extract_killstreak(
     return tier, sheen, sheen_id
 
 
-def _extract_killstreak_effect(asset: Dict[str, Any]) -> str | None:
-    """Return killstreak effect string if present."""
+def _extract_killstreak_effect(
+    asset: Dict[str, Any], facts: DescriptionFacts | None = None
+) -> str | None:
+    """Return killstreak effect string if present.
+
+    ``facts`` are the asset's :func:`describe` result when already known.
+    """
 
-    refresh_attr_classes()
+    classes = refresh_attr_classes()
     for attr in asset.get("attributes", []):
         idx = attr.get("defindex")
         attr_class = get_attr_class(idx)
-        if attr_class in KILLSTREAK_EFFECT_CLASSES:
+        if attr_class in classes.killstreak_effect:
             val = int(attr.get("float_value", 0))
-            name = local_data.KILLSTREAK_EFFECT_NAMES.get(
+            name = _schema().killstreak_effect_names.get(
                 str(val)
             ) or KILLSTREAK_EFFECTS.get(val)
             if name:
@@ -169,21 +162,13 @@ def _extract_killstreak_effect(asset: Dict[str, Any]) -> str | None:
         elif idx == 2013:
             logger.warning("Using numeric fallback for killstreak effect index %s", idx)
             val = int(attr.get("float_value", 0))
-            name = local_data.KILLSTREAK_EFFECT_NAMES.get(
+            name = _schema().killstreak_effect_names.get(
                 str(val)
             ) or KILLSTREAK_EFFECTS.get(val)
             if name:
                 return name
             logger.warning("Unknown killstreak effect id: %s", val)
-    for desc in asset.get("descriptions", []):
-        if not isinstance(desc, dict):
-            continue
-        text = unescape(desc.get("value", ""))
-        text = re.sub(r"<[^>]+>", "", text)
-        m = re.search(r"Killstreaker:?\s*(.+)", text, re.I)
-        if m:
-            return m.group(1).strip()
-    return None
+    return (describe(asset) if facts is None else facts).killstreaker
 
 
 def _compute_sheen_colors(sheen_id: int | None) -> list[str]:
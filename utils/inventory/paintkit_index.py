@@ -0,0 +1,144 @@
+"""Precomputed war paint name lookups.
+
+Schema names of war painted weapons (``warbird_<weapon>_<paint>`` and the
+like) embed a paint slug whose title-cased form usually, but not always,
+matches a key of ``local_data.PAINTKIT_NAMES``.  Instead of running
+:func:`difflib.get_close_matches` over every paintkit name for each such
+asset, :class:`PaintkitIndex` resolves all slugs found in ``items.json`` once
+and answers remaining fuzzy queries like ``get_close_matches`` would, using
+a character trigram index to find a good match early and skip scoring
+names that cannot beat it.  Answers are memoized.
+
+The index is rebuilt once per schema snapshot (see
+:mod:`utils.schema_cache`), i.e. per generation or when
+``local_data.PAINTKIT_NAMES`` or ``local_data.ITEMS_BY_DEFINDEX`` is
+replaced.
+"""
+
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .. import schema_cache, schema_snapshot
+
+WARPAINT_PREFIXES = ("warbird_", "concealedkiller_", "craftsmann_")
+CUTOFF = 0.6
+# Candidates ranked by shared trigrams that are scored precisely.
+MAX_CANDIDATES = 8
+
+Resolved = Tuple[int | None, str | None]
+
+
+def paint_slug(schema_name: str) -> str | None:
+    """Return the paint slug of a war painted weapon's schema name."""
+
+    for prefix in WARPAINT_PREFIXES:
+        if schema_name.startswith(prefix):
+            suffix = schema_name[len(prefix) :]
+            parts = suffix.split("_", 1)
+            return parts[1] if len(parts) == 2 else suffix
+    return None
+
+
+def slug_to_name(slug: str) -> str:
+    """Return a human readable paintkit name from schema slug."""
+
+    if slug.endswith("_mk_ii"):
+        base = slug[:-6]
+        return base.replace("_", " ").title() + " Mk.II"
+    return slug.replace("_", " ").title()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text.lower()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PaintkitIndex:
+    """Exact, slug and trigram lookups over paintkit ``names``."""
+
+    def __init__(self, names: Dict[str, int], schema_names: Iterable[str] = ()) -> None:
+        self.names = names
+        self._grams: Dict[str, List[str]] = {}
+        for name in names:
+            for gram in _trigrams(name):
+                self._grams.setdefault(gram, []).append(name)
+        self._memo: Dict[str, str | None] = {}
+        self.slugs: Dict[str, Resolved] = {}
+        for schema_name in schema_names:
+            slug = paint_slug(schema_name)
+            if slug is not None and slug not in self.slugs:
+                self.slugs[slug] = self._resolve(slug_to_name(slug))
+
+    def closest(self, query: str) -> str | None:
+        """Return the paintkit name closest to ``query`` or ``None``.
+
+        Gives the answer of :func:`difflib.get_close_matches` with ``n=1``.
+        The names sharing the most trigrams with ``query`` are scored first;
+        their best score then bounds a pass over every name, so only names
+        that could still beat it are scored with
+        :meth:`difflib.SequenceMatcher.ratio`.  Answers are memoized.
+        """
+
+        if query in self._memo:
+            return self._memo[query]
+        shared: Counter[str] = Counter()
+        for gram in _trigrams(query):
+            shared.update(self._grams.get(gram, ()))
+        matcher = difflib.SequenceMatcher(b=query)
+        shortlist = [name for name, _ in shared.most_common(MAX_CANDIDATES)]
+        rest = (name for name in self.names if name not in shortlist)
+        best: Tuple[float, str] | None = None
+        # Ties go to the greater name, as in ``get_close_matches``.
+        for names in (shortlist, rest):
+            for name in names:
+                bound = CUTOFF if best is None else best[0]
+                matcher.set_seq1(name)
+                if matcher.real_quick_ratio() < bound or matcher.quick_ratio() < bound:
+                    continue
+                score = matcher.ratio()
+                if score >= bound and (best is None or (score, name) > best):
+                    best = score, name
+        self._memo[query] = best[1] if best else None
+        return self._memo[query]
+
+    def _resolve(self, name: str) -> Resolved:
+        paintkit_id = self.names.get(name)
+        if paintkit_id is None:
+            match = self.closest(name)
+            if match is None:
+                return None, None
+            name, paintkit_id = match, self.names[match]
+        return paintkit_id, name
+
+    def resolve_slug(self, slug: str) -> Resolved:
+        """Return ``(paintkit_id, name)`` for a schema paint ``slug``."""
+
+        hit = self.slugs.get(slug)
+        if hit is None:
+            hit = self.slugs[slug] = self._resolve(slug_to_name(slug))
+        return hit
+
+
+@schema_cache.derived("PAINTKIT_NAMES", "ITEMS_BY_DEFINDEX")
+def get_index() -> PaintkitIndex:
+    """Return the index for the active schema snapshot."""
+
+    schema = schema_snapshot.active()
+    schema_names = (
+        entry.get("name")
+        for entry in schema.items_by_defindex.values()
+        if isinstance(entry, dict) and isinstance(entry.get("name"), str)
+    )
+    return PaintkitIndex(dict(schema.paintkit_names), schema_names)
+
+
+__all__ = [
+    "PaintkitIndex",
+    "WARPAINT_PREFIXES",
+    "get_index",
+    "paint_slug",
+    "slug_to_name",
+]
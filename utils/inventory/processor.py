@@ -1,11 +1,16 @@
 from typing import Dict, List
 import logging
 import re
-from functools import lru_cache
 
-from .. import local_data
+from .. import price_index, schema_cache
+from ..schema_snapshot import active as _schema
 from ..schema_provider import is_festivized
-from ..valuation_service import ValuationService, get_valuation_service
+from ..valuation_service import (
+    ValuationBatch,
+    ValuationService,
+    get_valuation_service,
+    price_key,
+)
 from ..constants import (
     KILLSTREAK_TIERS,
     KILLSTREAK_LABELS,
@@ -31,6 +36,7 @@ from .extractors_paint_and_wear import (
     resolve_wear,
 )
 from .extractors_grade_tier import _extract_grade_tier
+from .descriptions import describe
 from .extractors_misc import (
     _extract_crate_series,
     _extract_australium,
@@ -51,6 +57,7 @@ from .naming_and_warpaint import (
     _build_item_name,
 )
 from .filters_and_rules import _is_plain_craft_weapon, _has_attr
+from . import profiling
 
 logger = logging.getLogger(__name__)
 
@@ -76,11 +83,11 @@ def _normalize_attr_name(name: str) -> str:
     return re.sub(r"[-_\s]+", "", str(name).lower())
 
 
-@lru_cache(maxsize=1)
+@schema_cache.derived("SCHEMA_ATTRIBUTES")
 def _get_special_attr_defindexes() -> Dict[str, int | None]:
     """Return mapping of special attribute aliases to defindexes."""
 
-    attributes = local_data.SCHEMA_ATTRIBUTES or {}
+    attributes = _schema().schema_attributes
     norm_map = {
         _normalize_attr_name(info.get("name")): idx
         for idx, info in attributes.items()
@@ -101,9 +108,59 @@ def _get_special_attr_defindexes() -> Dict[str, int | None]:
     return result
 
 
+def price_item(item: dict, batch: ValuationBatch) -> None:
+    """Set the price fields of an enriched ``item`` from ``batch``.
+
+    Only fields of the item dictionary are used, so stored scans can be
+    repriced against a newer price generation without the raw asset.
+    """
+
+    try:
+        qid = int(item.get("quality_id") or 0)
+    except (TypeError, ValueError):
+        qid = 0
+    craftable = item.get("craftable", True)
+    is_australium = bool(item.get("is_australium"))
+    effect_id = item.get("unusual_effect_id")
+    ks_tier = item.get("killstreak_tier")
+    paintkit_id = item.get("paintkit_id")
+    try:
+        info, formatted = batch.value(
+            price_key(
+                item.get("base_name"),
+                qid,
+                craftable,
+                is_australium,
+                effect_id,
+                ks_tier,
+            ),
+            price_index.sku(
+                int(item.get("defindex") or 0),
+                qid,
+                craftable,
+                is_australium,
+                effect_id,
+                ks_tier,
+                bool(item.get("is_festivized")),
+                item.get("wear_name") if paintkit_id is not None else None,
+                paintkit_id,
+            ),
+        )
+    except Exception:  # pragma: no cover - defensive fallback
+        info, formatted = None, ""
+    if formatted:
+        item["price"] = info
+        item["price_string"] = formatted
+        item["formatted_price"] = formatted
+    else:
+        item["price"] = None
+        item["price_string"] = ""
+
+
 def _process_item(
     asset: dict,
     valuation_service: ValuationService | None = None,
+    batch: ValuationBatch | None = None,
 ) -> dict | None:
     """Return an enriched item dictionary for a single asset.
 
@@ -117,16 +174,23 @@ def _process_item(
         ``"price_string"`` keys. Defaults to
         :func:`~utils.valuation_service.get_valuation_service`, which returns a
         singleton service.
+    batch:
+        Optional :class:`~utils.valuation_service.ValuationBatch` shared by
+        all items of an inventory so repeated price keys are resolved once.
+        A batch for ``valuation_service`` is created when omitted.
     """
 
     if valuation_service is None:
         valuation_service = get_valuation_service()
 
+    clock = profiling.phase_clock()
     attrs = asset.get("attributes", [])
+    # Description fallbacks of several extractors, parsed once per item.
+    facts = describe(asset)
 
     origin_raw = asset.get("origin")
     tradable_raw = asset.get("tradable", 1)
-    trade_hold_ts = _trade_hold_timestamp(asset)
+    trade_hold_ts = _trade_hold_timestamp(asset, facts)
     untradable_hold = False
     try:
         origin_int = int(origin_raw)
@@ -159,7 +223,8 @@ def _process_item(
         logger.warning("Invalid defindex on asset: %r", defindex_raw)
         return None
 
-    schema_entry = local_data.ITEMS_BY_DEFINDEX.get(defindex_int)
+    schema = _schema()
+    schema_entry = schema.items_by_defindex.get(defindex_int)
     if not schema_entry:
         logger.warning("Missing schema entry for defindex %s", defindex_int)
         schema_entry = {}
@@ -169,6 +234,8 @@ def _process_item(
 
     defindex = str(defindex_int)
     image_url = schema_entry.get("image_url", "")
+    if clock:
+        clock.lap("schema_lookup")
 
     warpaintable = _is_warpaintable(schema_entry)
     warpaint_tool = defindex_int in WAR_PAINT_TOOL_DEFINDEXES or _is_warpaint_tool(
@@ -229,18 +296,20 @@ def _process_item(
         display_base = f"Australium {clean_base}"
 
     quality_id = asset.get("quality", 0)
-    q_name = local_data.QUALITIES_BY_INDEX.get(quality_id)
+    q_name = schema.qualities_by_index.get(quality_id)
     if not q_name:
         q_name = QUALITY_MAP.get(quality_id, ("Unknown",))[0]
     q_col = QUALITY_MAP.get(quality_id, ("", "#B2B2B2"))[1]
     name = _build_item_name(display_base, q_name, asset)
+    if clock:
+        clock.lap("naming")
 
-    ks_tier_val = _extract_killstreak_tier(asset)
+    ks_tier_val = _extract_killstreak_tier(asset, facts)
     ks_tier, sheen_name, sheen_id = _extract_killstreak(asset)
 
     sheen_colors = _compute_sheen_colors(sheen_id)
     sheen_color = sheen_colors[0] if sheen_colors else None
-    ks_effect = _extract_killstreak_effect(asset)
+    ks_effect = _extract_killstreak_effect(asset, facts)
     paint_name, paint_hex = _extract_paint(asset)
     pattern_seed = _extract_pattern_seed(asset)
     crate_series_name = _extract_crate_series(asset)
@@ -272,7 +341,7 @@ def _process_item(
     effect_id = unusual.get("id") if unusual else _attr_val(attach_idx)
     effect_name = unusual.get("name") if unusual else None
     if effect_name is None and effect_id is not None:
-        effect_name = local_data.EFFECT_NAMES.get(str(effect_id))
+        effect_name = schema.effect_names.get(str(effect_id))
     has_attach_attr = effect_id is not None
 
     has_kill_eater_attr = _attr_val(kill_eater_idx) is not None
@@ -299,6 +368,8 @@ def _process_item(
         extra_qualities.append("Strange")
 
     has_strange_tracking = kill_eater_counts.get(1) is not None
+    if clock:
+        clock.lap("attributes")
 
     if has_strange_tracking:
         border_color = QUALITY_MAP[STRANGE_QUALITY_ID][1]
@@ -406,7 +477,7 @@ def _process_item(
             }
         )
     if warpaintable and paintkit_id is not None:
-        warpaint_icon = local_data.ITEMS_BY_DEFINDEX.get(5813, {}).get("image_url")
+        warpaint_icon = schema.items_by_defindex.get(5813, {}).get("image_url")
         badges.append(
             {
                 "icon_url": warpaint_icon,
@@ -440,8 +511,12 @@ def _process_item(
                 },
             )
 
+    if clock:
+        clock.lap("badges")
+
     item = {
         "id": asset.get("id"),
+        "original_id": asset.get("original_id"),
         "defindex": defindex,
         "name": name,
         "original_name": original_name,
@@ -451,6 +526,7 @@ def _process_item(
         "is_festivized": bool(is_festivized(attrs)),
         "is_australium": bool(is_australium),
         "quality": q_name,
+        "quality_id": quality_id,
         "quality_color": q_col,
         "border_color": border_color,
         "image_url": image_url,
@@ -521,9 +597,7 @@ def _process_item(
         "target_weapon_defindex": target_weapon_def,
         "target_weapon_name": target_weapon_name,
         "target_weapon_image": (
-            local_data.ITEMS_BY_DEFINDEX.get(target_weapon_def or 0, {}).get(
-                "image_url"
-            )
+            schema.items_by_defindex.get(target_weapon_def or 0, {}).get("image_url")
             if target_weapon_def is not None
             else None
         ),
@@ -544,7 +618,7 @@ def _process_item(
         "strange_count": kill_eater_counts.get(1),
         "score_type": (
             _PARTS_BY_ID.get(score_types.get(1))
-            or local_data.STRANGE_PART_NAMES.get(str(score_types.get(1)))
+            or schema.strange_part_names.get(str(score_types.get(1)))
             if score_types.get(1) is not None
             else None
         ),
@@ -562,41 +636,17 @@ def _process_item(
         **grade_tier,
     }
 
-    if valuation_service is not None:
-        tradable = tradable_val
+    if clock:
+        clock.lap("assemble")
 
-        if tradable:
-            try:
-                qid = int(quality_id)
-            except (TypeError, ValueError):
-                qid = 0
-            try:
-                formatted = valuation_service.format_price(
-                    item.get("base_name", base_name),
-                    qid,
-                    craftable,
-                    bool(is_australium),
-                    effect_id=effect_id,
-                    killstreak_tier=ks_tier_val,
-                    currencies=local_data.CURRENCIES,
-                )
-            except Exception:  # pragma: no cover - defensive fallback
-                formatted = ""
-            if formatted:
-                item["price"] = valuation_service.get_price_info(
-                    item.get("base_name", base_name),
-                    qid,
-                    craftable,
-                    bool(is_australium),
-                    effect_id=effect_id,
-                    killstreak_tier=ks_tier_val,
-                )
-                item["price_string"] = formatted
-                item["formatted_price"] = formatted
-            else:
-                item["price"] = None
-                item["price_string"] = ""
+    if valuation_service is not None:
+        if tradable_val:
+            if batch is None:
+                batch = valuation_service.batch()
+            price_item(item, batch)
+        if clock:
+            clock.lap("valuation")
     return item
 
 
-__all__ = ["_process_item"]
+__all__ = ["_process_item", "price_item"]
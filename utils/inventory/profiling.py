@@ -0,0 +1,188 @@
+"""Opt-in call counting and timing for the enrichment extractors.
+
+When disabled (the default) nothing in :func:`_process_item` is wrapped and
+the only cost is a ``None`` check per phase.  :func:`enable` swaps the
+extractor references imported into :mod:`utils.inventory.processor` for
+timing wrappers and :func:`disable` restores the originals, so toggling is
+safe at runtime.  Set ``PROFILE_EXTRACTORS=1`` or pass
+``--profile-extractors`` to the app to enable it at startup.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# Names looked up in ``utils.inventory.processor`` and wrapped while enabled.
+EXTRACTOR_NAMES = (
+    "_is_plain_craft_weapon",
+    "_extract_warpaint_tool_info",
+    "_extract_paintkit",
+    "resolve_wear",
+    "_build_item_name",
+    "_extract_killstreak_tier",
+    "_extract_killstreak",
+    "_extract_killstreak_effect",
+    "_compute_sheen_colors",
+    "_extract_paint",
+    "_extract_pattern_seed",
+    "_extract_crate_series",
+    "_extract_australium",
+    "_extract_spells",
+    "_extract_strange_parts",
+    "_extract_kill_eater_info",
+    "_get_special_attr_defindexes",
+    "_extract_unusual_effect",
+    "_extract_killstreak_tool_info",
+    "_extract_grade_tier",
+    "_trade_hold_timestamp",
+)
+
+ENABLED = False
+_STATS: Dict[str, List[float]] = {}
+_LOCK = threading.Lock()
+_ORIGINALS: Dict[str, Callable[..., Any]] = {}
+
+
+def record(name: str, elapsed: float) -> None:
+    """Add one call taking ``elapsed`` seconds to the stats for ``name``."""
+
+    with _LOCK:
+        entry = _STATS.get(name)
+        if entry is None:
+            _STATS[name] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+
+def _wrap(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    label = f"extractor:{name}"
+
+    @functools.wraps(func)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(label, time.perf_counter() - start)
+
+    timed.__profiled__ = True  # type: ignore[attr-defined]
+    return timed
+
+
+class PhaseClock:
+    """Record elapsed time between successive :meth:`lap` calls."""
+
+    __slots__ = ("_last",)
+
+    def __init__(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        record(f"phase:{phase}", now - self._last)
+        self._last = now
+
+
+def phase_clock() -> PhaseClock | None:
+    """Return a :class:`PhaseClock` when profiling is enabled, else ``None``."""
+
+    return PhaseClock() if ENABLED else None
+
+
+def enable() -> None:
+    """Start timing extractor calls made by :func:`_process_item`."""
+
+    global ENABLED
+    from . import processor
+
+    with _LOCK:
+        if ENABLED:
+            return
+        for name in EXTRACTOR_NAMES:
+            func = getattr(processor, name)
+            _ORIGINALS[name] = func
+            setattr(processor, name, _wrap(name, func))
+        ENABLED = True
+
+
+def disable() -> None:
+    """Stop timing and restore the unwrapped extractor functions."""
+
+    global ENABLED
+    from . import processor
+
+    with _LOCK:
+        if not ENABLED:
+            return
+        for name, func in _ORIGINALS.items():
+            current = getattr(processor, name, None)
+            # Leave functions replaced after enabling (e.g. by tests) alone.
+            if getattr(current, "__profiled__", False):
+                setattr(processor, name, func)
+        _ORIGINALS.clear()
+        ENABLED = False
+
+
+def reset() -> None:
+    """Discard all collected timings."""
+
+    with _LOCK:
+        _STATS.clear()
+
+
+def snapshot() -> List[Dict[str, Any]]:
+    """Return collected stats sorted by cumulative time, slowest first."""
+
+    with _LOCK:
+        items = [(name, int(v[0]), v[1]) for name, v in _STATS.items()]
+    items.sort(key=lambda row: row[2], reverse=True)
+    return [
+        {
+            "name": name.split(":", 1)[1],
+            "kind": name.split(":", 1)[0],
+            "calls": calls,
+            "total_ms": round(total * 1000, 3),
+            "mean_us": round(total / calls * 1e6, 2) if calls else 0.0,
+        }
+        for name, calls, total in items
+    ]
+
+
+def format_report(rows: List[Dict[str, Any]] | None = None) -> str:
+    """Return :func:`snapshot` rows as a fixed-width text table."""
+
+    rows = snapshot() if rows is None else rows
+    lines = [f"{'kind':<10} {'name':<32} {'calls':>8} {'total ms':>11} {'mean us':>9}"]
+    for row in rows:
+        lines.append(
+            f"{row['kind']:<10} {row['name']:<32} {row['calls']:>8} "
+            f"{row['total_ms']:>11.3f} {row['mean_us']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def enable_from_env() -> bool:
+    """Enable profiling when ``PROFILE_EXTRACTORS=1`` and return the state."""
+
+    if os.getenv("PROFILE_EXTRACTORS", "0") == "1":
+        enable()
+    return ENABLED
+
+
+__all__ = [
+    "EXTRACTOR_NAMES",
+    "PhaseClock",
+    "phase_clock",
+    "record",
+    "enable",
+    "disable",
+    "reset",
+    "snapshot",
+    "format_report",
+    "enable_from_env",
+]
@@ -1,7 +1,7 @@
 from typing import Dict, Any
 import logging
 
-from .. import local_data
+from ..schema_snapshot import active as _schema
 from ..constants import KILLSTREAK_TIERS, SHEEN_NAMES, KILLSTREAK_EFFECTS
 from ..wear_helpers import _wear_tier
 from .maps_and_constants import (
@@ -69,7 +69,7 @@ def _extract_warpaint_tool_info(
             except (TypeError, ValueError):
                 continue
             if 0 <= val <= 1:
-                name = local_data.WEAR_NAMES.get(str(int(val)))
+                name = _schema().wear_names.get(str(int(val)))
                 wear_name = name or _wear_tier(val)
         elif idx == 2014:
             raw = (
@@ -85,12 +85,12 @@ def _extract_warpaint_tool_info(
     paintkit_name = None
     if paintkit_id is not None:
         paintkit_name = (
-            local_data.PAINTKIT_NAMES_BY_ID.get(str(paintkit_id)) or "Unknown"
+            _schema().paintkit_names_by_id.get(str(paintkit_id)) or "Unknown"
         )
 
     target_name = None
     if target_def is not None:
-        target_entry = local_data.ITEMS_BY_DEFINDEX.get(target_def, {})
+        target_entry = _schema().items_by_defindex.get(target_def, {})
         target_name = _preferred_base_name(str(target_def), target_entry)
 
     return paintkit_id, paintkit_name, wear_name, target_def, target_name
@@ -126,7 +126,7 @@ def _extract_killstreak_tool_info(asset: dict) -> dict | None:
                         qty = int(qty_raw) if qty_raw is not None else 0
                     except (TypeError, ValueError):
                         qty = 0
-                    part_entry = local_data.ITEMS_BY_DEFINDEX.get(itemdef, {})
+                    part_entry = _schema().items_by_defindex.get(itemdef, {})
                     part_name = (
                         part_entry.get("item_name")
                         or part_entry.get("name")
@@ -161,14 +161,14 @@ def _extract_killstreak_tool_info(asset: dict) -> dict | None:
     weapon_name = None
     weapon_image = None
     if weapon_def is not None:
-        weapon_entry = local_data.ITEMS_BY_DEFINDEX.get(weapon_def, {})
+        weapon_entry = _schema().items_by_defindex.get(weapon_def, {})
         weapon_name = _preferred_base_name(str(weapon_def), weapon_entry)
         weapon_image = weapon_entry.get("image_url")
 
     sheen_name = SHEEN_NAMES.get(sheen_id)
     if sheen_id is not None and sheen_name is None:
         logger.warning("Unknown sheen id: %s", sheen_id)
-    effect_name = local_data.KILLSTREAK_EFFECT_NAMES.get(
+    effect_name = _schema().killstreak_effect_names.get(
         str(effect_id)
     ) or KILLSTREAK_EFFECTS.get(effect_id)
     tier_name = KILLSTREAK_TIERS.get(tier_id)
@@ -8,8 +8,11 @@ monkeypatch behavior used by tests and external scripts.
 
 from __future__ import annotations
 
+import time
 from typing import Any, Dict, List
 
+from . import schema_snapshot
+from .metrics import INVENTORY_ENRICH_SECONDS, ITEM_ENRICH_SECONDS
 from .valuation_service import ValuationService, get_valuation_service
 from .inventory.api import run_enrichment_test
 from .inventory.processor import _process_item
@@ -21,8 +24,13 @@ from .inventory.maps_and_constants import QUALITY_MAP
 def enrich_inventory(
     data: Dict[str, Any],
     valuation_service: ValuationService | None = None,
+    schema: schema_snapshot.SchemaSnapshot | None = None,
 ) -> List[Dict[str, Any]]:
-    """Return inventory items enriched with schema, badges, and pricing."""
+    """Return inventory items enriched with schema, badges, and pricing.
+
+    All items are resolved against ``schema``, or the current
+    :class:`~utils.schema_snapshot.SchemaSnapshot` when omitted.
+    """
 
     if valuation_service is None:
         valuation_service = get_valuation_service()
@@ -32,59 +40,66 @@ def enrich_inventory(
         return []
 
     items: List[Dict[str, Any]] = []
-    for asset in items_raw:
-        item = _process_item(asset, valuation_service)
-        if not item:
-            continue
-
-        quality_flag = item.get("quality")
-        if (
-            quality_flag == 11
-            or quality_flag == "Strange"
-            or asset.get("quality") == 11
-        ):
-            attrs = item.get("attributes")
-            if not isinstance(attrs, list):
-                attrs = asset.get("attributes", [])
-            parts_found: set[str] = set()
-            for attr in attrs:
-                if attr.get("defindex") == 214:
-                    try:
-                        idx = int(attr.get("value"))
-                    except (TypeError, ValueError):
-                        continue
-                    name = _PARTS_BY_ID.get(idx)
-                    if name:
-                        parts_found.add(name)
-            if parts_found:
-                existing = item.get("strange_parts", [])
-                if not isinstance(existing, list):
-                    existing = []
-                item["strange_parts"] = sorted(set(existing) | parts_found)
-
-        spells_raw = item.get("spells", [])
-        if isinstance(spells_raw, dict):
-            spells_list = spells_raw.get("list", [])
-        elif isinstance(spells_raw, list):
-            spells_list = spells_raw
-        else:
-            spells_list = []
-        item["modal_spells"] = spells_list
-        item["spells"] = spells_list
-        items.append(item)
-
+    started = time.perf_counter()
+    with schema_snapshot.use(schema):
+        batch = valuation_service.batch()
+        for asset in items_raw:
+            item_started = time.perf_counter()
+            item = _process_item(asset, valuation_service, batch)
+            ITEM_ENRICH_SECONDS.observe(time.perf_counter() - item_started)
+            if not item:
+                continue
+
+            quality_flag = item.get("quality")
+            if (
+                quality_flag == 11
+                or quality_flag == "Strange"
+                or asset.get("quality") == 11
+            ):
+                attrs = item.get("attributes")
+                if not isinstance(attrs, list):
+                    attrs = asset.get("attributes", [])
+                parts_found: set[str] = set()
+                for attr in attrs:
+                    if attr.get("defindex") == 214:
+                        try:
+                            idx = int(attr.get("value"))
+                        except (TypeError, ValueError):
+                            continue
+                        name = _PARTS_BY_ID.get(idx)
+                        if name:
+                            parts_found.add(name)
+                if parts_found:
+                    existing = item.get("strange_parts", [])
+                    if not isinstance(existing, list):
+                        existing = []
+                    item["strange_parts"] = sorted(set(existing) | parts_found)
+
+            spells_raw = item.get("spells", [])
+            if isinstance(spells_raw, dict):
+                spells_list = spells_raw.get("list", [])
+            elif isinstance(spells_raw, list):
+                spells_list = spells_raw
+            else:
+                spells_list = []
+            item["modal_spells"] = spells_list
+            item["spells"] = spells_list
+            items.append(item)
+
+    INVENTORY_ENRICH_SECONDS.observe(time.perf_counter() - started)
     return items
 
 
 def process_inventory(
     data: Dict[str, Any],
     valuation_service: ValuationService | None = None,
+    schema: schema_snapshot.SchemaSnapshot | None = None,
 ) -> List[Dict[str, Any]]:
     """Return enriched items sorted by descending price then item name."""
 
     if valuation_service is None:
         valuation_service = get_valuation_service()
-    items = enrich_inventory(data, valuation_service)
+    items = enrich_inventory(data, valuation_service, schema)
     return sorted(
         items,
         key=lambda item: (
@@ -0,0 +1,182 @@
+"""Backpack value totals for one inventory and for many.
+
+Enrichment already resolves a price for every tradable item, so a total is
+a single pass over the enriched items: :func:`summarize_items` adds up
+``price["value_raw"]`` (times ``quantity`` for stacked items), groups the
+sum by quality and slot and keeps the most valuable items with
+:func:`heapq.nlargest`.  :meth:`InventoryValue.add` merges summaries, so a
+multi-user scan or every stored scan totals without revisiting items.
+
+Summaries are stamped on user cards as ``value`` and on stored scans as the
+``value`` metadata field.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List
+
+from .price_service import format_refined
+
+TOP_ITEMS = 5
+SORT_KEYS = ("value", "priced", "items")
+
+
+def _add_group(groups: Dict[str, float], group: Dict[str, float]) -> None:
+    for name, value in group.items():
+        groups[name] = groups.get(name, 0.0) + value
+
+
+def _ranked(groups: Dict[str, float]) -> Dict[str, float]:
+    return {
+        name: round(value, 2)
+        for name, value in sorted(groups.items(), key=lambda kv: -kv[1])
+    }
+
+
+@dataclass
+class InventoryValue:
+    """Value totals of one or more inventories, in refined metal."""
+
+    total_value_raw: float = 0.0
+    key_price: float = 0.0
+    priced: int = 0
+    unpriced: int = 0
+    users: int = 0
+    by_quality: Dict[str, float] = field(default_factory=dict)
+    by_slot: Dict[str, float] = field(default_factory=dict)
+    top: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def total_keys(self) -> float:
+        if self.key_price <= 0:
+            return 0.0
+        return self.total_value_raw / self.key_price
+
+    @property
+    def total_string(self) -> str:
+        return format_refined(self.total_value_raw, self.key_price)
+
+    def add(self, other: "InventoryValue", top: int = TOP_ITEMS) -> None:
+        """Merge ``other`` into this summary, keeping the ``top`` items overall."""
+
+        self.total_value_raw += other.total_value_raw
+        self.key_price = self.key_price or other.key_price
+        self.priced += other.priced
+        self.unpriced += other.unpriced
+        self.users += other.users
+        _add_group(self.by_quality, other.by_quality)
+        _add_group(self.by_slot, other.by_slot)
+        self.top = heapq.nlargest(
+            top, self.top + other.top, key=lambda entry: entry["value_raw"]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_value_raw": round(self.total_value_raw, 2),
+            "total_keys": round(self.total_keys, 2),
+            "total_string": self.total_string,
+            "key_price": self.key_price,
+            "priced": self.priced,
+            "unpriced": self.unpriced,
+            "users": self.users,
+            "by_quality": _ranked(self.by_quality),
+            "by_slot": _ranked(self.by_slot),
+            "top": self.top,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InventoryValue":
+        """Rebuild a summary stored with :meth:`to_dict`."""
+
+        return cls(
+            total_value_raw=float(data.get("total_value_raw") or 0.0),
+            key_price=float(data.get("key_price") or 0.0),
+            priced=int(data.get("priced") or 0),
+            unpriced=int(data.get("unpriced") or 0),
+            users=int(data.get("users") or 0),
+            by_quality=dict(data.get("by_quality") or {}),
+            by_slot=dict(data.get("by_slot") or {}),
+            top=list(data.get("top") or []),
+        )
+
+
+def _top_entry(
+    item: Dict[str, Any], value: float, key_price: float, steamid: str | None
+) -> Dict[str, Any]:
+    entry = {
+        "name": item.get("display_name") or item.get("name"),
+        "value_raw": value,
+        "price_string": format_refined(value, key_price),
+        "quality_color": item.get("quality_color"),
+        "image_url": item.get("image_url"),
+    }
+    if steamid is not None:
+        entry["steamid"] = steamid
+    return entry
+
+
+def summarize_items(
+    items: Iterable[Dict[str, Any]],
+    key_price: float = 0.0,
+    *,
+    steamid: str | None = None,
+    top: int = TOP_ITEMS,
+) -> InventoryValue:
+    """Return the value summary of enriched ``items``.
+
+    Items without a ``price`` count as unpriced.  ``steamid`` is recorded on
+    the top items so merged summaries still say whose item it is.
+    """
+
+    result = InventoryValue(key_price=key_price, users=1)
+    total = 0.0
+    by_quality = result.by_quality
+    by_slot = result.by_slot
+    priced: List[Dict[str, Any]] = []
+    values: List[float] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        quantity = item.get("quantity") or 1
+        price = item.get("price")
+        try:
+            value = float(price["value_raw"])
+        except (KeyError, TypeError, ValueError):
+            result.unpriced += quantity
+            continue
+        amount = value * quantity
+        total += amount
+        result.priced += quantity
+        quality = item.get("quality") or "Unknown"
+        by_quality[quality] = by_quality.get(quality, 0.0) + amount
+        slot = item.get("slot_type") or "other"
+        by_slot[slot] = by_slot.get(slot, 0.0) + amount
+        priced.append(item)
+        values.append(value)
+    result.total_value_raw = total
+    best = heapq.nlargest(top, range(len(values)), key=values.__getitem__)
+    result.top = [_top_entry(priced[i], values[i], key_price, steamid) for i in best]
+    return result
+
+
+def sort_value(summary: InventoryValue | None, by: str = "value") -> float:
+    """Return the sort key of ``summary`` for one of :data:`SORT_KEYS`."""
+
+    if summary is None:
+        return 0.0
+    if by == "priced":
+        return summary.priced
+    if by == "items":
+        return summary.priced + summary.unpriced
+    return summary.total_value_raw
+
+
+__all__ = [
+    "InventoryValue",
+    "SORT_KEYS",
+    "TOP_ITEMS",
+    "sort_value",
+    "summarize_items",
+]
@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, Tuple
 import logging
@@ -28,6 +29,10 @@ STRANGE_PART_NAMES: Dict[str, str] = {}
 PAINTKIT_NAMES: Dict[str, str]
 PAINTKIT_NAMES_BY_ID: Dict[str, str]
 CRATE_SERIES_NAMES: Dict[str, str] = {}
+# Bumped by every :func:`load_files`; see :mod:`utils.schema_cache`.
+SCHEMA_GENERATION = 0
+# Held by :func:`load_files` while tables are being replaced.
+RELOAD_LOCK = threading.Lock()
 CURRENCIES: Dict[str, Any] = {}
 FOOTPRINT_SPELL_MAP: Dict[int, str] = {}
 PAINT_SPELL_MAP: Dict[int, str] = {}
@@ -194,6 +199,19 @@ def _load_json_map(path: Path) -> Dict[str, str]:
     return {}
 
 
+def _load_paintkit_names(path: Path) -> Dict[str, Any]:
+    """Return paintkit name -> id from the cached paintkits endpoint."""
+
+    if not path.exists():
+        return {}
+    try:
+        with path.open() as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    return {str(k): v for k, v in data.items()} if isinstance(data, dict) else {}
+
+
 def _load_paint_id_map(path: Path) -> Dict[str, str]:
     """Return a mapping of paint ID -> name from a name->id JSON file."""
 
@@ -242,13 +260,30 @@ def _load_item_grade_by_defindex(path: Path) -> Dict[int, str]:
 def load_files(
     *, auto_refetch: bool = False, verbose: bool = False
 ) -> Tuple[Dict[int, Any], Dict[int, Any]]:
-    """Load local schema files from the schema.autobot.tf cache."""
+    """Load local schema files from the schema.autobot.tf cache.
+
+    Reloads are serialized; once every table is loaded a new
+    :class:`~utils.schema_snapshot.SchemaSnapshot` is published.
+    """
+
+    from . import schema_snapshot
+
+    with RELOAD_LOCK:
+        result = _load_files(auto_refetch=auto_refetch, verbose=verbose)
+        schema_snapshot.publish(schema_snapshot.SchemaSnapshot.capture())
+    return result
+
+
+def _load_files(
+    *, auto_refetch: bool, verbose: bool
+) -> Tuple[Dict[int, Any], Dict[int, Any]]:
 
     global SCHEMA_ATTRIBUTES, ITEMS_BY_DEFINDEX, QUALITIES_BY_INDEX, PARTICLE_NAMES
     global EFFECT_NAMES, PAINT_NAMES, WEAR_NAMES, WEAR_NAMES_BY_ID
     global KILLSTREAK_NAMES, STRANGE_PART_NAMES, PAINTKIT_NAMES, CRATE_SERIES_NAMES
     global ITEM_GRADE_BY_DEFINDEX
     global FOOTPRINT_SPELL_MAP, PAINT_SPELL_MAP
+    global PAINTKIT_NAMES_BY_ID, SCHEMA_GENERATION
 
     cleanup_legacy_files(verbose)
 
@@ -429,6 +464,10 @@ def load_files(
     STRANGE_PART_NAMES = _load_json_map(STRANGE_PART_FILE)
     CRATE_SERIES_NAMES = _load_json_map(CRATE_SERIES_FILE)
     ITEM_GRADE_BY_DEFINDEX = _load_item_grade_by_defindex(ITEM_GRADE_FILE)
+    paintkits = _load_paintkit_names(PAINTKIT_FILE)
+    if paintkits:
+        PAINTKIT_NAMES = paintkits
+        PAINTKIT_NAMES_BY_ID = {str(v): k for k, v in PAINTKIT_NAMES.items()}
 
     FOOTPRINT_SPELL_MAP = {}
     PAINT_SPELL_MAP = {}
@@ -493,4 +532,5 @@ def load_files(
                 label,
                 path,
             )
+    SCHEMA_GENERATION += 1
     return SCHEMA_ATTRIBUTES, ITEMS_BY_DEFINDEX
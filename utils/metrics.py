@@ -0,0 +1,353 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+The registry is intentionally tiny: counters, gauges and histograms with
+string labels, guarded by a lock so Hypercorn worker threads can record
+observations concurrently. :func:`render_prometheus` produces the payload
+served by the ``/metrics`` route.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import threading
+import time
+from typing import Dict, Iterator, List, Sequence, Tuple, TypeVar
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Per-item enrichment is measured in microseconds, so it needs finer buckets.
+ITEM_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.1,
+)
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def samples(self) -> List[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_label_str(self.label_names, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    @contextlib.contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        """Increment the gauge for the duration of the ``with`` block."""
+
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_label_str(self.label_names, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram of observed values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def sum(self, **labels: str) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time spent inside the ``with`` block."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            keys = sorted(self._counts)
+            snapshot = [(k, list(self._counts[k]), self._sums[k]) for k in keys]
+        lines: List[str] = []
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_label_str(self.label_names, key, le)} "
+                    f"{cumulative}"
+                )
+            labels = _label_str(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+STEAM_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "tf2scanner_steam_request_seconds",
+        "Steam Web API call latency by endpoint and response status.",
+        labels=("endpoint", "status"),
+    )
+)
+INVENTORY_ENRICH_SECONDS = REGISTRY.register(
+    Histogram(
+        "tf2scanner_inventory_enrich_seconds",
+        "Time spent enriching one inventory with schema and pricing data.",
+    )
+)
+ITEM_ENRICH_SECONDS = REGISTRY.register(
+    Histogram(
+        "tf2scanner_item_enrich_seconds",
+        "Time spent enriching a single inventory item.",
+        buckets=ITEM_BUCKETS,
+    )
+)
+STACK_SECONDS = REGISTRY.register(
+    Histogram(
+        "tf2scanner_stack_items_seconds",
+        "Time spent grouping enriched items into quantity stacks.",
+    )
+)
+RENDER_SECONDS = REGISTRY.register(
+    Histogram(
+        "tf2scanner_template_render_seconds",
+        "Jinja template render time by template name.",
+        labels=("template",),
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "tf2scanner_cache_requests_total",
+        "Lookups against in-process caches by cache name and result.",
+        labels=("cache", "result"),
+    )
+)
+SCANS_TOTAL = REGISTRY.register(
+    Counter(
+        "tf2scanner_scans_total",
+        "User scans completed by final inventory status.",
+        labels=("status",),
+    )
+)
+ACTIVE_SCANS = REGISTRY.register(
+    Gauge(
+        "tf2scanner_active_scans",
+        "Number of user scans currently in progress.",
+    )
+)
+EVENT_LOOP_LAG_SECONDS = REGISTRY.register(
+    Histogram(
+        "tf2scanner_event_loop_lag_seconds",
+        "Delay between scheduled and actual wake-up of the server event loop.",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    )
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a hit or miss for the named in-process cache."""
+
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Sample event-loop lag forever by measuring oversleep of ``interval``."""
+
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = loop.time() - start - interval
+        EVENT_LOOP_LAG_SECONDS.observe(max(lag, 0.0))
+
+
+def render_prometheus() -> str:
+    """Return all registered metrics in Prometheus text format."""
+
+    return REGISTRY.render()
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "STEAM_REQUEST_SECONDS",
+    "INVENTORY_ENRICH_SECONDS",
+    "ITEM_ENRICH_SECONDS",
+    "STACK_SECONDS",
+    "RENDER_SECONDS",
+    "CACHE_REQUESTS",
+    "SCANS_TOTAL",
+    "ACTIVE_SCANS",
+    "EVENT_LOOP_LAG_SECONDS",
+    "record_cache",
+    "monitor_event_loop_lag",
+    "render_prometheus",
+]
@@ -0,0 +1,550 @@
+"""Append-only, columnar history of backpack.tf prices.
+
+Each refresh overwrites ``cache/prices.json``.  :class:`PriceHistory` keeps
+what changed instead.  :meth:`PriceHistory.record` compares every entry with
+the last value stored for it and appends a row only when the value or
+currency moved.  The key price from ``currencies.json`` is stored the same
+way.  Rows are 18 bytes, kept in one directory per UTC month::
+
+    cache/price_history/
+        series.json         names, currencies and the last key price
+        series_name.u32     name id of each series
+        series_code.u64     variant code of each series
+        last.f64, last.u16  last recorded value and currency id per series
+        2026-10/ts.u32      row timestamps (epoch seconds)
+        2026-10/series.u32  series id of each row
+        2026-10/value.f64   value_raw
+        2026-10/currency.u16
+        2026-10/key_ts.u32, 2026-10/key_value.f64   key price in refined
+        2026-10/meta.json   {"step": 86400} once downsampled
+
+A series is a price map key, ``(name, quality, craftable, australium,
+effect, killstreak tier)``.  Names do not depend on the loaded schema; use
+:meth:`~utils.price_index.SkuIndex` to go from an item to its name.
+
+:meth:`PriceHistory.downsample` rewrites months older than
+``RAW_DAYS`` days to one row per series and day.  That is the last price of
+the day, so a year of history stays in the tens of megabytes.
+:meth:`PriceHistory.curve` finds a series' rows from a per-month index of
+``series.u32``, extended as rows are appended, and reads only those rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from .price_table import _code, _key_fields
+
+HISTORY_DIR = Path("cache/price_history")
+RAW_DAYS = 30
+DAY = 86400
+# Column file name -> array typecode.
+COLUMNS = {
+    "ts": "I",
+    "series": "I",
+    "value": "d",
+    "currency": "H",
+}
+KEY_COLUMNS = {"key_ts": "I", "key_value": "d"}
+SERIES_COLUMNS = {"series_name": "I", "series_code": "Q"}
+_SUFFIX = {"I": ".u32", "Q": ".u64", "d": ".f64", "H": ".u16"}
+
+logger = logging.getLogger(__name__)
+
+PriceKey = Tuple[str, int, bool, bool, int, int]
+Point = Tuple[int, float, str]
+
+
+def _month(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+
+def _month_end(month: str) -> int:
+    start = datetime.strptime(month, "%Y-%m").replace(tzinfo=timezone.utc)
+    following = (start + timedelta(days=32)).replace(day=1)
+    return int(following.timestamp())
+
+
+def _path(directory: Path, column: str, typecode: str) -> Path:
+    return directory / f"{column}{_SUFFIX[typecode]}"
+
+
+def _read(path: Path, typecode: str) -> array:
+    values = array(typecode)
+    try:
+        with path.open("rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return values
+    values.frombytes(data[: len(data) - len(data) % values.itemsize])
+    return values
+
+
+def _rows(directory: Path, columns: Dict[str, str]) -> int:
+    """Return the number of complete rows in ``directory``."""
+
+    sizes = []
+    for name, typecode in columns.items():
+        try:
+            size = _path(directory, name, typecode).stat().st_size
+        except OSError:
+            return 0
+        sizes.append(size // array(typecode).itemsize)
+    return min(sizes)
+
+
+def _read_columns(directory: Path, columns: Dict[str, str]) -> Dict[str, array]:
+    """Return ``columns`` of ``directory`` cut to their common length.
+
+    A crash between column appends leaves some columns one row longer; the
+    partial row is ignored.
+    """
+
+    data = {name: _read(_path(directory, name, tc), tc) for name, tc in columns.items()}
+    rows = min(len(values) for values in data.values())
+    return {name: values[:rows] for name, values in data.items()}
+
+
+def _append(directory: Path, columns: Dict[str, str], data: Dict[str, array]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, typecode in columns.items():
+        with _path(directory, name, typecode).open("ab") as f:
+            data[name].tofile(f)
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
+
+def _last_per_bucket(ts: array, step: int) -> List[int]:
+    """Return indexes of the last row in each ``step`` bucket of sorted ``ts``."""
+
+    keep: List[int] = []
+    for i in range(len(ts)):
+        if i + 1 == len(ts) or ts[i + 1] // step != ts[i] // step:
+            keep.append(i)
+    return keep
+
+
+class PriceHistory:
+    """Price changes of every series, appended per refresh."""
+
+    def __init__(self, root: Path | None = None, raw_days: int = RAW_DAYS) -> None:
+        self.root = Path(root) if root is not None else HISTORY_DIR
+        self.raw_days = raw_days
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._series_names = array("I")
+        self._series_codes = array("Q")
+        self._series_ids: Dict[Tuple[int, int], int] = {}
+        self._currencies: List[str] = []
+        self._last_value = array("d")
+        self._last_currency = array("H")
+        self._last_key_price: float | None = None
+        # month -> (rows indexed, series id -> row numbers)
+        self._index: Dict[str, Tuple[int, Dict[int, array]]] = {}
+
+    # -- series table -------------------------------------------------
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        try:
+            table = json.loads((self.root / "series.json").read_text())
+        except (OSError, ValueError):
+            table = {}
+        self._names = list(table.get("names", []))
+        self._name_ids = {name: i for i, name in enumerate(self._names)}
+        self._currencies = list(table.get("currencies", []))
+        self._last_key_price = table.get("key_price")
+        columns = _read_columns(self.root, SERIES_COLUMNS)
+        self._series_names = columns["series_name"]
+        self._series_codes = columns["series_code"]
+        self._series_ids = {
+            pair: i
+            for i, pair in enumerate(zip(self._series_names, self._series_codes))
+        }
+        count = len(self._series_ids)
+        self._last_value = _read(self.root / "last.f64", "d")[:count]
+        self._last_currency = _read(self.root / "last.u16", "H")[:count]
+        self._last_value.extend([float("nan")] * (count - len(self._last_value)))
+        self._last_currency.extend([0] * (count - len(self._last_currency)))
+        self._loaded = True
+
+    def _save_table(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        table = {
+            "names": self._names,
+            "currencies": self._currencies,
+            "key_price": self._last_key_price,
+        }
+        _write_atomic(self.root / "series.json", json.dumps(table).encode())
+        _write_atomic(self.root / "series_name.u32", self._series_names.tobytes())
+        _write_atomic(self.root / "series_code.u64", self._series_codes.tobytes())
+        _write_atomic(self.root / "last.f64", self._last_value.tobytes())
+        _write_atomic(self.root / "last.u16", self._last_currency.tobytes())
+
+    def _series_id(self, key: PriceKey, create: bool) -> int | None:
+        name, quality, craftable, is_australium, effect_id, ks_tier = key
+        code = _code(quality, craftable, is_australium, effect_id or 0, ks_tier or 0)
+        if code is None:
+            return None
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            if not create:
+                return None
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        series_id = self._series_ids.get((name_id, code))
+        if series_id is None and create:
+            series_id = self._series_ids[(name_id, code)] = len(self._series_ids)
+            self._series_names.append(name_id)
+            self._series_codes.append(code)
+            self._last_value.append(float("nan"))
+            self._last_currency.append(0)
+        return series_id
+
+    def _currency_id(self, currency: str) -> int:
+        try:
+            return self._currencies.index(currency)
+        except ValueError:
+            self._currencies.append(currency)
+            return len(self._currencies) - 1
+
+    # -- writing ------------------------------------------------------
+
+    def record(
+        self,
+        entries: Mapping[PriceKey, Dict[str, Any]] | Iterable[Tuple[PriceKey, Any]],
+        currencies: Mapping[str, Any] | None = None,
+        at: float | None = None,
+    ) -> int:
+        """Append the entries whose price changed; return the rows written.
+
+        ``entries`` may be a whole price map or a delta.  The key price is
+        taken from ``currencies`` when given.
+        """
+
+        ts = int(time.time() if at is None else at)
+        if isinstance(entries, Mapping):
+            entries = entries.items()
+        rows = {name: array(tc) for name, tc in COLUMNS.items()}
+        with self._lock:
+            self._load()
+            for key, info in entries:
+                try:
+                    value = float(info["value_raw"])
+                    currency = str(info["currency"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                series_id = self._series_id(key, create=True)
+                if series_id is None:
+                    continue
+                currency_id = self._currency_id(currency)
+                if (
+                    self._last_value[series_id] == value
+                    and self._last_currency[series_id] == currency_id
+                ):
+                    continue
+                self._last_value[series_id] = value
+                self._last_currency[series_id] = currency_id
+                rows["ts"].append(ts)
+                rows["series"].append(series_id)
+                rows["value"].append(value)
+                rows["currency"].append(currency_id)
+
+            key_price = _key_price(currencies)
+            directory = self.root / _month(ts)
+            if key_price is not None and key_price != self._last_key_price:
+                self._last_key_price = key_price
+                _append(
+                    directory,
+                    KEY_COLUMNS,
+                    {"key_ts": array("I", [ts]), "key_value": array("d", [key_price])},
+                )
+            if rows["ts"]:
+                _append(directory, COLUMNS, rows)
+            self._save_table()
+        return len(rows["ts"])
+
+    def downsample(self, now: float | None = None) -> List[str]:
+        """Keep one row per series and day in months older than ``raw_days``.
+
+        Returns the months rewritten.
+        """
+
+        cutoff = int(time.time() if now is None else now) - self.raw_days * DAY
+        done: List[str] = []
+        with self._lock:
+            for directory in self._months():
+                meta_path = directory / "meta.json"
+                if meta_path.exists() or _month_end(directory.name) > cutoff:
+                    continue
+                self._downsample_month(directory)
+                self._index.pop(directory.name, None)
+                done.append(directory.name)
+        return done
+
+    def _downsample_month(self, directory: Path) -> None:
+        data = _read_columns(directory, COLUMNS)
+        by_series: Dict[int, List[int]] = {}
+        for row, series_id in enumerate(data["series"]):
+            by_series.setdefault(series_id, []).append(row)
+        keep: List[int] = []
+        for rows in by_series.values():
+            ts = array("I", (data["ts"][row] for row in rows))
+            keep.extend(rows[i] for i in _last_per_bucket(ts, DAY))
+        keep.sort()
+        keys = _read_columns(directory, KEY_COLUMNS)
+        key_keep = _last_per_bucket(keys["key_ts"], DAY)
+
+        tmp = directory.with_name(directory.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        _append(
+            tmp,
+            COLUMNS,
+            {
+                name: array(tc, (data[name][row] for row in keep))
+                for name, tc in COLUMNS.items()
+            },
+        )
+        _append(
+            tmp,
+            KEY_COLUMNS,
+            {
+                name: array(tc, (keys[name][row] for row in key_keep))
+                for name, tc in KEY_COLUMNS.items()
+            },
+        )
+        (tmp / "meta.json").write_text(json.dumps({"step": DAY}))
+        old = directory.with_name(directory.name + ".old")
+        os.replace(directory, old)
+        os.replace(tmp, directory)
+        shutil.rmtree(old, ignore_errors=True)
+
+    # -- reading ------------------------------------------------------
+
+    def _months(self, start: int | None = None, end: int | None = None) -> List[Path]:
+        if not self.root.is_dir():
+            return []
+        first = _month(start) if start is not None else ""
+        last = _month(end) if end is not None else "9999-99"
+        return sorted(
+            path
+            for path in self.root.iterdir()
+            if path.is_dir()
+            and len(path.name) == 7
+            and path.name[4] == "-"
+            and first <= path.name <= last
+        )
+
+    def _series_rows(self, directory: Path, series_id: int) -> array:
+        """Return the rows of ``series_id`` in a month, extending its index."""
+
+        rows = _rows(directory, COLUMNS)
+        indexed, index = self._index.get(directory.name, (0, {}))
+        if indexed > rows:  # rewritten by downsample()
+            indexed, index = 0, {}
+        if indexed < rows:
+            with _path(directory, "series", "I").open("rb") as f:
+                f.seek(indexed * 4)
+                series = array("I", f.read((rows - indexed) * 4))
+            for row, value in enumerate(series, indexed):
+                index.setdefault(value, array("I")).append(row)
+        self._index[directory.name] = (rows, index)
+        return index.get(series_id, array("I"))
+
+    def _read_rows(self, directory: Path, rows: array) -> List[Point]:
+        files = {
+            name: _path(directory, name, tc).open("rb")
+            for name, tc in COLUMNS.items()
+            if name != "series"
+        }
+        points: List[Point] = []
+        try:
+            for row in rows:
+                values = {}
+                for name, f in files.items():
+                    column = array(COLUMNS[name])
+                    f.seek(row * column.itemsize)
+                    column.frombytes(f.read(column.itemsize))
+                    values[name] = column[0]
+                currency = self._currencies[values["currency"]]
+                points.append((values["ts"], values["value"], currency))
+        finally:
+            for f in files.values():
+                f.close()
+        return points
+
+    def curve(
+        self,
+        key: PriceKey,
+        start: float | None = None,
+        end: float | None = None,
+        step: int | None = None,
+    ) -> List[Point]:
+        """Return ``(ts, value_raw, currency)`` changes of ``key``.
+
+        The price in effect at ``start`` is included as the first point,
+        stamped ``start``.  With ``step`` seconds only the last change in
+        each bucket is kept.
+        """
+
+        start_ts = int(start) if start is not None else None
+        end_ts = int(end) if end is not None else None
+        points: List[Point] = []
+        before: Point | None = None
+        with self._lock:
+            self._load()
+            series_id = self._series_id(key, create=False)
+            if series_id is None:
+                return []
+            # Walk back from ``end`` until the change in effect at ``start``.
+            for directory in reversed(self._months(None, end_ts)):
+                rows = self._series_rows(directory, series_id)
+                for point in reversed(self._read_rows(directory, rows)):
+                    if end_ts is not None and point[0] > end_ts:
+                        continue
+                    if start_ts is not None and point[0] < start_ts:
+                        before = point
+                        break
+                    points.append(point)
+                if before is not None:
+                    break
+        points.reverse()
+        if before is not None:
+            points.insert(0, (start_ts, before[1], before[2]))
+        if step:
+            ts = array("I", (point[0] for point in points))
+            points = [points[i] for i in _last_per_bucket(ts, step)]
+        return points
+
+    def key_prices(
+        self, start: float | None = None, end: float | None = None
+    ) -> List[Tuple[int, float]]:
+        """Return ``(ts, refined)`` key price changes between ``start`` and ``end``."""
+
+        points: List[Tuple[int, float]] = []
+        with self._lock:
+            for directory in self._months(None, end):
+                data = _read_columns(directory, KEY_COLUMNS)
+                for ts, value in zip(data["key_ts"], data["key_value"]):
+                    if end is not None and ts > end:
+                        break
+                    if start is not None and ts < start:
+                        points[:] = [(int(start), value)]
+                        continue
+                    points.append((ts, value))
+        return points
+
+    def series(self) -> Iterable[PriceKey]:
+        """Yield the key of every recorded series."""
+
+        with self._lock:
+            self._load()
+            names, pairs = list(self._names), list(self._series_ids)
+        for name_id, code in pairs:
+            yield (names[name_id],) + _key_fields(code)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return series, row and byte counts per month."""
+
+        months = {}
+        for directory in self._months():
+            files = [p for p in directory.iterdir() if p.is_file()]
+            ts_file = _path(directory, "ts", COLUMNS["ts"])
+            months[directory.name] = {
+                "rows": ts_file.stat().st_size // 4 if ts_file.exists() else 0,
+                "bytes": sum(p.stat().st_size for p in files),
+                "downsampled": (directory / "meta.json").exists(),
+            }
+        with self._lock:
+            self._load()
+            series = len(self._series_ids)
+        return {"series": series, "months": months}
+
+
+def _key_price(currencies: Mapping[str, Any] | None) -> float | None:
+    try:
+        return float(currencies["keys"]["price"]["value_raw"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+_default_history: PriceHistory | None = None
+
+
+def get_price_history() -> PriceHistory:
+    """Return singleton :class:`PriceHistory` for ``HISTORY_DIR``."""
+
+    global _default_history
+    if _default_history is None:
+        _default_history = PriceHistory()
+    return _default_history
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.price_history",
+        description="Inspect or maintain the local price history.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    curve = sub.add_parser("curve", help="print an item's price changes")
+    curve.add_argument("name")
+    curve.add_argument("--quality", type=int, default=6)
+    curve.add_argument("--uncraftable", action="store_true")
+    curve.add_argument("--australium", action="store_true")
+    curve.add_argument("--effect", type=int, default=0)
+    curve.add_argument("--killstreak", type=int, default=0)
+    curve.add_argument("--days", type=float, help="only the last N days")
+    curve.add_argument("--step", type=int, help="bucket size in seconds")
+    sub.add_parser("stats", help="print series and size per month")
+    sub.add_parser("downsample", help="downsample months past the raw window")
+    args = parser.parse_args(argv)
+
+    history = get_price_history()
+    if args.command == "curve":
+        key = (
+            args.name,
+            args.quality,
+            not args.uncraftable,
+            args.australium,
+            args.effect,
+            args.killstreak,
+        )
+        start = time.time() - args.days * DAY if args.days else None
+        for ts, value, currency in history.curve(key, start, step=args.step):
+            stamp = datetime.fromtimestamp(ts, timezone.utc).isoformat()
+            print(f"{stamp}\t{value}\t{currency}")
+    elif args.command == "stats":
+        print(json.dumps(history.stats(), indent=2))
+    else:
+        print(json.dumps(history.downsample()))
+    return 0
+
+
+__all__ = [
+    "DAY",
+    "HISTORY_DIR",
+    "PriceHistory",
+    "RAW_DAYS",
+    "get_price_history",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
@@ -0,0 +1,290 @@
+"""Price index keyed by item SKU instead of name.
+
+:func:`~utils.price_loader.build_price_map` keys prices by the backpack.tf
+name left after stripping quality, killstreak and Australium prefixes, and
+valuation looks items up by their schema name.  A name that is spelled
+differently on either side silently loses the price, and every lookup
+hashes a long string.
+
+:func:`build_sku_index` joins the name map to ``ITEMS_BY_DEFINDEX`` once per
+price generation and schema generation.  Its keys are :data:`Sku` tuples of
+small values::
+
+    (defindex, quality, craftable, australium, effect, killstreak tier,
+     festivized, wear tier, paintkit)
+
+A name shared by several defindexes (stock and upgradeable weapons, reskins)
+prices all of them.  Names matching no schema item are counted in
+:attr:`SkuIndex.unmatched`; their prices are still found through the name
+map, which :class:`~utils.valuation_service.ValuationBatch` falls back to.
+
+Run ``python -m utils.price_index`` to list the unmatched names.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from . import schema_snapshot
+from .price_table import CompactPriceMap
+
+Sku = Tuple[int, int, bool, bool, int, int, bool, int, int]
+# Defindexes a backpack.tf name resolves to, and its festivized, wear and
+# paintkit parts.
+_Match = Tuple[Tuple[int, ...], bool, int, int]
+
+WEAR_TIERS = {
+    "Factory New": 1,
+    "Minimal Wear": 2,
+    "Field-Tested": 3,
+    "Well-Worn": 4,
+    "Battle Scarred": 5,
+}
+FESTIVIZED_PREFIX = "Festivized "
+
+
+def sku(
+    defindex: int,
+    quality: int,
+    craftable: bool = True,
+    is_australium: bool = False,
+    effect_id: int | None = None,
+    killstreak_tier: int | None = None,
+    festivized: bool = False,
+    wear: str | int | None = None,
+    paintkit_id: int | None = None,
+) -> Sku:
+    """Return the SKU of an item; ``wear`` may be a tier name or number."""
+
+    if isinstance(wear, str):
+        wear = WEAR_TIERS.get(wear)
+    return (
+        defindex,
+        quality,
+        craftable,
+        is_australium,
+        effect_id or 0,
+        killstreak_tier or 0,
+        festivized,
+        wear or 0,
+        paintkit_id or 0,
+    )
+
+
+def _schema_names(items_by_defindex: Mapping[int, Any]) -> Dict[str, Tuple[int, ...]]:
+    """Return defindexes by schema ``item_name`` and ``name``."""
+
+    names: Dict[str, list[int]] = {}
+    aliases: Dict[str, list[int]] = {}
+    for defindex, entry in items_by_defindex.items():
+        if not isinstance(entry, dict):
+            continue
+        for field in ("item_name", "name"):
+            name = entry.get(field)
+            if not isinstance(name, str) or not name:
+                continue
+            found = names.setdefault(name, [])
+            if defindex not in found:
+                found.append(defindex)
+            if name.startswith("The "):
+                aliases.setdefault(name[4:], []).append(defindex)
+    for name, defindexes in aliases.items():
+        names.setdefault(name, defindexes)
+    return {name: tuple(defindexes) for name, defindexes in names.items()}
+
+
+def _paintkit_ids(paintkit_names: Mapping[str, Any]) -> Dict[str, int]:
+    ids: Dict[str, int] = {}
+    for name, value in paintkit_names.items():
+        try:
+            ids[name] = int(value)
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def _match_name(
+    name: str, names: Dict[str, Tuple[int, ...]], paintkits: Dict[str, int]
+) -> Optional[_Match]:
+    """Split a price map name into schema defindexes and SKU parts."""
+
+    wear = 0
+    if name.endswith(")"):
+        head, sep, tail = name.rpartition(" (")
+        tier = WEAR_TIERS.get(tail[:-1])
+        if sep and tier:
+            name, wear = head, tier
+    festivized = name.startswith(FESTIVIZED_PREFIX)
+    if festivized:
+        name = name[len(FESTIVIZED_PREFIX) :]
+    defindexes = names.get(name)
+    if defindexes:
+        return defindexes, festivized, wear, 0
+    # Decorated weapons are named "<paintkit> <weapon>".
+    words = name.split(" ")
+    for split in range(1, len(words)):
+        paintkit_id = paintkits.get(" ".join(words[:split]))
+        if paintkit_id is None:
+            continue
+        defindexes = names.get(" ".join(words[split:]))
+        if defindexes:
+            return defindexes, festivized, wear, paintkit_id
+    return None
+
+
+class SkuIndex(Mapping):
+    """Prices by :data:`Sku` with a report of names the join missed.
+
+    With ``decode``, entries hold rows of a
+    :class:`~utils.price_table.CompactPriceMap` instead of price dicts.
+    """
+
+    def __init__(
+        self,
+        entries: Dict[Sku, Any],
+        unmatched: Counter[str] | None = None,
+        matched_names: int = 0,
+        decode: Callable[[Any], Dict[str, Any]] | None = None,
+    ) -> None:
+        self._entries = entries
+        self.unmatched: Counter[str] = unmatched or Counter()
+        self.matched_names = matched_names
+        self._decode = decode
+
+    def __getitem__(self, key: Sku) -> Dict[str, Any]:
+        value = self._entries[key]
+        return value if self._decode is None else self._decode(value)
+
+    def __iter__(self) -> Iterator[Sku]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Sku) -> Dict[str, Any] | None:
+        """Return the price for ``key``, dropping killstreak, effect, festivized.
+
+        Mirrors the name map's fallback chain; wear and paintkit are never
+        dropped because a decorated weapon is not worth the plain one.
+        """
+
+        entries = self._entries
+        info = entries.get(key)
+        if info is None and key[5]:
+            info = entries.get(key[:5] + (0,) + key[6:])
+        if info is None and key[4]:
+            info = entries.get(key[:4] + (0,) + key[5:])
+        if info is None and key[6]:
+            info = entries.get(key[:6] + (False,) + key[7:])
+        if info is None or self._decode is None:
+            return info
+        return self._decode(info)
+
+    def report(self, limit: int = 20) -> Dict[str, Any]:
+        """Return index size and the ``limit`` most common unmatched names."""
+
+        return {
+            "entries": len(self._entries),
+            "matched_names": self.matched_names,
+            "unmatched_names": len(self.unmatched),
+            "unmatched_entries": sum(self.unmatched.values()),
+            "top_unmatched": [
+                {"name": name, "entries": count}
+                for name, count in self.unmatched.most_common(limit)
+            ],
+        }
+
+
+def build_sku_index(
+    price_map: Mapping[Tuple[str, int, bool, bool, int, int], Dict[str, Any]],
+    items_by_defindex: Mapping[int, Any] | None = None,
+    paintkit_names: Mapping[str, Any] | None = None,
+) -> SkuIndex:
+    """Return a :class:`SkuIndex` for ``price_map`` joined to the schema.
+
+    The schema tables default to the active
+    :class:`~utils.schema_snapshot.SchemaSnapshot`.  For a
+    :class:`~utils.price_table.CompactPriceMap` the index stores row numbers
+    rather than a second copy of every price dict.
+    """
+
+    if items_by_defindex is None or paintkit_names is None:
+        schema = schema_snapshot.active()
+        if items_by_defindex is None:
+            items_by_defindex = schema.items_by_defindex
+        if paintkit_names is None:
+            paintkit_names = schema.paintkit_names
+    names = _schema_names(items_by_defindex)
+    paintkits = _paintkit_ids(paintkit_names)
+    matches: Dict[str, Optional[_Match]] = {}
+    entries: Dict[Sku, Any] = {}
+    unmatched: Counter[str] = Counter()
+    if isinstance(price_map, CompactPriceMap):
+        pairs, decode = price_map.rows(), price_map.info
+    else:
+        pairs, decode = price_map.items(), None
+    for key, info in pairs:
+        name, quality, craftable, is_australium, effect_id, ks_tier = key
+        try:
+            match = matches[name]
+        except KeyError:
+            match = matches[name] = _match_name(name, names, paintkits)
+        if match is None:
+            unmatched[name] += 1
+            continue
+        defindexes, festivized, wear, paintkit_id = match
+        for defindex in defindexes:
+            entries.setdefault(
+                (
+                    defindex,
+                    quality,
+                    craftable,
+                    is_australium,
+                    effect_id,
+                    ks_tier,
+                    festivized,
+                    wear,
+                    paintkit_id,
+                ),
+                info,
+            )
+    matched = sum(1 for match in matches.values() if match is not None)
+    return SkuIndex(entries, unmatched, matched, decode)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the SKU join report for the cached price map and schema."""
+
+    from . import local_data
+    from .valuation_service import get_valuation_service
+
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.price_index",
+        description="Report price map names that match no schema item.",
+    )
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    local_data.load_files(auto_refetch=False)
+    index = get_valuation_service().sku_index()
+    report = index.report(args.limit) if index is not None else {}
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+__all__ = [
+    "FESTIVIZED_PREFIX",
+    "Sku",
+    "SkuIndex",
+    "WEAR_TIERS",
+    "build_sku_index",
+    "sku",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
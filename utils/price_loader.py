@@ -5,9 +5,12 @@ import logging
 import os
 from pathlib import Path
 import time
+from typing import Iterator, Mapping
 import asyncio
 
 from .constants import KILLSTREAK_TIERS
+from .price_snapshot import write_snapshot
+from .price_stream import PriceItemStream
 
 import httpx
 import requests
@@ -20,6 +23,14 @@ logger = logging.getLogger(__name__)
 PRICES_FILE = Path("cache/prices.json")
 CURRENCIES_FILE = Path("cache/currencies.json")
 PRICE_MAP_FILE = Path("cache/price_map.json")
+# Binary copy of the price map written by :func:`dump_price_map`.
+PRICE_SNAPSHOT_FILE = Path("cache/price_map.bin")
+# Time of the last full and delta price refresh (see ``fetch_price_delta``).
+PRICE_STATE_FILE = Path("cache/price_state.json")
+# Override to point at a local stand-in (see ``scripts/standin_server.py``).
+BPTF_API_BASE_URL = (
+    os.getenv("BPTF_API_BASE_URL") or "https://backpack.tf/api"
+).rstrip("/")
 
 # ANSI color codes
 COLOR_YELLOW = "\033[33m"
@@ -27,6 +38,8 @@ COLOR_RESET = "\033[0m"
 
 # bytes
 EMPTY_THRESHOLD = 512 * 1024
+# Read and download size for the streamed price dump.
+CHUNK_SIZE = 64 * 1024
 
 
 QUALITY_PREFIXES = (
@@ -82,7 +95,11 @@ def _require_key() -> str:
 
 
 def ensure_prices_cached(refresh: bool = False) -> Path:
-    """Download price dump from backpack.tf if needed and return cache path."""
+    """Download price dump from backpack.tf if needed and return cache path.
+
+    The response is streamed to disk unchanged and its price map is built on
+    the way (see :func:`build_price_map`).
+    """
 
     path = PRICES_FILE
     if path.exists():
@@ -98,20 +115,25 @@ def ensure_prices_cached(refresh: bool = False) -> Path:
     if path.exists() and not refresh:
         return path
 
-    url = f"https://backpack.tf/api/IGetPrices/v4?raw=1&key={_require_key()}"
+    url = f"{BPTF_API_BASE_URL}/IGetPrices/v4?raw=1&key={_require_key()}"
     retries = int(os.getenv("PRICE_RETRIES", "3"))
     delay = int(os.getenv("PRICE_DELAY", "5"))
     last_err: Exception | None = None
 
     for attempt in range(1, retries + 1):
+        download: _PriceDownload | None = None
         try:
-            resp = requests.get(url, timeout=5, headers={"accept": "application/json"})
-            resp.raise_for_status()
-            data = resp.json()
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(json.dumps(data, indent=2))
-            return path
+            with requests.get(
+                url, timeout=5, headers={"accept": "application/json"}, stream=True
+            ) as resp:
+                resp.raise_for_status()
+                download = _PriceDownload(path)
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    download.write(chunk)
+            return download.finish()
         except Exception as exc:  # requests or JSON
+            if download is not None:
+                download.abort()
             last_err = exc
             logger.warning("Failed to fetch prices: %s", exc)
             if attempt < retries:
@@ -145,23 +167,26 @@ async def ensure_prices_cached_async(refresh: bool = False) -> Path:
     if path.exists() and not refresh:
         return path
 
-    url = f"https://backpack.tf/api/IGetPrices/v4?raw=1&key={_require_key()}"
+    url = f"{BPTF_API_BASE_URL}/IGetPrices/v4?raw=1&key={_require_key()}"
     retries = int(os.getenv("PRICE_RETRIES", "3"))
     delay = int(os.getenv("PRICE_DELAY", "5"))
     last_err: Exception | None = None
 
     async with httpx.AsyncClient() as client:
         for attempt in range(1, retries + 1):
+            download: _PriceDownload | None = None
             try:
-                resp = await client.get(
-                    url, timeout=5, headers={"accept": "application/json"}
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                path.parent.mkdir(parents=True, exist_ok=True)
-                path.write_text(json.dumps(data, indent=2))
-                return path
+                async with client.stream(
+                    "GET", url, timeout=5, headers={"accept": "application/json"}
+                ) as resp:
+                    resp.raise_for_status()
+                    download = _PriceDownload(path)
+                    async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                        download.write(chunk)
+                return download.finish()
             except Exception as exc:  # httpx or JSON
+                if download is not None:
+                    download.abort()
                 last_err = exc
                 logger.warning("Failed to fetch prices: %s", exc)
                 if attempt < retries:
@@ -185,7 +210,7 @@ def ensure_currencies_cached(refresh: bool = False) -> Path:
     if path.exists() and not refresh:
         return path
 
-    url = f"https://backpack.tf/api/IGetCurrencies/v1?raw=1&key={_require_key()}"
+    url = f"{BPTF_API_BASE_URL}/IGetCurrencies/v1?raw=1&key={_require_key()}"
     try:
         resp = requests.get(url, timeout=5, headers={"accept": "application/json"})
         resp.raise_for_status()
@@ -208,7 +233,7 @@ async def ensure_currencies_cached_async(refresh: bool = False) -> Path:
     if path.exists() and not refresh:
         return path
 
-    url = f"https://backpack.tf/api/IGetCurrencies/v1?raw=1&key={_require_key()}"
+    url = f"{BPTF_API_BASE_URL}/IGetCurrencies/v1?raw=1&key={_require_key()}"
     async with httpx.AsyncClient() as client:
         try:
             resp = await client.get(
@@ -227,76 +252,162 @@ async def ensure_currencies_cached_async(refresh: bool = False) -> Path:
     return path
 
 
+PriceMap = dict[tuple[str, int, bool, bool, int, int], dict]
+
+
+def _add_item_prices(mapping: PriceMap, name: str, item: dict) -> None:
+    """Add every price of the dump entry ``name`` to ``mapping``."""
+
+    is_australium = str(item.get("australium")) == "1" or name.startswith("Australium ")
+    base_name = (
+        name.replace("Australium ", "") if name.startswith("Australium ") else name
+    )
+    base_name = base_name.replace("\n", " ")
+    base_name, ks_tier = _extract_killstreak(base_name)
+    prices = item.get("prices", {})
+    for quality, qdata in prices.items():
+        try:
+            qid = int(quality)
+        except (TypeError, ValueError):
+            continue
+
+        tradable = qdata.get("Tradable", {})
+        for craft_key in ("Craftable", "Non-Craftable"):
+            craftable = craft_key == "Craftable"
+            entries = tradable.get(craft_key)
+
+            if isinstance(entries, dict):
+                effect_entries = entries
+            else:
+                entry = entries[0] if isinstance(entries, list) else None
+                effect_entries = {0: entry} if isinstance(entry, dict) else {}
+
+            for effect_key, entry in effect_entries.items():
+                if not isinstance(entry, dict):
+                    continue
+
+                value_raw = entry.get("value_raw")
+                currency = entry.get("currency")
+                if value_raw is None or currency is None:
+                    continue
+
+                try:
+                    effect_id = int(effect_key)
+                except (TypeError, ValueError):
+                    effect_id = 0
+
+                mapping[
+                    (base_name, qid, craftable, is_australium, effect_id, ks_tier)
+                ] = {
+                    "value_raw": float(value_raw),
+                    "currency": str(currency),
+                }
+
+
+# Price map built while the dump was downloaded, keyed by the file it was
+# written to; :func:`build_price_map` takes it instead of reparsing the file.
+_PREBUILT: tuple[tuple[Path, int, int], PriceMap] | None = None
+
+
+def _file_key(path: Path) -> tuple[Path, int, int]:
+    stat = path.stat()
+    return path.resolve(), stat.st_mtime_ns, stat.st_size
+
+
+class _PriceDownload:
+    """Write a streamed price dump to disk while building its price map."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.tmp = path.with_suffix(path.suffix + ".part")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.tmp.open("wb")
+        self._stream = PriceItemStream()
+        self.mapping: PriceMap = {}
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        for name, item in self._stream.feed(chunk):
+            _add_item_prices(self.mapping, name, item)
+
+    def finish(self) -> Path:
+        """Validate the dump and move it into place.
+
+        Raises :class:`ValueError` when backpack.tf does not report success;
+        the previous dump is then left in place.
+        """
+
+        global _PREBUILT
+        self._file.close()
+        for name, item in self._stream.close():
+            _add_item_prices(self.mapping, name, item)
+        meta = self._stream.meta
+        if meta.get("success") != 1:
+            raise ValueError(meta.get("message") or "price request failed")
+        os.replace(self.tmp, self.path)
+        _PREBUILT = (_file_key(self.path), self.mapping)
+        return self.path
+
+    def abort(self) -> None:
+        self._file.close()
+        self.tmp.unlink(missing_ok=True)
+
+
 def build_price_map(
     prices_path: Path,
 ) -> dict[tuple[str, int, bool, bool, int, int], dict]:
-    """Return mapping of ``(item_name, quality, craftable, is_australium, effect_id, killstreak_tier)`` -> price info."""
+    """Return mapping of ``(item_name, quality, craftable, is_australium, effect_id, killstreak_tier)`` -> price info.
 
-    with prices_path.open() as f:
-        data = json.load(f)
+    The dump is parsed incrementally, so only one item is held in memory at
+    a time.  A map already built while downloading ``prices_path`` is
+    returned without reading the file again.
+    """
 
-    items = data.get("response", {}).get("items", {})
-    mapping: dict[tuple[str, int, bool, bool, int, int], dict] = {}
+    global _PREBUILT
+    prebuilt, _PREBUILT = _PREBUILT, None
+    if prebuilt is not None and prebuilt[0] == _file_key(prices_path):
+        return prebuilt[1]
 
-    for name, item in items.items():
-        is_australium = str(item.get("australium")) == "1" or name.startswith(
-            "Australium "
-        )
-        base_name = (
-            name.replace("Australium ", "") if name.startswith("Australium ") else name
-        )
-        base_name = base_name.replace("\n", " ")
-        base_name, ks_tier = _extract_killstreak(base_name)
-        prices = item.get("prices", {})
-        for quality, qdata in prices.items():
-            try:
-                qid = int(quality)
-            except (TypeError, ValueError):
-                continue
+    return dict(iter_price_entries(prices_path))
 
-            tradable = qdata.get("Tradable", {})
-            for craft_key in ("Craftable", "Non-Craftable"):
-                craftable = craft_key == "Craftable"
-                entries = tradable.get(craft_key)
-
-                if isinstance(entries, dict):
-                    effect_entries = entries
-                else:
-                    entry = entries[0] if isinstance(entries, list) else None
-                    effect_entries = {0: entry} if isinstance(entry, dict) else {}
-
-                for effect_key, entry in effect_entries.items():
-                    if not isinstance(entry, dict):
-                        continue
-
-                    value_raw = entry.get("value_raw")
-                    currency = entry.get("currency")
-                    if value_raw is None or currency is None:
-                        continue
-
-                    try:
-                        effect_id = int(effect_key)
-                    except (TypeError, ValueError):
-                        effect_id = 0
-
-                    mapping[
-                        (base_name, qid, craftable, is_australium, effect_id, ks_tier)
-                    ] = {
-                        "value_raw": float(value_raw),
-                        "currency": str(currency),
-                    }
-    return mapping
+
+def iter_price_entries(
+    prices_path: Path,
+) -> Iterator[tuple[tuple[str, int, bool, bool, int, int], dict]]:
+    """Yield the price map entries of the dump at ``prices_path``.
+
+    Entries are produced one dump item at a time, so a consumer such as
+    :class:`~utils.price_table.CompactPriceMap` never holds the dict form.
+    """
+
+    stream = PriceItemStream()
+    item_prices: PriceMap = {}
+    with prices_path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            for name, item in stream.feed(chunk):
+                _add_item_prices(item_prices, name, item)
+                yield from item_prices.items()
+                item_prices.clear()
+    for name, item in stream.close():
+        _add_item_prices(item_prices, name, item)
+        yield from item_prices.items()
+        item_prices.clear()
 
 
 def dump_price_map(
     price_map: dict[tuple[str, int, bool, bool, int, int], dict],
     path: Path = PRICE_MAP_FILE,
 ) -> Path:
-    """Serialize ``price_map`` to ``path``."""
+    """Serialize ``price_map`` to ``path``.
+
+    A binary snapshot (see :mod:`utils.price_snapshot`) is written alongside
+    with a ``.bin`` suffix.
+    """
 
     data = [[list(key), value] for key, value in price_map.items()]
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(data))
+    write_snapshot(price_map, path.with_suffix(".bin"))
     return path
 
 
@@ -324,3 +435,108 @@ def load_price_map(
                 )
             ] = value
     return mapping
+
+
+# Delta refreshes -------------------------------------------------------------
+#
+# ``IGetPrices`` accepts ``since=<unix time>`` and then returns only the items
+# with prices updated after it.  The result is merged into an existing map;
+# prices removed upstream are only dropped by the next full refresh.
+
+
+def _price_delta_url(since: int) -> str:
+    return (
+        f"{BPTF_API_BASE_URL}/IGetPrices/v4?raw=1&since={int(since)}"
+        f"&key={_require_key()}"
+    )
+
+
+class _PriceDelta:
+    """Collect a streamed delta response into a partial price map."""
+
+    def __init__(self) -> None:
+        self._stream = PriceItemStream()
+        self.mapping: PriceMap = {}
+
+    def write(self, chunk: bytes) -> None:
+        for name, item in self._stream.feed(chunk):
+            _add_item_prices(self.mapping, name, item)
+
+    def finish(self) -> tuple[PriceMap, int | None]:
+        for name, item in self._stream.close():
+            _add_item_prices(self.mapping, name, item)
+        meta = self._stream.meta
+        if meta.get("success") != 1:
+            raise ValueError(meta.get("message") or "price delta request failed")
+        current_time = meta.get("current_time")
+        return self.mapping, int(current_time) if current_time else None
+
+
+def fetch_price_delta(since: int) -> tuple[PriceMap, int | None]:
+    """Return prices updated after ``since`` and the server's current time.
+
+    Raises on network errors and when backpack.tf does not report success.
+    """
+
+    delta = _PriceDelta()
+    with requests.get(
+        _price_delta_url(since),
+        timeout=30,
+        headers={"accept": "application/json"},
+        stream=True,
+    ) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            delta.write(chunk)
+    return delta.finish()
+
+
+async def fetch_price_delta_async(since: int) -> tuple[PriceMap, int | None]:
+    """Async version of :func:`fetch_price_delta`."""
+
+    delta = _PriceDelta()
+    async with httpx.AsyncClient() as client:
+        async with client.stream(
+            "GET",
+            _price_delta_url(since),
+            timeout=30,
+            headers={"accept": "application/json"},
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                delta.write(chunk)
+    return delta.finish()
+
+
+def merge_price_map(
+    base: Mapping[tuple[str, int, bool, bool, int, int], dict], delta: PriceMap
+) -> tuple[PriceMap, int]:
+    """Return ``base`` updated with ``delta`` and the number of changed entries."""
+
+    merged = dict(base)
+    changed = 0
+    for key, info in delta.items():
+        if merged.get(key) != info:
+            merged[key] = info
+            changed += 1
+    return merged, changed
+
+
+def load_price_state(path: Path | None = None) -> dict:
+    """Return the delta bookkeeping saved by :func:`save_price_state`."""
+
+    path = path or PRICE_STATE_FILE
+    try:
+        with path.open() as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_price_state(state: dict, path: Path | None = None) -> None:
+    path = path or PRICE_STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
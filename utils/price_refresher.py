@@ -0,0 +1,350 @@
+"""Background refresh of backpack.tf prices without restarting the app.
+
+:class:`PriceRefresher` runs inside the Hypercorn process started by
+``run.py`` (disable with ``PRICE_REFRESH_INTERVAL=0``).  Every interval it
+downloads the price dump and currency rates.  The new price map is built in
+a worker thread so the event loop keeps serving, and the result is published
+with :func:`~utils.valuation_service.swap_valuation_service`.  Scans already
+running finish against the previous service, and later scans see the new
+prices and currencies together.
+
+Between full downloads only the items updated since the previous refresh are
+fetched (``IGetPrices`` ``since``) and merged into the current map.  A full
+refresh runs every ``PRICE_FULL_REFRESH_INTERVAL`` seconds, after a failed
+delta, and whenever the saved map on disk is not the one the last refresh
+wrote.
+
+Every published refresh is appended to the local price history
+(:mod:`utils.price_history`): the whole map after a full download, only the
+delta otherwise.  History rows are written only for prices that changed.
+
+Callbacks in :attr:`PriceRefresher.listeners` are awaited after each
+published generation; ``run.py`` registers one that reprices stored scans
+and pushes the refreshed cards to open pages.
+
+The current generation and its age are reported by
+:func:`~utils.valuation_service.price_status` (``GET /api/prices``) and
+stamped on stored scans as ``price_generation``, so cached results priced by
+an older generation can be told apart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from . import price_loader
+from .price_history import get_price_history
+from .valuation_service import (
+    ValuationService,
+    get_valuation_service,
+    price_status,
+    swap_valuation_service,
+)
+
+DEFAULT_INTERVAL = 3600.0
+MIN_INTERVAL = 300.0
+DEFAULT_FULL_INTERVAL = 24 * 3600.0
+# Deltas start this long before the previous refresh so no update falls in
+# the gap between the server's clock and ours.
+DELTA_OVERLAP = 300
+# A full download with fewer entries than this share of the current map is
+# treated as a broken dump and not published.
+MIN_SIZE_RATIO = 0.5
+
+logger = logging.getLogger(__name__)
+
+Stamp = Optional[Tuple[int, int]]
+
+
+def _stamp(path: Path) -> Stamp:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def refresh_interval() -> float:
+    """Return ``PRICE_REFRESH_INTERVAL`` in seconds; ``0`` disables refreshes."""
+
+    try:
+        interval = float(os.getenv("PRICE_REFRESH_INTERVAL", DEFAULT_INTERVAL))
+    except ValueError:
+        interval = DEFAULT_INTERVAL
+    return 0.0 if interval <= 0 else max(interval, MIN_INTERVAL)
+
+
+def full_refresh_interval() -> float:
+    """Return ``PRICE_FULL_REFRESH_INTERVAL`` in seconds."""
+
+    try:
+        return float(os.getenv("PRICE_FULL_REFRESH_INTERVAL", DEFAULT_FULL_INTERVAL))
+    except ValueError:
+        return DEFAULT_FULL_INTERVAL
+
+
+def _load_currencies(path: Path) -> Dict[str, Any] | None:
+    try:
+        with path.open() as f:
+            return json.load(f)["response"]["currencies"]
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Keeping current currencies: %s", exc)
+        return None
+
+
+def build_service(
+    prices_path: Path, currencies_path: Path, min_entries: int = 1
+) -> ValuationService:
+    """Return a :class:`ValuationService` for freshly downloaded files.
+
+    The price map and its binary snapshot are saved so the next start loads
+    them directly, and the SKU index is built before the service is swapped
+    in.  Raises :class:`ValueError`, before saving anything, when the map has
+    fewer than ``min_entries`` entries.
+    """
+
+    price_map = price_loader.build_price_map(prices_path)
+    if len(price_map) < min_entries:
+        raise ValueError(
+            f"price dump has {len(price_map)} entries, expected at least "
+            f"{min_entries}; previous prices kept"
+        )
+    price_loader.dump_price_map(price_map, price_loader.PRICE_MAP_FILE)
+    service = ValuationService(
+        price_map=price_map, currencies=_load_currencies(currencies_path)
+    )
+    service.sku_index()
+    return service
+
+
+def build_merged_service(
+    base: Mapping[Any, Dict[str, Any]],
+    delta: Dict[Any, Dict[str, Any]],
+    currencies_path: Path,
+) -> Tuple[ValuationService, int]:
+    """Return a service for ``base`` updated with ``delta`` and the change count."""
+
+    price_map, changed = price_loader.merge_price_map(base, delta)
+    price_loader.dump_price_map(price_map, price_loader.PRICE_MAP_FILE)
+    service = ValuationService(
+        price_map=price_map, currencies=_load_currencies(currencies_path)
+    )
+    service.sku_index()
+    return service, changed
+
+
+def record_history(
+    entries: Mapping[Any, Dict[str, Any]] | Iterable[Tuple[Any, Dict[str, Any]]],
+    currencies: Mapping[str, Any] | None,
+) -> int:
+    """Append ``entries`` to the price history; return the rows written.
+
+    Months past the raw retention window are downsampled afterwards.  Errors
+    are logged, never raised: history must not fail a refresh.
+    """
+
+    history = get_price_history()
+    try:
+        rows = history.record(entries, currencies)
+        history.downsample()
+    except Exception as exc:
+        logger.warning("Could not record price history: %s", exc)
+        return 0
+    return rows
+
+
+def _map_stamp() -> Stamp:
+    return _stamp(price_loader.PRICE_MAP_FILE.with_suffix(".bin"))
+
+
+class PriceRefresher:
+    """Periodically fetch prices and swap in a new valuation service."""
+
+    def __init__(
+        self, interval: float | None = None, full_interval: float | None = None
+    ) -> None:
+        self.interval = refresh_interval() if interval is None else interval
+        self.full_interval = (
+            full_refresh_interval() if full_interval is None else full_interval
+        )
+        self.last_refresh: float | None = None
+        self.last_error: str | None = None
+        self.last_mode: str | None = None
+        self.last_changed: int | None = None
+        self.next_refresh: float | None = None
+        self.listeners: List[Callable[[], Awaitable[Any]]] = []
+        self._stamps = self._current_stamps()
+
+    @staticmethod
+    def _current_stamps() -> Tuple[Stamp, Stamp]:
+        return (
+            _stamp(price_loader.PRICES_FILE),
+            _stamp(price_loader.CURRENCIES_FILE),
+        )
+
+    def _can_delta(self, state: Dict[str, Any], now: float) -> bool:
+        """Return whether the in-memory map can be updated with a delta."""
+
+        stamp = _map_stamp()
+        return (
+            bool(state.get("since"))
+            and now - state.get("full_at", 0) < self.full_interval
+            and stamp is not None
+            and state.get("map") == list(stamp)
+        )
+
+    async def refresh(self, *, full: bool = False) -> bool:
+        """Fetch prices once; return whether a new generation was published.
+
+        With ``full=True`` the whole dump is downloaded; by default a delta is
+        tried when the saved state allows it.  A failed delta falls back to a
+        full download.  Nothing is swapped when a full download failed and the
+        previous cache was kept or its map was rejected by
+        :func:`build_service`.
+        """
+
+        started = time.time()
+        state = price_loader.load_price_state()
+        full = full or not self._can_delta(state, started)
+        try:
+            if full:
+                published = await self._refresh_full()
+                state = {"full_at": started, "since": int(started) - DELTA_OVERLAP}
+            else:
+                since = await self._refresh_delta(state, started)
+                state = {**state, "since": since}
+                published = True
+        except Exception as exc:  # keep the refresher alive
+            logger.warning(
+                "Price refresh (%s) failed: %s", "full" if full else "delta", exc
+            )
+            self.last_error = str(exc)
+            if full:
+                return False
+            return await self.refresh(full=True)
+        if not published:
+            return False
+        state["map"] = list(_map_stamp() or ())
+        try:
+            price_loader.save_price_state(state)
+        except OSError as exc:
+            logger.warning("Could not save price refresh state: %s", exc)
+        self.last_mode = "full" if full else "delta"
+        self.last_refresh = time.time()
+        self.last_error = None
+        service = get_valuation_service()
+        logger.info(
+            "Price generation %d loaded by %s refresh (%d entries, %s changed)",
+            service.generation,
+            self.last_mode,
+            len(service.price_map),
+            self.last_changed,
+        )
+        for listener in self.listeners:
+            try:
+                await listener()
+            except Exception as exc:  # a listener must not stop refreshes
+                logger.warning("Price refresh listener failed: %s", exc)
+        return True
+
+    async def _refresh_full(self) -> bool:
+        prices_path, currencies_path = await asyncio.gather(
+            price_loader.ensure_prices_cached_async(refresh=True),
+            price_loader.ensure_currencies_cached_async(refresh=True),
+        )
+        stamps = (_stamp(prices_path), _stamp(currencies_path))
+        if stamps == self._stamps:
+            self.last_error = "download failed, previous prices kept"
+            return False
+        # 0 while no service is loaded; loading one here could download.
+        current = price_status()["entries"]
+        min_entries = max(1, int(current * MIN_SIZE_RATIO))
+        service = await asyncio.to_thread(
+            build_service, prices_path, currencies_path, min_entries
+        )
+        swap_valuation_service(service)
+        self._stamps = stamps
+        self.last_changed = len(service.price_map)
+        await asyncio.to_thread(record_history, service.price_map, service.currencies)
+        return True
+
+    async def _refresh_delta(self, state: Dict[str, Any], started: float) -> int:
+        """Merge updates since ``state["since"]``; return the next ``since``."""
+
+        (delta, server_time), currencies_path = await asyncio.gather(
+            price_loader.fetch_price_delta_async(state["since"]),
+            price_loader.ensure_currencies_cached_async(refresh=True),
+        )
+        base = get_valuation_service().price_map
+        service, changed = await asyncio.to_thread(
+            build_merged_service, base, delta, currencies_path
+        )
+        swap_valuation_service(service)
+        self.last_changed = changed
+        await asyncio.to_thread(record_history, delta, service.currencies)
+        return int(server_time or started) - DELTA_OVERLAP
+
+    async def run(self) -> None:
+        """Refresh every ``interval`` seconds until cancelled."""
+
+        while True:
+            self.next_refresh = time.time() + self.interval
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "interval_s": self.interval,
+            "full_interval_s": self.full_interval,
+            "last_refresh": self.last_refresh,
+            "last_mode": self.last_mode,
+            "last_changed": self.last_changed,
+            "next_refresh": self.next_refresh,
+            "last_error": self.last_error,
+        }
+
+
+_default_refresher: PriceRefresher | None = None
+
+
+def get_price_refresher() -> PriceRefresher:
+    """Return singleton :class:`PriceRefresher` instance."""
+
+    global _default_refresher
+    if _default_refresher is None:
+        _default_refresher = PriceRefresher()
+    return _default_refresher
+
+
+def refresher_enabled() -> bool:
+    """Return whether ``run.py`` should start the price refresher."""
+
+    return refresh_interval() > 0
+
+
+__all__ = [
+    "PriceRefresher",
+    "build_merged_service",
+    "build_service",
+    "full_refresh_interval",
+    "get_price_refresher",
+    "record_history",
+    "refresh_interval",
+    "refresher_enabled",
+]
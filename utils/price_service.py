@@ -5,20 +5,23 @@ from typing import Any, Dict
 from . import local_data
 
 
-def format_price(value_raw: float, currencies: Dict[str, Any]) -> str:
-    """Return a refined metal value formatted in keys and refined metal."""
+def key_price(currencies: Dict[str, Any]) -> float:
+    """Return the key price in refined metal, or ``0.0`` when unknown."""
+
+    try:
+        return float(currencies["keys"]["price"]["value_raw"])
+    except Exception:  # pragma: no cover - defensive
+        return 0.0
+
+
+def format_refined(value_raw: float, key_price: float) -> str:
+    """Return ``value_raw`` formatted in keys and refined for ``key_price``."""
 
     try:
         value = float(value_raw)
     except (TypeError, ValueError):
         return ""
 
-    key_price = 0.0
-    try:
-        key_price = float(currencies["keys"]["price"]["value_raw"])
-    except Exception:  # pragma: no cover - defensive
-        pass
-
     keys = int(value // key_price) if key_price > 0 else 0
     refined = value - keys * key_price if key_price > 0 else value
 
@@ -31,6 +34,12 @@ def format_price(value_raw: float, currencies: Dict[str, Any]) -> str:
     return " ".join(parts)
 
 
+def format_price(value_raw: float, currencies: Dict[str, Any]) -> str:
+    """Return a refined metal value formatted in keys and refined metal."""
+
+    return format_refined(value_raw, key_price(currencies))
+
+
 def convert_price_to_keys_ref(
     value_raw: float, currency: str, currencies: Dict[str, Any]
 ) -> str:
@@ -0,0 +1,257 @@
+"""Memory-mapped binary snapshot of the price map.
+
+``price_map.json`` holds tens of thousands of ``[key, value]`` pairs, and
+every process that loads it casts each key back into a tuple.  The
+snapshot written by :func:`write_snapshot` stores the same map in a form
+that can be queried in place.  :class:`PriceSnapshot` maps the file
+read-only, so opening it only reads the header, and all workers share one
+copy in the page cache.
+
+Layout (little endian)::
+
+    header    magic, version, name/record/currency counts
+    u32[]     name offsets into the name blob (names + 1)
+    u32[]     first record of each name (names + 1)
+    u32[]     currency offsets into the currency blob (currencies + 1)
+    bytes     name blob: UTF-8 names sorted bytewise
+    bytes     currency blob
+    records   quality u16, flags u8, killstreak u8, effect i32,
+              value_raw f64, currency u16, sorted per name
+
+A lookup binary-searches the name, then the records of that name.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+PriceKey = Tuple[str, int, bool, bool, int, int]
+
+MAGIC = b"TF2PRMAP"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+_U32 = struct.Struct("<I")
+# quality, flags (craftable | australium << 1), killstreak tier, effect id
+_RECORD_KEY = struct.Struct("<HBBi")
+_RECORD = struct.Struct("<HBBidH")
+# Name lookups remembered per snapshot before the memo is reset.
+NAME_CACHE_SIZE = 16384
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is missing, truncated or of another version."""
+
+
+def _flags(craftable: bool, is_australium: bool) -> int:
+    return int(bool(craftable)) | int(bool(is_australium)) << 1
+
+
+def write_snapshot(price_map: Mapping[PriceKey, Dict[str, Any]], path: Path) -> Path:
+    """Write ``price_map`` to ``path`` in the snapshot format.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    never map a half-written snapshot.
+    """
+
+    by_name: Dict[bytes, list] = {}
+    currencies: Dict[str, int] = {}
+    for key, info in price_map.items():
+        name, quality, craftable, is_australium, effect_id, ks_tier = key
+        try:
+            value = float(info["value_raw"])
+            currency = str(info["currency"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        currency_id = currencies.setdefault(currency, len(currencies))
+        by_name.setdefault(str(name).encode("utf-8"), []).append(
+            (
+                int(quality),
+                _flags(craftable, is_australium),
+                int(ks_tier),
+                int(effect_id),
+                value,
+                currency_id,
+            )
+        )
+
+    names = sorted(by_name)
+    name_offsets = [0]
+    record_starts = [0]
+    records = bytearray()
+    for name in names:
+        name_offsets.append(name_offsets[-1] + len(name))
+        for record in sorted(by_name[name]):
+            records += _RECORD.pack(*record)
+        record_starts.append(record_starts[-1] + len(by_name[name]))
+    currency_blobs = [c.encode("utf-8") for c in currencies]
+    currency_offsets = [0]
+    for blob in currency_blobs:
+        currency_offsets.append(currency_offsets[-1] + len(blob))
+
+    u32s = name_offsets + record_starts + currency_offsets
+    out = bytearray(
+        _HEADER.pack(MAGIC, VERSION, len(names), record_starts[-1], len(currencies))
+    )
+    out += struct.pack(f"<{len(u32s)}I", *u32s)
+    out += b"".join(names)
+    out += b"".join(currency_blobs)
+    out += records
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(bytes(out))
+    os.replace(tmp, path)
+    return path
+
+
+class PriceSnapshot(Mapping):
+    """Read-only ``price_map`` backed by a memory-mapped snapshot file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        try:
+            with self.path.open("rb") as handle:
+                self._mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise SnapshotError(f"Cannot map {self.path}: {exc}") from exc
+        if len(self._mm) < _HEADER.size:
+            raise SnapshotError(f"Truncated price snapshot {self.path}")
+        magic, version, names, records, currencies = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"Unsupported price snapshot {self.path}")
+        self._names = names
+        self._records = records
+        self._name_offsets = _HEADER.size
+        self._record_starts = self._name_offsets + (names + 1) * 4
+        currency_offsets = self._record_starts + (names + 1) * 4
+        self._name_blob = currency_offsets + (currencies + 1) * 4
+        blob_len = self._u32(self._name_offsets, names)
+        currency_blob = self._name_blob + blob_len
+        self._currencies = tuple(
+            self._mm[
+                currency_blob
+                + self._u32(currency_offsets, i) : currency_blob
+                + self._u32(currency_offsets, i + 1)
+            ].decode("utf-8")
+            for i in range(currencies)
+        )
+        self._record_base = currency_blob + self._u32(currency_offsets, currencies)
+        if len(self._mm) < self._record_base + records * _RECORD.size:
+            raise SnapshotError(f"Truncated price snapshot {self.path}")
+        # A plain dict: caching the bound method would make a reference
+        # cycle and keep a swapped-out snapshot mapped until the next gc.
+        self._name_cache: Dict[str, int] = {}
+
+    def _u32(self, base: int, index: int) -> int:
+        return _U32.unpack_from(self._mm, base + index * 4)[0]
+
+    def _name_at(self, index: int) -> bytes:
+        start = self._u32(self._name_offsets, index)
+        end = self._u32(self._name_offsets, index + 1)
+        return self._mm[self._name_blob + start : self._name_blob + end]
+
+    def _name_index(self, name: str) -> int:
+        index = self._name_cache.get(name)
+        if index is None:
+            if len(self._name_cache) >= NAME_CACHE_SIZE:
+                self._name_cache.clear()
+            index = self._name_cache[name] = self._find_name(name)
+        return index
+
+    def _find_name(self, name: str) -> int:
+        target = name.encode("utf-8")
+        lo, hi = 0, self._names
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._names and self._name_at(lo) == target:
+            return lo
+        return -1
+
+    def get(self, key: PriceKey, default: Any = None) -> Any:
+        try:
+            name, quality, craftable, is_australium, effect_id, ks_tier = key
+            index = self._name_index(name)
+            wanted = (
+                int(quality),
+                _flags(craftable, is_australium),
+                int(ks_tier),
+                int(effect_id),
+            )
+        except (TypeError, ValueError):
+            return default
+        if index < 0:
+            return default
+        lo = self._u32(self._record_starts, index)
+        hi = self._u32(self._record_starts, index + 1)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found = _RECORD_KEY.unpack_from(
+                self._mm, self._record_base + mid * _RECORD.size
+            )
+            if found < wanted:
+                lo = mid + 1
+            elif found > wanted:
+                hi = mid
+            else:
+                record = _RECORD.unpack_from(
+                    self._mm, self._record_base + mid * _RECORD.size
+                )
+                return {
+                    "value_raw": record[4],
+                    "currency": self._currencies[record[5]],
+                }
+        return default
+
+    def __getitem__(self, key: PriceKey) -> Dict[str, Any]:
+        info = self.get(key)
+        if info is None:
+            raise KeyError(key)
+        return info
+
+    def __iter__(self) -> Iterator[PriceKey]:
+        for index in range(self._names):
+            name = self._name_at(index).decode("utf-8")
+            start = self._u32(self._record_starts, index)
+            end = self._u32(self._record_starts, index + 1)
+            for pos in range(start, end):
+                quality, flags, ks_tier, effect_id = _RECORD_KEY.unpack_from(
+                    self._mm, self._record_base + pos * _RECORD.size
+                )
+                yield (
+                    name,
+                    quality,
+                    bool(flags & 1),
+                    bool(flags & 2),
+                    effect_id,
+                    ks_tier,
+                )
+
+    def __len__(self) -> int:
+        return self._records
+
+    def close(self) -> None:
+        self._name_cache.clear()
+        self._mm.close()
+
+
+def load_snapshot(path: Path) -> PriceSnapshot:
+    """Return a :class:`PriceSnapshot` for ``path``."""
+
+    return PriceSnapshot(path)
+
+
+__all__ = [
+    "PriceSnapshot",
+    "SnapshotError",
+    "load_snapshot",
+    "write_snapshot",
+]
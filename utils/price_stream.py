@@ -0,0 +1,162 @@
+"""Incremental parser for the backpack.tf ``IGetPrices`` dump.
+
+The dump is one JSON document of the form
+``{"response": {..., "items": {name: item, ...}}}`` and is several
+megabytes large.  :class:`PriceItemStream` is fed raw bytes as they arrive
+and yields ``(name, item)`` pairs from ``response.items`` as soon as each
+item is complete.  Memory use stays bounded by the largest single item
+rather than the whole document.  Other members of ``response`` (``success``,
+``current_time``, ``message``) are kept in :attr:`PriceItemStream.meta`, and
+anything else is decoded and dropped.
+
+Example::
+
+    stream = PriceItemStream()
+    for chunk in response.iter_content(CHUNK_SIZE):
+        for name, item in stream.feed(chunk):
+            ...
+    stream.close()  # raises ``ValueError`` on a truncated document
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterator, Tuple
+
+ITEMS_PATH = ("response", "items")
+_WS = re.compile(r"[ \t\n\r]*")
+_AFTER = frozenset(" \t\n\r,:]}")
+# Consumed text is dropped from the buffer once it grows past this size.
+_COMPACT_AT = 1 << 16
+
+
+class PriceItemStream:
+    """Push parser yielding the members of ``response.items``."""
+
+    def __init__(self, path: Tuple[str, ...] = ITEMS_PATH) -> None:
+        self._path = path
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # Open objects; all but items' own values lie on ``path``.
+        self._depth = 0
+        self._state = "start"
+        self._key: str | None = None
+        self.meta: Dict[str, Any] = {}
+        self.items = 0
+        self.bytes = 0
+
+    @property
+    def done(self) -> bool:
+        return self._state == "end"
+
+    def feed(self, data: bytes) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Consume ``data`` and yield every item completed by it."""
+
+        self.bytes += len(data)
+        self._buf += self._text.decode(data)
+        yield from self._parse(final=False)
+
+    def close(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Finish the document, yielding any remaining items.
+
+        Raises ``ValueError`` if the document is incomplete or malformed.
+        """
+
+        self._buf += self._text.decode(b"", final=True)
+        yield from self._parse(final=True)
+        self._skip_ws()
+        if self._state != "end" or self._pos != len(self._buf):
+            raise ValueError("Incomplete or malformed price dump")
+
+    def _skip_ws(self) -> None:
+        self._pos = _WS.match(self._buf, self._pos).end()
+
+    def _value(self, final: bool) -> Tuple[bool, Any]:
+        """Decode the value at the cursor; ``(False, None)`` if incomplete."""
+
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        # A number cut by the chunk boundary ("0." of "0.05") decodes to a
+        # prefix; only accept values followed by a delimiter.
+        if not final and (end == len(self._buf) or self._buf[end] not in _AFTER):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self, final: bool) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        while self._state != "end":
+            self._skip_ws()
+            if self._pos >= len(self._buf):
+                break
+            char = self._buf[self._pos]
+            state = self._state
+            if state == "start":
+                if char != "{":
+                    raise ValueError("Price dump is not a JSON object")
+                self._pos += 1
+                self._depth = 1
+                self._state = "key"
+            elif state == "key":
+                if char == "}":
+                    self._pos += 1
+                    self._close_object()
+                    continue
+                ok, key = self._value(final)
+                if not ok:
+                    break
+                if not isinstance(key, str):
+                    raise ValueError("Expected an object key in price dump")
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                if char != ":":
+                    raise ValueError("Expected ':' in price dump")
+                self._pos += 1
+                self._state = "value"
+            elif state == "value":
+                depth = self._depth
+                if (
+                    char == "{"
+                    and depth <= len(self._path)
+                    and self._key == self._path[depth - 1]
+                ):
+                    self._pos += 1
+                    self._depth += 1
+                    self._state = "key"
+                    continue
+                ok, value = self._value(final)
+                if not ok:
+                    break
+                if depth == len(self._path) + 1 and isinstance(value, dict):
+                    self.items += 1
+                    yield self._key, value
+                elif depth == len(self._path):
+                    self.meta[self._key] = value
+                self._state = "next"
+            elif state == "next":
+                if char == ",":
+                    self._pos += 1
+                    self._state = "key"
+                elif char == "}":
+                    self._pos += 1
+                    self._close_object()
+                else:
+                    raise ValueError("Expected ',' or '}' in price dump")
+            if self._pos > _COMPACT_AT:
+                self._buf = self._buf[self._pos :]
+                self._pos = 0
+
+    def _close_object(self) -> None:
+        self._depth -= 1
+        self._state = "next" if self._depth else "end"
+
+
+__all__ = ["ITEMS_PATH", "PriceItemStream"]
@@ -0,0 +1,238 @@
+"""Compact in-memory price map.
+
+A price map built from the dump is a dict with one ``(name, quality,
+craftable, australium, effect, killstreak)`` tuple key and one
+``{"value_raw", "currency"}`` dict per entry.  That is several hundred bytes
+of Python objects for a 12 byte price.  :class:`CompactPriceMap` holds the
+same entries in a few flat arrays:
+
+* names are interned once and numbered in sorted order;
+* each name owns a contiguous run of the ``codes``, ``values`` and
+  ``currencies`` arrays, with the variant packed into one 64-bit code;
+* currencies are numbered, so a price is a ``float`` and a small ``int``.
+
+A lookup is one dict probe for the name and a bisection of that name's
+run.  :meth:`CompactPriceMap.resolve` applies the killstreak and effect
+fallbacks of :meth:`~utils.valuation_service.ValuationService.get_price_info`
+within the same run.  Price dicts are created on lookup.
+``python -m scripts.price_memory`` compares the RSS of both forms.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+PriceKey = Tuple[str, int, bool, bool, int, int]
+
+# Variant code: quality (16 bits) | flags (2) | killstreak tier (6) | effect (32).
+_QUALITY_SHIFT = 40
+_FLAGS_SHIFT = 38
+_KS_SHIFT = 32
+_EFFECT_MASK = 0xFFFFFFFF
+_KS_MASK = 0x3F
+
+
+def _code(
+    quality: int, craftable: bool, is_australium: bool, effect_id: int, ks_tier: int
+) -> int | None:
+    """Return the packed variant code, or ``None`` if a field is out of range."""
+
+    try:
+        quality, effect_id, ks_tier = int(quality), int(effect_id), int(ks_tier)
+    except (TypeError, ValueError):
+        return None
+    if not (0 <= quality <= 0xFFFF and 0 <= ks_tier <= _KS_MASK):
+        return None
+    if not -(1 << 31) <= effect_id < 1 << 31:
+        return None
+    flags = int(bool(craftable)) | int(bool(is_australium)) << 1
+    return (
+        quality << _QUALITY_SHIFT
+        | flags << _FLAGS_SHIFT
+        | ks_tier << _KS_SHIFT
+        | effect_id & _EFFECT_MASK
+    )
+
+
+def _key_fields(code: int) -> Tuple[int, bool, bool, int, int]:
+    effect_id = code & _EFFECT_MASK
+    if effect_id >= 1 << 31:
+        effect_id -= 1 << 32
+    flags = code >> _FLAGS_SHIFT & 0b11
+    return (
+        code >> _QUALITY_SHIFT,
+        bool(flags & 1),
+        bool(flags & 2),
+        effect_id,
+        code >> _KS_SHIFT & _KS_MASK,
+    )
+
+
+class CompactPriceMap(Mapping):
+    """Read-only price map backed by interned names and typed arrays."""
+
+    def __init__(
+        self,
+        entries: (
+            Mapping[PriceKey, Dict[str, Any]]
+            | Iterable[Tuple[PriceKey, Dict[str, Any]]]
+        ),
+    ) -> None:
+        """Build from a price map or an iterable of its ``(key, info)`` items.
+
+        Passing :func:`~utils.price_loader.iter_price_entries` builds the
+        arrays without ever holding the dict form.  A key repeated in the
+        iterable keeps its last price, as a dict would.
+        """
+
+        if isinstance(entries, Mapping):
+            entries = entries.items()
+        names: Dict[str, int] = {}
+        currencies: Dict[str, int] = {}
+        name_ids = array("I")
+        codes = array("Q")
+        values = array("d")
+        currency_ids = array("H")
+        for key, info in entries:
+            name, quality, craftable, is_australium, effect_id, ks_tier = key
+            code = _code(quality, craftable, is_australium, effect_id, ks_tier)
+            if code is None:
+                continue
+            try:
+                value = float(info["value_raw"])
+                currency = str(info["currency"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            name_ids.append(names.setdefault(sys.intern(name), len(names)))
+            codes.append(code)
+            values.append(value)
+            currency_ids.append(currencies.setdefault(currency, len(currencies)))
+
+        # Renumber names in sorted order and lay each name's variants out
+        # contiguously, sorted by code.  The sort is stable, so the last of
+        # several rows with one key comes last in its run and is kept.
+        self._name_list: List[str] = sorted(names)
+        rank = array("I", bytes(4 * len(names)))
+        for new_id, name in enumerate(self._name_list):
+            rank[names[name]] = new_id
+        self._names: Dict[str, int] = {
+            name: new_id for new_id, name in enumerate(self._name_list)
+        }
+        order = sorted(range(len(codes)), key=lambda i: (rank[name_ids[i]], codes[i]))
+        self._starts = array("I", bytes(4 * (len(names) + 1)))
+        self._codes = array("Q")
+        self._values = array("d")
+        self._currency_ids = array("H")
+        self._currencies = list(currencies)
+        for pos, i in enumerate(order):
+            name_id, code = rank[name_ids[i]], codes[i]
+            if pos + 1 < len(order):
+                j = order[pos + 1]
+                if rank[name_ids[j]] == name_id and codes[j] == code:
+                    continue
+            self._codes.append(code)
+            self._values.append(values[i])
+            self._currency_ids.append(currency_ids[i])
+            self._starts[name_id + 1] = len(self._codes)
+
+    def _row(self, name_id: int, code: int | None) -> int:
+        """Return the row of ``code`` among ``name_id``'s variants, or ``-1``."""
+
+        if code is None:
+            return -1
+        hi = self._starts[name_id + 1]
+        row = bisect_left(self._codes, code, self._starts[name_id], hi)
+        return row if row < hi and self._codes[row] == code else -1
+
+    def info(self, row: int) -> Dict[str, Any]:
+        """Return the price dict stored at ``row``."""
+
+        return {
+            "value_raw": self._values[row],
+            "currency": self._currencies[self._currency_ids[row]],
+        }
+
+    def row(self, key: PriceKey) -> int:
+        """Return the row holding ``key``, or ``-1``."""
+
+        name, quality, craftable, is_australium, effect_id, ks_tier = key
+        name_id = self._names.get(name)
+        if name_id is None:
+            return -1
+        return self._row(
+            name_id, _code(quality, craftable, is_australium, effect_id, ks_tier)
+        )
+
+    def resolve(self, key: PriceKey) -> Dict[str, Any] | None:
+        """Return the price for ``key``, dropping killstreak, then effect.
+
+        The name is looked up once; each fallback is a bisection of its run.
+        """
+
+        name, quality, craftable, is_australium, effect_id, ks_tier = key
+        name_id = self._names.get(name)
+        if name_id is None:
+            return None
+        row = self._row(
+            name_id, _code(quality, craftable, is_australium, effect_id, ks_tier)
+        )
+        if row < 0 and ks_tier:
+            row = self._row(
+                name_id, _code(quality, craftable, is_australium, effect_id, 0)
+            )
+        if row < 0 and effect_id:
+            row = self._row(
+                name_id, _code(quality, craftable, is_australium, 0, ks_tier)
+            )
+        return self.info(row) if row >= 0 else None
+
+    def get(self, key: PriceKey, default: Any = None) -> Any:
+        row = self.row(key)
+        return self.info(row) if row >= 0 else default
+
+    def __getitem__(self, key: PriceKey) -> Dict[str, Any]:
+        info = self.get(key)
+        if info is None:
+            raise KeyError(key)
+        return info
+
+    def rows(self) -> Iterator[Tuple[PriceKey, int]]:
+        """Yield ``(key, row)`` for every entry."""
+
+        codes = self._codes
+        starts = self._starts
+        for name_id, name in enumerate(self._name_list):
+            for row in range(starts[name_id], starts[name_id + 1]):
+                quality, craftable, is_australium, effect_id, ks_tier = _key_fields(
+                    codes[row]
+                )
+                yield (
+                    name,
+                    quality,
+                    craftable,
+                    is_australium,
+                    effect_id,
+                    ks_tier,
+                ), row
+
+    def __iter__(self) -> Iterator[PriceKey]:
+        for key, _row in self.rows():
+            yield key
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def nbytes(self) -> int:
+        """Return the size of the arrays, excluding the name table."""
+
+        return sum(
+            arr.itemsize * len(arr)
+            for arr in (self._starts, self._codes, self._values, self._currency_ids)
+        )
+
+
+__all__ = ["CompactPriceMap"]
@@ -0,0 +1,220 @@
+"""Reprice stored scans against the current price generation.
+
+A price refresh leaves every stored scan priced by an older generation.
+:func:`reprice_scans` reads the enriched items of each stored scan, prices
+them again with :func:`~utils.inventory.processor.price_item` and one
+:class:`~utils.valuation_service.ValuationBatch` per scan, and rewrites the
+scan with the new ``price_generation`` and ``value`` summary.  Steam is not
+contacted and ``scanned_at`` is kept; ``repriced_at`` records the rewrite.
+
+Scans already priced by the current generation are skipped unless
+``force`` is set.  Generation numbers restart with the process, so a scan
+also counts as stale when it was written before the current service was
+loaded.  A scan rescanned while it was being repriced is left
+alone.
+
+``POST /api/reprice`` runs this in the server and pushes the refreshed
+cards to open pages; ``python -m utils.repricer`` runs it offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from . import local_data, schema_snapshot
+from .inventory.maps_and_constants import QUALITY_MAP
+from .inventory.processor import price_item
+from .inventory_value import InventoryValue, summarize_items
+from .scan_store import ScanStore, get_scan_store
+from .valuation_service import (
+    ValuationBatch,
+    ValuationService,
+    get_valuation_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RepriceResult:
+    """Outcome of repricing one stored scan."""
+
+    steamid: str
+    repriced: bool
+    changed: int = 0
+    items: int = 0
+    price_generation: int | None = None
+    value: InventoryValue | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "steamid": self.steamid,
+            "repriced": self.repriced,
+            "changed": self.changed,
+            "items": self.items,
+            "price_generation": self.price_generation,
+            "value": self.value.to_dict() if self.value is not None else None,
+        }
+
+
+def _quality_ids() -> Dict[str, int]:
+    """Return quality ids by name, for items stored without ``quality_id``."""
+
+    ids = {name: qid for qid, (name, _color) in QUALITY_MAP.items()}
+    for qid, name in schema_snapshot.active().qualities_by_index.items():
+        try:
+            ids[name] = int(qid)
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def is_current(meta: Dict[str, Any], service: ValuationService) -> bool:
+    """Return whether a stored scan was priced by ``service``."""
+
+    written = max(meta.get("scanned_at") or 0, meta.get("repriced_at") or 0)
+    return (
+        meta.get("price_generation") == service.generation
+        and written >= service.loaded_at
+    )
+
+
+def reprice_items(
+    items: Iterable[Dict[str, Any]],
+    batch: ValuationBatch,
+    quality_ids: Dict[str, int] | None = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Price enriched ``items`` again; return them and how many changed.
+
+    Untradable items are never priced and are passed through unchanged.
+    """
+
+    if quality_ids is None:
+        quality_ids = _quality_ids()
+    repriced: List[Dict[str, Any]] = []
+    changed = 0
+    for item in items:
+        repriced.append(item)
+        if not isinstance(item, dict) or item.get("_hidden"):
+            continue
+        if item.get("quality_id") is None:
+            item["quality_id"] = quality_ids.get(item.get("quality"), 0)
+        before = item.get("price"), item.get("price_string")
+        price_item(item, batch)
+        if (item.get("price"), item.get("price_string")) != before:
+            changed += 1
+    return repriced, changed
+
+
+def reprice_scan(
+    steamid: str,
+    service: ValuationService | None = None,
+    *,
+    store: ScanStore | None = None,
+    force: bool = False,
+    quality_ids: Dict[str, int] | None = None,
+) -> RepriceResult | None:
+    """Reprice the stored scan of ``steamid``; ``None`` if there is none."""
+
+    store = store or get_scan_store()
+    service = service or get_valuation_service()
+    meta = store.meta(steamid)
+    if meta is None:
+        return None
+    generation = service.generation
+    if not force and is_current(meta, service):
+        return RepriceResult(steamid, False, price_generation=generation)
+
+    batch = service.batch()
+    items, changed = reprice_items(store.iter_items(steamid), batch, quality_ids)
+    value = summarize_items(items, batch.key_price, steamid=str(steamid))
+    extra = {
+        key: val
+        for key, val in meta.items()
+        if key not in ("steamid", "status", "item_count", "price_generation", "value")
+    }
+    # No other writer may replace the scan between the check and the save.
+    with store.lock(steamid):
+        current = store.meta(steamid) or {}
+        if current.get("scanned_at") != meta.get("scanned_at"):
+            logger.info("Scan of %s changed while repricing; skipped", steamid)
+            return RepriceResult(
+                steamid, False, price_generation=current.get("price_generation")
+            )
+        extra["repriced_at"] = time.time()
+        store.save(
+            steamid,
+            items,
+            status=meta.get("status", "parsed"),
+            price_generation=generation,
+            value=value.to_dict(),
+            meta=extra,
+        )
+    return RepriceResult(steamid, True, changed, len(items), generation, value)
+
+
+def reprice_scans(
+    steamids: Iterable[str] | None = None,
+    service: ValuationService | None = None,
+    *,
+    store: ScanStore | None = None,
+    force: bool = False,
+) -> List[RepriceResult]:
+    """Reprice ``steamids`` (every stored scan by default) with one service.
+
+    Failures are logged per scan and do not stop the others.
+    """
+
+    store = store or get_scan_store()
+    service = service or get_valuation_service()
+    quality_ids = _quality_ids()
+    results: List[RepriceResult] = []
+    for steamid in store.steamids() if steamids is None else steamids:
+        try:
+            result = reprice_scan(
+                steamid, service, store=store, force=force, quality_ids=quality_ids
+            )
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not reprice scan of %s: %s", steamid, exc)
+            continue
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.repricer",
+        description="Reprice stored scans with the cached prices.",
+    )
+    parser.add_argument("steamids", nargs="*", help="default: every stored scan")
+    parser.add_argument(
+        "--force", action="store_true", help="also reprice current scans"
+    )
+    args = parser.parse_args(argv)
+
+    local_data.load_files(auto_refetch=False)
+    results = reprice_scans(args.steamids or None, force=args.force)
+    for result in results:
+        print(json.dumps({k: v for k, v in result.to_dict().items() if k != "value"}))
+    repriced = sum(1 for result in results if result.repriced)
+    print(f"{repriced} of {len(results)} scans repriced")
+    return 0
+
+
+__all__ = [
+    "RepriceResult",
+    "is_current",
+    "reprice_items",
+    "reprice_scan",
+    "reprice_scans",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
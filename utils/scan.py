@@ -0,0 +1,291 @@
+"""Headless bulk scanner: ``python -m utils.scan``.
+
+Reads SteamID64/SteamID2/SteamID3 tokens, vanity names or URLs and raw
+``status`` dumps from files or stdin, resolves and scans them concurrently
+through :mod:`utils.steam_api_client` and :func:`process_inventory`, and
+streams one result per user to stdout as NDJSON or CSV::
+
+    python -m utils.scan ids.txt --concurrency 4 --rate 1 > values.ndjson
+    tf2_status_dump | python -m utils.scan --format csv --summary-only
+
+Every Steam request passes through a shared :class:`RateLimiter`, and failed
+inventory fetches are retried with exponential backoff.  Results are
+written as users finish, so memory use does not grow with the input size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Sequence, TextIO
+
+from . import export, local_data
+from . import steam_api_client as sac
+from .inventory_processor import process_inventory
+from .valuation_service import ValuationService, get_valuation_service
+
+SUMMARY_COLUMNS = ("steamid", "input", "status", "item_count", "value_refined")
+PROFILE_URL_RE = re.compile(r"steamcommunity\.com/profiles/(\d{17})", re.IGNORECASE)
+
+
+class RateLimiter:
+    """Async token bucket allowing ``rate`` acquisitions per second."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def iter_tokens(lines: Iterable[str]) -> Iterator[str]:
+    """Yield unique ID tokens from ``lines``.
+
+    A line holding a single token is taken as is (so bare vanity names work);
+    longer lines such as ``status`` output go through
+    :func:`extract_steam_ids`.
+    """
+
+    seen: set[str] = set()
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        tokens = [text] if not re.search(r"\s", text) else []
+        tokens = tokens or sac.extract_steam_ids(text)
+        for token in tokens:
+            match = sac.VANITY_URL_RE.fullmatch(token) or PROFILE_URL_RE.search(token)
+            token = match.group(1) if match else token
+            if token not in seen:
+                seen.add(token)
+                yield token
+
+
+async def _resolve(token: str, limiter: RateLimiter) -> str | None:
+    if sac.STEAMID64_RE.fullmatch(token) or not sac.VANITY_RE.fullmatch(token):
+        try:
+            return sac.convert_to_steam64(token)
+        except ValueError:
+            return None
+    await limiter.acquire()
+    return await sac.resolve_vanity_url_async(token)
+
+
+async def scan_user(
+    token: str,
+    service: ValuationService,
+    limiter: RateLimiter,
+    *,
+    retries: int = 2,
+    backoff: float = 2.0,
+) -> Dict[str, Any]:
+    """Resolve ``token``, fetch and enrich its inventory and return a result."""
+
+    steamid = await _resolve(token, limiter)
+    result: Dict[str, Any] = {"steamid": steamid, "input": token}
+    if steamid is None:
+        result.update(status="unresolved", item_count=0, value_refined=0.0)
+        result["items"] = []
+        return result
+
+    status, data = "failed", {}
+    for attempt in range(retries + 1):
+        await limiter.acquire()
+        status, data = await sac.fetch_inventory_async(steamid)
+        if status != "failed" or attempt == retries:
+            break
+        await asyncio.sleep(backoff * 2**attempt)
+
+    items: List[Dict[str, Any]] = []
+    if status == "parsed":
+        items = process_inventory(data, valuation_service=service)
+    result.update(
+        status=status,
+        item_count=len(items),
+        value_refined=round(sum(export.item_value(i) for i in items), 2),
+        items=items,
+    )
+    return result
+
+
+async def scan_many(
+    tokens: Iterable[str],
+    service: ValuationService,
+    *,
+    concurrency: int = 4,
+    rate: float = 1.0,
+    burst: int = 1,
+    retries: int = 2,
+    backoff: float = 2.0,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield scan results in completion order with bounded concurrency."""
+
+    limiter = RateLimiter(rate, burst)
+    pending: asyncio.Queue = asyncio.Queue(maxsize=max(concurrency, 1) * 2)
+    results: asyncio.Queue = asyncio.Queue(maxsize=max(concurrency, 1) * 2)
+    done = object()
+
+    async def feed() -> None:
+        for token in tokens:
+            await pending.put(token)
+        for _ in range(max(concurrency, 1)):
+            await pending.put(done)
+
+    async def worker() -> None:
+        while True:
+            token = await pending.get()
+            if token is done:
+                await results.put(done)
+                return
+            try:
+                result = await scan_user(
+                    token, service, limiter, retries=retries, backoff=backoff
+                )
+            except Exception as exc:  # keep the batch going
+                result = {
+                    "steamid": None,
+                    "input": token,
+                    "status": "error",
+                    "error": str(exc),
+                    "item_count": 0,
+                    "value_refined": 0.0,
+                    "items": [],
+                }
+            await results.put(result)
+
+    tasks = [asyncio.create_task(feed())]
+    tasks += [asyncio.create_task(worker()) for _ in range(max(concurrency, 1))]
+    remaining = max(concurrency, 1)
+    try:
+        while remaining:
+            result = await results.get()
+            if result is done:
+                remaining -= 1
+                continue
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def csv_header(columns: Sequence[str], summary_only: bool = False) -> List[str]:
+    """Return the CSV header written before :func:`format_result` rows."""
+
+    if summary_only:
+        return list(SUMMARY_COLUMNS)
+    return ["steamid", "status", *columns]
+
+
+def format_result(
+    result: Dict[str, Any],
+    fmt: str,
+    columns: Sequence[str],
+    summary_only: bool = False,
+) -> Iterator[str]:
+    """Yield output lines for one user's ``result``.
+
+    NDJSON emits one object per user; CSV emits one row per item prefixed by
+    the user's SteamID and status, or one row per user with ``summary_only``.
+    """
+
+    if fmt == "ndjson":
+        record = {k: result.get(k) for k in SUMMARY_COLUMNS}
+        if "error" in result:
+            record["error"] = result["error"]
+        if not summary_only:
+            record["items"] = [export.project(i, columns) for i in result["items"]]
+        yield from export.iter_ndjson([record])
+    elif summary_only:
+        yield from export.iter_csv(None, [[result.get(c) for c in SUMMARY_COLUMNS]])
+    else:
+        prefix = [result.get("steamid"), result.get("status")]
+        rows = [
+            prefix + [export.column_value(i, c) for c in columns]
+            for i in result["items"]
+        ]
+        yield from export.iter_csv(None, rows or [prefix + [None] * len(columns)])
+
+
+def _input_lines(paths: List[str]) -> Iterator[str]:
+    for name in paths or ["-"]:
+        if name == "-":
+            yield from sys.stdin
+        else:
+            with Path(name).open(encoding="utf-8", errors="replace") as handle:
+                yield from handle
+
+
+async def _run(args: argparse.Namespace, out: TextIO) -> int:
+    service = get_valuation_service()
+    columns = export.parse_columns(args.columns)
+    count = 0
+    results = scan_many(
+        iter_tokens(_input_lines(args.inputs)),
+        service,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        burst=args.burst,
+        retries=args.retries,
+    )
+    if args.format == "csv":
+        out.writelines(export.iter_csv(csv_header(columns, args.summary_only), []))
+    async for result in results:
+        out.writelines(format_result(result, args.format, columns, args.summary_only))
+        out.flush()
+        count += 1
+    print(f"Scanned {count} users", file=sys.stderr)
+    return 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.scan", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "inputs", nargs="*", help="Files with IDs or status dumps ('-' for stdin)"
+    )
+    parser.add_argument("--format", choices=export.FORMATS, default="ndjson")
+    parser.add_argument(
+        "--columns", help="Comma separated item columns (default: a compact set)"
+    )
+    parser.add_argument(
+        "--summary-only", action="store_true", help="Omit items, one record per user"
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--rate", type=float, default=1.0, help="Steam requests per second (0 = off)"
+    )
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--retries", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    try:
+        local_data.load_files(auto_refetch=False)
+    except RuntimeError as exc:
+        print(f"Schema cache unavailable: {exc}. Run the app once.", file=sys.stderr)
+        return 1
+    return asyncio.run(_run(args, sys.stdout))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""Admin-gated sampling profiler for individual scans.
+
+:func:`capture` samples the calling thread's stack with
+:func:`sys._current_frames` from a background thread while a scan runs, and
+records the raw ``GetPlayerItems`` results fetched inside it.  On exit the
+profile is written to ``cache/profiles/<id>/`` as ``profile.folded``
+(collapsed stacks understood by ``flamegraph.pl`` and speedscope),
+``meta.json`` and one ``inventory_<steamid>.json`` per user, which can be
+replayed with ``scripts/profile_extractors.py`` or the stand-in server.
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, List, Tuple
+
+PROFILE_DIR = Path("cache/profiles")
+DEFAULT_INTERVAL = 0.005
+ADMIN_HEADER = "X-Admin-Token"
+
+_PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+_BASE_DIR = str(Path(__file__).resolve().parent.parent) + os.sep
+_CAPTURE: ContextVar["ScanCapture | None"] = ContextVar("scan_capture", default=None)
+
+
+def admin_authorized(token: str | None) -> bool:
+    """Return ``True`` when ``token`` matches the ``ADMIN_TOKEN`` env var.
+
+    Profiling is unavailable when ``ADMIN_TOKEN`` is unset or empty.
+    """
+
+    expected = os.getenv("ADMIN_TOKEN", "")
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(expected.encode(), token.encode())
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_BASE_DIR):
+        filename = filename[len(_BASE_DIR) :]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """Sample one thread's call stack at a fixed interval."""
+
+    def __init__(
+        self, thread_id: int | None = None, interval: float = DEFAULT_INTERVAL
+    ) -> None:
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples: Counter[Tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack: List[str] = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.samples[tuple(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="scan-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """Return samples as ``frame;frame;frame count`` lines."""
+
+        lines = [f"{';'.join(stack)} {n}" for stack, n in self.samples.items()]
+        return "\n".join(sorted(lines)) + ("\n" if lines else "")
+
+
+class ScanCapture:
+    """Profile and inventories collected for one profiled request."""
+
+    def __init__(self, label: str, interval: float = DEFAULT_INTERVAL) -> None:
+        self.label = label
+        self.profile_id = (
+            time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + "-" + uuid.uuid4().hex[:8]
+        )
+        self.profiler = SamplingProfiler(interval=interval)
+        self.inventories: Dict[str, Dict[str, Any]] = {}
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.path: Path | None = None
+
+    def __enter__(self) -> "ScanCapture":
+        self._token = _CAPTURE.set(self)
+        self.started = time.perf_counter()
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.profiler.stop()
+        self.elapsed = time.perf_counter() - self.started
+        _CAPTURE.reset(self._token)
+        self.save()
+
+    def save(self, directory: Path | None = None) -> Path:
+        """Write the profile, metadata and inventories and return the folder."""
+
+        path = (directory or PROFILE_DIR) / self.profile_id
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "profile.folded").write_text(self.profiler.collapsed())
+        for steamid, entry in self.inventories.items():
+            (path / f"inventory_{steamid}.json").write_text(json.dumps(entry["data"]))
+        (path / "meta.json").write_text(json.dumps(self.summary(), indent=2))
+        self.path = path
+        return path
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.profile_id,
+            "label": self.label,
+            "elapsed_ms": round(self.elapsed * 1000, 2),
+            "interval_ms": self.profiler.interval * 1000,
+            "samples": sum(self.profiler.samples.values()),
+            "inventories": {
+                sid: entry["status"] for sid, entry in self.inventories.items()
+            },
+        }
+
+
+def capture(label: str, interval: float = DEFAULT_INTERVAL) -> ScanCapture:
+    """Return a context manager profiling the current thread until exit."""
+
+    return ScanCapture(label, interval)
+
+
+def record_inventory(steamid: str, status: str, data: Dict[str, Any]) -> None:
+    """Keep the raw inventory for ``steamid`` if a capture is active."""
+
+    current = _CAPTURE.get()
+    if current is not None:
+        current.inventories[str(steamid)] = {"status": status, "data": data}
+
+
+def load_profile(profile_id: str, directory: Path | None = None) -> str | None:
+    """Return the collapsed stacks stored for ``profile_id`` or ``None``."""
+
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = (directory or PROFILE_DIR) / profile_id / "profile.folded"
+    if not path.exists():
+        return None
+    return path.read_text()
+
+
+__all__ = [
+    "ADMIN_HEADER",
+    "PROFILE_DIR",
+    "SamplingProfiler",
+    "ScanCapture",
+    "admin_authorized",
+    "capture",
+    "record_inventory",
+    "load_profile",
+]
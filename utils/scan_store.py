@@ -0,0 +1,188 @@
+"""On-disk store of the latest enriched scan for each user.
+
+Each scan is kept as ``cache/scans/<steamid>.ndjson``: the first line holds
+metadata (``steamid``, ``status``, ``scanned_at``, ``item_count`` and, when
+known, the ``price_generation`` the items were priced with and their
+``value`` summary from :mod:`utils.inventory_value` and the ``profile``
+the user card is rendered from) and every
+following line one enriched item as returned by ``process_inventory``.
+Files are replaced atomically and read back lazily, so exports and other
+consumers can stream a stored scan without loading it whole.  Each write
+goes to its own temporary file, and writes of one user's scan are
+serialized by :meth:`ScanStore.lock`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .export import iter_ndjson
+
+SCANS_DIR = Path("cache/scans")
+
+logger = logging.getLogger(__name__)
+
+_STEAMID_RE = re.compile(r"^\d{17}$")
+
+
+class ScanStore:
+    """Read and write stored scans under ``directory``."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        # Resolved lazily so tests can redirect ``SCANS_DIR``.
+        return self._directory or SCANS_DIR
+
+    def path(self, steamid: str) -> Path:
+        steamid = str(steamid)
+        if not _STEAMID_RE.match(steamid):
+            raise ValueError(f"Invalid SteamID64: {steamid}")
+        return self.directory / f"{steamid}.ndjson"
+
+    def lock(self, steamid: str) -> threading.RLock:
+        """Return the lock held while ``steamid``'s scan is written.
+
+        Hold it across a read and the following :meth:`save` to make the pair
+        atomic with respect to other writers in this process.
+        """
+
+        with self._locks_guard:
+            return self._locks.setdefault(str(steamid), threading.RLock())
+
+    def save(
+        self,
+        steamid: str,
+        items: Iterable[Dict[str, Any]],
+        *,
+        status: str = "parsed",
+        item_count: int | None = None,
+        price_generation: int | None = None,
+        value: Dict[str, Any] | None = None,
+        meta: Dict[str, Any] | None = None,
+    ) -> Path:
+        """Replace the stored scan for ``steamid`` with ``items``.
+
+        ``meta`` holds further metadata fields; it may override
+        ``scanned_at`` when a scan is rewritten rather than rescanned.
+        """
+
+        items = list(items) if item_count is None else items
+        header = {
+            "steamid": str(steamid),
+            "status": status,
+            "scanned_at": time.time(),
+            "item_count": len(items) if item_count is None else item_count,
+        }
+        if price_generation is not None:
+            header["price_generation"] = price_generation
+        if value is not None:
+            header["value"] = value
+        header.update(meta or {})
+        path = self.path(steamid)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.writelines(iter_ndjson([header]))
+                handle.writelines(iter_ndjson(items))
+            with self.lock(steamid):
+                os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        return path
+
+    def meta(self, steamid: str) -> Dict[str, Any] | None:
+        """Return the metadata line of a stored scan, or ``None``."""
+
+        path = self.path(steamid)
+        if not path.exists():
+            return None
+        with path.open(encoding="utf-8") as handle:
+            return json.loads(handle.readline())
+
+    def iter_items(self, steamid: str) -> Iterator[Dict[str, Any]]:
+        """Yield stored items for ``steamid`` one at a time."""
+
+        path = self.path(steamid)
+        if not path.exists():
+            return
+        with path.open(encoding="utf-8") as handle:
+            handle.readline()
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+    def steamids(self) -> List[str]:
+        """Return the SteamIDs with a stored scan."""
+
+        if not self.directory.exists():
+            return []
+        return sorted(p.stem for p in self.directory.glob("*.ndjson"))
+
+    def delete(self, steamid: str) -> bool:
+        path = self.path(steamid)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+
+_default_store: ScanStore | None = None
+
+
+def get_scan_store() -> ScanStore:
+    """Return singleton :class:`ScanStore` instance."""
+
+    global _default_store
+    if _default_store is None:
+        _default_store = ScanStore()
+    return _default_store
+
+
+def record_scan(
+    steamid: str,
+    items: List[Dict[str, Any]],
+    status: str,
+    *,
+    price_generation: int | None = None,
+    value: Dict[str, Any] | None = None,
+    profile: Dict[str, Any] | None = None,
+) -> None:
+    """Store ``items`` for ``steamid``, logging instead of raising on failure.
+
+    Without ``profile`` the profile of the scan stored before is kept.
+    """
+
+    try:
+        store = get_scan_store()
+        if profile is None:
+            profile = (store.meta(steamid) or {}).get("profile")
+        store.save(
+            steamid,
+            items,
+            status=status,
+            price_generation=price_generation,
+            value=value,
+            meta={"profile": profile} if profile is not None else None,
+        )
+    except (OSError, ValueError, TypeError) as exc:
+        logger.warning("Could not store scan for %s: %s", steamid, exc)
+
+
+__all__ = ["SCANS_DIR", "ScanStore", "get_scan_store", "record_scan"]
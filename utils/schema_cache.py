@@ -0,0 +1,134 @@
+"""Registry of tables derived from the loaded schema.
+
+Lookups such as attribute class sets or alias maps are computed from the
+schema tables.  Building them at import time or caching them forever leaves
+them stale after :func:`local_data.load_files` runs again.  Wrapping the
+builder with :func:`derived` instead ties the result to the active
+:class:`~utils.schema_snapshot.SchemaSnapshot`: its generation (bumped by
+every ``load_files`` call) and the identity of the ``local_data`` tables it
+names.  The table is then rebuilt lazily, exactly once, on first use with a
+new snapshot::
+
+    @schema_cache.derived("SCHEMA_ATTRIBUTES")
+    def _special_attrs() -> dict:
+        attributes = schema_snapshot.active().schema_attributes
+        ...
+
+Tables other modules import by name should be wrapped with
+:class:`DerivedMapping`, or handed out as immutable values.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from . import schema_snapshot
+
+
+class Derived:
+    """Callable returning ``build()``, cached per schema snapshot.
+
+    The table is looked up for the snapshot bound with
+    :func:`schema_snapshot.use` (else the current one), so a scan keeps the
+    tables of the generation it started with while a reload runs.  Builders
+    read their inputs through :func:`schema_snapshot.active`.  Tables of the
+    last :attr:`KEEP` snapshots are kept.
+    """
+
+    KEEP = 2
+
+    def __init__(self, build: Callable[[], Any], depends: Tuple[str, ...]) -> None:
+        functools.update_wrapper(self, build)
+        self._build = build
+        self.depends = depends
+        self.builds = 0
+        self._lock = threading.Lock()
+        # ``(generation, sources, value)``, newest first; replaced, never mutated.
+        self._states: List[Tuple[int, Tuple[Any, ...], Any]] = []
+
+    def _find(
+        self, generation: int, sources: Tuple[Any, ...]
+    ) -> Tuple[int, Tuple[Any, ...], Any] | None:
+        for state in self._states:
+            if state[0] == generation and all(
+                old is new for old, new in zip(state[1], sources)
+            ):
+                return state
+        return None
+
+    def __call__(self) -> Any:
+        snapshot = schema_snapshot.active()
+        generation = snapshot.generation
+        sources = tuple(snapshot.source(name) for name in self.depends)
+        state = self._find(generation, sources)
+        if state is None:
+            with self._lock:
+                state = self._find(generation, sources)
+                if state is None:
+                    state = (generation, sources, self._build())
+                    self._states = [state, *self._states][: self.KEEP]
+                    self.builds += 1
+        return state[2]
+
+    def invalidate(self) -> None:
+        """Force a rebuild on next use."""
+
+        self._states = []
+
+
+class DerivedMapping(Mapping):
+    """Read-only mapping view that always reflects a :class:`Derived` table."""
+
+    def __init__(self, table: Derived) -> None:
+        self._table = table
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._table()[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._table().get(key, default)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._table())
+
+    def __len__(self) -> int:
+        return len(self._table())
+
+    def __repr__(self) -> str:
+        return f"DerivedMapping({self._table()!r})"
+
+
+_REGISTRY: Dict[str, Derived] = {}
+
+
+def derived(*depends: str) -> Callable[[Callable[[], Any]], Derived]:
+    """Register a table built from the ``local_data`` attributes ``depends``."""
+
+    def decorator(build: Callable[[], Any]) -> Derived:
+        table = Derived(build, depends)
+        _REGISTRY[f"{build.__module__}.{build.__qualname__}"] = table
+        return table
+
+    return decorator
+
+
+def invalidate_all() -> None:
+    """Force every registered table to rebuild on next use."""
+
+    for table in _REGISTRY.values():
+        table.invalidate()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Return build counts and dependencies of registered tables."""
+
+    return {
+        name: {"builds": table.builds, "depends": list(table.depends)}
+        for name, table in sorted(_REGISTRY.items())
+    }
+
+
+__all__ = ["Derived", "DerivedMapping", "derived", "invalidate_all", "snapshot"]
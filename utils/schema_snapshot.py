@@ -0,0 +1,174 @@
+"""Immutable, atomically swapped view of the loaded schema tables.
+
+``local_data`` keeps its tables as module globals.  ``load_files``
+reassigns them one at a time, so a scan that reads them directly while a
+reload runs can mix generations, for example new items with old
+qualities.  A :class:`SchemaSnapshot` bundles read-only views of every
+table.  ``load_files`` publishes a new one with a single reference swap
+once all tables are loaded.
+
+The enrichment pipeline binds one snapshot for a whole inventory with
+:func:`use` and reads tables through :func:`active`.  Readers never take a
+lock, and every item of a scan sees one consistent generation::
+
+    with schema_snapshot.use(schema_snapshot.current()):
+        ...  # extractors call schema_snapshot.active().items_by_defindex
+
+:func:`current` also notices tables that were reassigned outside
+``load_files`` (tests, scripts) and captures a fresh snapshot for them.
+The entries inside the tables (item dicts) are shared, not copied.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Tuple
+
+from . import local_data
+
+# Snapshot field -> ``local_data`` global it is taken from.
+FIELDS = {
+    "schema_attributes": "SCHEMA_ATTRIBUTES",
+    "items_by_defindex": "ITEMS_BY_DEFINDEX",
+    "qualities_by_index": "QUALITIES_BY_INDEX",
+    "particle_names": "PARTICLE_NAMES",
+    "effect_names": "EFFECT_NAMES",
+    "paint_names": "PAINT_NAMES",
+    "wear_names": "WEAR_NAMES",
+    "wear_names_by_id": "WEAR_NAMES_BY_ID",
+    "killstreak_names": "KILLSTREAK_NAMES",
+    "killstreak_effect_names": "KILLSTREAK_EFFECT_NAMES",
+    "item_grade_by_defindex": "ITEM_GRADE_BY_DEFINDEX",
+    "strange_part_names": "STRANGE_PART_NAMES",
+    "paintkit_names": "PAINTKIT_NAMES",
+    "paintkit_names_by_id": "PAINTKIT_NAMES_BY_ID",
+    "crate_series_names": "CRATE_SERIES_NAMES",
+    "footprint_spell_map": "FOOTPRINT_SPELL_MAP",
+    "paint_spell_map": "PAINT_SPELL_MAP",
+}
+
+
+@dataclass(frozen=True)
+class SchemaSnapshot:
+    """Read-only schema tables of one generation."""
+
+    generation: int
+    schema_attributes: Mapping[int, Any]
+    items_by_defindex: Mapping[int, Any]
+    qualities_by_index: Mapping[int, str]
+    particle_names: Mapping[int, str]
+    effect_names: Mapping[str, str]
+    paint_names: Mapping[str, str]
+    wear_names: Mapping[str, str]
+    wear_names_by_id: Mapping[int, str]
+    killstreak_names: Mapping[str, str]
+    killstreak_effect_names: Mapping[str, str]
+    item_grade_by_defindex: Mapping[int, str]
+    strange_part_names: Mapping[str, str]
+    paintkit_names: Mapping[str, Any]
+    paintkit_names_by_id: Mapping[str, str]
+    crate_series_names: Mapping[str, str]
+    footprint_spell_map: Mapping[int, str]
+    paint_spell_map: Mapping[int, str]
+    # The ``local_data`` objects the views wrap, compared by identity.
+    sources: Tuple[Any, ...] = field(default=(), repr=False, compare=False)
+
+    @classmethod
+    def capture(cls) -> "SchemaSnapshot":
+        """Return a snapshot of the current ``local_data`` globals."""
+
+        sources = _sources()
+        views = {
+            name: MappingProxyType(table if isinstance(table, dict) else {})
+            for name, table in zip(FIELDS, sources)
+        }
+        return cls(local_data.SCHEMA_GENERATION, **views, sources=sources)
+
+    def source(self, name: str) -> Any:
+        """Return the ``local_data`` global ``name`` this snapshot was taken of.
+
+        Globals that are not snapshot tables are read from ``local_data``.
+        """
+
+        try:
+            return self.sources[_GLOBALS.index(name)]
+        except (ValueError, IndexError):
+            return getattr(local_data, name, None)
+
+    def is_current(self) -> bool:
+        """Return ``True`` if no ``local_data`` table was replaced since."""
+
+        return self.generation == local_data.SCHEMA_GENERATION and all(
+            old is new for old, new in zip(self.sources, _sources())
+        )
+
+
+_GLOBALS = tuple(FIELDS.values())
+
+
+def _sources() -> Tuple[Any, ...]:
+    return tuple(getattr(local_data, name, None) for name in _GLOBALS)
+
+
+_CURRENT: SchemaSnapshot | None = None
+_CAPTURE_LOCK = threading.Lock()
+_ACTIVE: contextvars.ContextVar[SchemaSnapshot | None] = contextvars.ContextVar(
+    "schema_snapshot", default=None
+)
+
+
+def publish(snapshot: SchemaSnapshot) -> None:
+    """Make ``snapshot`` the one returned by :func:`current`."""
+
+    global _CURRENT
+    _CURRENT = snapshot
+
+
+def current() -> SchemaSnapshot:
+    """Return the latest published snapshot.
+
+    A fresh one is captured when ``local_data`` tables were replaced outside
+    ``load_files``; while a reload is in progress the previous snapshot is
+    returned instead of a half-updated one.
+    """
+
+    snapshot = _CURRENT
+    if snapshot is not None and (
+        local_data.RELOAD_LOCK.locked() or snapshot.is_current()
+    ):
+        return snapshot
+    with _CAPTURE_LOCK:
+        snapshot = _CURRENT
+        if snapshot is None or not snapshot.is_current():
+            snapshot = SchemaSnapshot.capture()
+            publish(snapshot)
+        return snapshot
+
+
+def active() -> SchemaSnapshot:
+    """Return the snapshot bound by :func:`use`, else :func:`current`."""
+
+    return _ACTIVE.get() or current()
+
+
+@contextlib.contextmanager
+def use(snapshot: SchemaSnapshot | None = None) -> Iterator[SchemaSnapshot]:
+    """Bind ``snapshot`` for the enclosed code.
+
+    Without an argument the snapshot already bound is kept, so nested calls
+    share one generation; at the top level :func:`current` is bound.
+    """
+
+    snapshot = snapshot or active()
+    token = _ACTIVE.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _ACTIVE.reset(token)
+
+
+__all__ = ["SchemaSnapshot", "active", "current", "publish", "use"]
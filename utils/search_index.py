@@ -0,0 +1,236 @@
+"""Inverted index over items of every stored scan.
+
+:class:`SearchIndex` maps terms to the items holding them so a query across
+all scanned users intersects a few posting sets instead of walking every
+inventory.  Two kinds of terms are indexed:
+
+* name tokens (``t:<word>``) from the display name, skin, unusual effect,
+  paint, sheen and killstreaker, matched by the free text ``q``;
+* exact facets (``quality:unusual``, ``effect:burning flames``,
+  ``paint:…``, ``sheen:…``, ``killstreaker:…``, ``defindex:…``).
+
+Prices are kept in a sorted array so ``min_price``/``max_price`` are answered
+with a binary search.  :meth:`SearchIndex.refresh` compares scan file
+modification times with what was indexed and reindexes only users that were
+rescanned (or drops deleted ones), so queries stay current without a full
+rebuild.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from . import export, scan_store
+
+FACETS = {
+    "quality": "quality",
+    "effect": "unusual_effect_name",
+    "paint": "paint_name",
+    "sheen": "sheen_name",
+    "killstreaker": "killstreak_effect",
+    "defindex": "defindex",
+}
+_TEXT_FIELDS = (
+    "display_name",
+    "name",
+    "skin_name",
+    "unusual_effect_name",
+    "paint_name",
+    "sheen_name",
+    "killstreak_effect",
+)
+RESULT_FIELDS = (
+    "id",
+    "defindex",
+    "display_name",
+    "name",
+    "quality",
+    "unusual_effect_name",
+    "paint_name",
+    "sheen_name",
+    "killstreak_effect",
+    "image_url",
+    "quantity",
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Any) -> List[str]:
+    """Return lowercase alphanumeric tokens of ``text``."""
+
+    return _TOKEN_RE.findall(str(text).lower()) if text else []
+
+
+def item_terms(item: Dict[str, Any]) -> Set[str]:
+    """Return the index terms of an enriched ``item``."""
+
+    terms = {f"t:{tok}" for f in _TEXT_FIELDS for tok in tokenize(item.get(f))}
+    for facet, field in FACETS.items():
+        value = item.get(field)
+        if value not in (None, ""):
+            terms.add(f"{facet}:{str(value).lower()}")
+    return terms
+
+
+class SearchIndex:
+    """Incrementally maintained inverted index over a :class:`ScanStore`."""
+
+    def __init__(self, store: scan_store.ScanStore | None = None) -> None:
+        self._store = store
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[int]] = {}
+        self._docs: Dict[int, Tuple[str, Dict[str, Any], float]] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._user_docs: Dict[str, List[int]] = {}
+        self._versions: Dict[str, int] = {}
+        self._prices: List[Tuple[float, int]] | None = []
+        self._next_id = 0
+
+    @property
+    def store(self) -> scan_store.ScanStore:
+        return self._store or scan_store.get_scan_store()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _remove_user(self, steamid: str) -> None:
+        for doc_id in self._user_docs.pop(steamid, ()):
+            del self._docs[doc_id]
+            for term in self._doc_terms.pop(doc_id):
+                posting = self._postings.get(term)
+                if posting is not None:
+                    posting.discard(doc_id)
+                    if not posting:
+                        del self._postings[term]
+        self._versions.pop(steamid, None)
+        self._prices = None
+
+    def update(
+        self, steamid: str, items: Iterable[Dict[str, Any]], version: int = 0
+    ) -> int:
+        """Replace the indexed items of ``steamid`` and return their count."""
+
+        with self._lock:
+            self._remove_user(steamid)
+            doc_ids = []
+            for item in items:
+                doc_id = self._next_id
+                self._next_id += 1
+                terms = item_terms(item)
+                summary = {f: item.get(f) for f in RESULT_FIELDS}
+                summary["price_refined"] = export.column_value(item, "price_refined")
+                price = float(summary["price_refined"] or 0)
+                self._docs[doc_id] = (steamid, summary, price)
+                self._doc_terms[doc_id] = terms
+                for term in terms:
+                    self._postings.setdefault(term, set()).add(doc_id)
+                doc_ids.append(doc_id)
+            self._user_docs[steamid] = doc_ids
+            self._versions[steamid] = version
+            self._prices = None
+            return len(doc_ids)
+
+    def remove(self, steamid: str) -> None:
+        with self._lock:
+            self._remove_user(steamid)
+
+    def refresh(self) -> Dict[str, int]:
+        """Reindex users whose stored scan changed; return counts by action."""
+
+        store = self.store
+        current: Dict[str, int] = {}
+        for steamid in store.steamids():
+            try:
+                current[steamid] = store.path(steamid).stat().st_mtime_ns
+            except (OSError, ValueError):
+                continue
+        stats = {"indexed": 0, "removed": 0}
+        for steamid in set(self._versions) - set(current):
+            self.remove(steamid)
+            stats["removed"] += 1
+        for steamid, version in current.items():
+            if self._versions.get(steamid) != version:
+                self.update(steamid, store.iter_items(steamid), version)
+                stats["indexed"] += 1
+        return stats
+
+    def _price_range(self, low: float | None, high: float | None) -> Set[int]:
+        if self._prices is None:
+            self._prices = sorted((p, d) for d, (_, _, p) in self._docs.items())
+        start = 0 if low is None else bisect.bisect_left(self._prices, (low, -1))
+        end = (
+            len(self._prices)
+            if high is None
+            else bisect.bisect_right(self._prices, (high, float("inf")))
+        )
+        return {doc_id for _, doc_id in self._prices[start:end]}
+
+    def search(
+        self,
+        q: str = "",
+        *,
+        filters: Dict[str, Any] | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        steamid: str | None = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Return items matching every token of ``q`` and every filter.
+
+        ``filters`` maps :data:`FACETS` names to exact (case-insensitive)
+        values.  Results are ordered by price, highest first.
+        """
+
+        terms = [f"t:{tok}" for tok in tokenize(q)]
+        for facet, value in (filters or {}).items():
+            if facet not in FACETS:
+                raise ValueError(f"Unknown search filter: {facet}")
+            if value not in (None, ""):
+                terms.append(f"{facet}:{str(value).lower()}")
+
+        with self._lock:
+            candidates: Set[int] | None = None
+            for term in sorted(terms, key=lambda t: len(self._postings.get(t, ()))):
+                posting = self._postings.get(term, set())
+                candidates = (
+                    set(posting) if candidates is None else candidates & posting
+                )
+                if not candidates:
+                    break
+            if min_price is not None or max_price is not None:
+                in_range = self._price_range(min_price, max_price)
+                candidates = in_range if candidates is None else candidates & in_range
+            if candidates is None:
+                candidates = set(self._docs)
+            if steamid is not None:
+                candidates &= set(self._user_docs.get(steamid, ()))
+
+            top = heapq.nlargest(
+                max(limit, 0), candidates, key=lambda d: self._docs[d][2]
+            )
+            return {
+                "total": len(candidates),
+                "users": len({self._docs[d][0] for d in candidates}),
+                "items": [
+                    {"steamid": self._docs[d][0], **self._docs[d][1]} for d in top
+                ],
+            }
+
+
+_default_index: SearchIndex | None = None
+
+
+def get_search_index() -> SearchIndex:
+    """Return singleton :class:`SearchIndex` instance."""
+
+    global _default_index
+    if _default_index is None:
+        _default_index = SearchIndex()
+    return _default_index
+
+
+__all__ = ["FACETS", "SearchIndex", "get_search_index", "item_terms", "tokenize"]
@@ -0,0 +1,64 @@
+"""Quantity stacking for enriched inventory items."""
+
+import json
+from typing import Any, Dict, List
+
+IGNORED_STACK_KEYS = {
+    "level",
+    "custom_description",
+    "custom_name",
+    "origin",
+    "id",
+    "original_id",
+    "inventory",
+}
+
+# Item names that should never be merged into quantity stacks
+UNSTACKABLE_NAMES = {
+    "Killstreak Kit",
+    "Specialized Killstreak Kit",
+    "Professional Killstreak Kit",
+    "Killstreak Kit Fabricator",
+}
+
+
+def stack_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return ``items`` grouped into quantity stacks.
+
+    Items whose ``name`` or ``item_type_name`` appears in
+    :data:`UNSTACKABLE_NAMES` are kept separate.  All other items are merged by
+    comparing every field except those in :data:`IGNORED_STACK_KEYS`.
+    """
+
+    grouped: Dict[str, Dict[str, Any]] = {}
+    uniques: List[Dict[str, Any]] = []
+
+    for itm in items:
+        if not isinstance(itm, dict):
+            continue
+
+        item_name = itm.get("name")
+        item_type = itm.get("item_type_name")
+        if item_name in UNSTACKABLE_NAMES or item_type in UNSTACKABLE_NAMES:
+            new_item = itm.copy()
+            new_item.setdefault("quantity", 1)
+            uniques.append(new_item)
+            continue
+
+        key_obj = {k: v for k, v in itm.items() if k not in IGNORED_STACK_KEYS}
+        try:
+            key = json.dumps(key_obj, sort_keys=True)
+        except TypeError:
+            key = str(key_obj)
+
+        if key in grouped:
+            grouped[key]["quantity"] += 1
+        else:
+            new_item = itm.copy()
+            new_item.setdefault("quantity", 1)
+            grouped[key] = new_item
+
+    return list(grouped.values()) + uniques
+
+
+__all__ = ["IGNORED_STACK_KEYS", "UNSTACKABLE_NAMES", "stack_items"]
@@ -2,14 +2,21 @@ import os
 from typing import Any, Dict, Iterator, List, Tuple
 
 import logging
+import time
 import httpx
 import re
 from dotenv import load_dotenv
 
+from .metrics import STEAM_REQUEST_SECONDS
+
 # Ensure .env values are available even when this module is imported early.
 load_dotenv()
 
 STEAM_API_KEY = os.getenv("STEAM_API_KEY")
+# Override to point at a local stand-in (see ``scripts/standin_server.py``).
+STEAM_API_BASE_URL = (
+    os.getenv("STEAM_API_BASE_URL") or "https://api.steampowered.com"
+).rstrip("/")
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,14 @@ def _require_key() -> str:
     return STEAM_API_KEY
 
 
+def _observe(endpoint: str, status: int | str, start: float) -> None:
+    """Record the latency of a Steam API call for ``/metrics``."""
+
+    STEAM_REQUEST_SECONDS.observe(
+        time.perf_counter() - start, endpoint=endpoint, status=str(status)
+    )
+
+
 def _chunks(seq: List[str], size: int) -> Iterator[List[str]]:
     for i in range(0, len(seq), size):
         yield seq[i : i + size]
@@ -77,13 +92,16 @@ async def resolve_vanity_url_async(vanity: str) -> str | None:
     """Resolve a Steam vanity string to SteamID64, or ``None`` on failure."""
 
     key = _require_key()
-    url = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/"
+    url = f"{STEAM_API_BASE_URL}/ISteamUser/ResolveVanityURL/v1/"
+    start = time.perf_counter()
     async with httpx.AsyncClient(timeout=10) as client:
         try:
             resp = await client.get(url, params={"key": key, "vanityurl": vanity})
         except httpx.HTTPError:
+            _observe("ResolveVanityURL", "error", start)
             logger.warning("Vanity resolve failed for %s", vanity)
             return None
+    _observe("ResolveVanityURL", resp.status_code, start)
     if resp.status_code != 200:
         return None
     try:
@@ -102,14 +120,17 @@ async def get_player_summaries_async(steamids: List[str]) -> List[Dict[str, Any]
         for chunk in _chunks(steamids, 100):
             key = _require_key()
             url = (
-                "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
+                f"{STEAM_API_BASE_URL}/ISteamUser/GetPlayerSummaries/v2/"
                 f"?key={key}&steamids={','.join(chunk)}"
             )
+            start = time.perf_counter()
             try:
                 resp = await client.get(url)
             except httpx.HTTPError:
+                _observe("GetPlayerSummaries", "error", start)
                 logger.warning("Player summaries fetch failed for %s", chunk)
                 continue
+            _observe("GetPlayerSummaries", resp.status_code, start)
             if resp.status_code in (420, 429):
                 logger.warning("Player summaries rate limited for %s", chunk)
                 continue
@@ -132,16 +153,19 @@ async def fetch_inventory_async(steamid: str) -> Tuple[str, Dict[str, Any]]:
     headers = {"User-Agent": "Mozilla/5.0"}
     key = _require_key()
     url = (
-        "https://api.steampowered.com/IEconItems_440/GetPlayerItems/v0001/"
+        f"{STEAM_API_BASE_URL}/IEconItems_440/GetPlayerItems/v0001/"
         f"?key={key}&steamid={steamid}"
     )
 
+    start = time.perf_counter()
     async with httpx.AsyncClient(timeout=20) as client:
         try:
             resp = await client.get(url, headers=headers)
         except httpx.HTTPError:
+            _observe("GetPlayerItems", "error", start)
             logger.info("Inventory %s: Fetch Failed", steamid)
             return "failed", {}
+    _observe("GetPlayerItems", resp.status_code, start)
 
     if resp.status_code in (400, 403):
         logger.info("Inventory %s: Private", steamid)
@@ -198,15 +222,18 @@ def convert_to_steam64(id_str: str) -> str:
 
     if VANITY_RE.fullmatch(id_str):
         key = _require_key()
+        start = time.perf_counter()
         try:
             with httpx.Client(timeout=10) as client:
                 resp = client.get(
-                    "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/",
+                    f"{STEAM_API_BASE_URL}/ISteamUser/ResolveVanityURL/v1/",
                     params={"key": key, "vanityurl": id_str},
                 )
         except httpx.HTTPError:
+            _observe("ResolveVanityURL", "error", start)
             logger.warning("Vanity resolve failed for %s", id_str)
             raise ValueError(f"Invalid Steam ID format: {id_str}")
+        _observe("ResolveVanityURL", resp.status_code, start)
         if resp.status_code != 200:
             logger.warning(
                 "Vanity resolve HTTP %s for %s", resp.status_code, id_str
@@ -225,7 +252,7 @@ def convert_to_steam64(id_str: str) -> str:
 
 async def get_tf2_playtime_hours_async(steamid: str) -> float:
     """Asynchronously return TF2 playtime in hours for a Steam user."""
-    url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
+    url = f"{STEAM_API_BASE_URL}/IPlayerService/GetOwnedGames/v0001/"
     key = _require_key()
     params = {
         "key": key,
@@ -233,12 +260,15 @@ async def get_tf2_playtime_hours_async(steamid: str) -> float:
         "include_played_free_games": 1,
         "format": "json",
     }
+    start = time.perf_counter()
     async with httpx.AsyncClient(timeout=10) as client:
         try:
             resp = await client.get(url, params=params)
         except httpx.HTTPError:
+            _observe("GetOwnedGames", "error", start)
             logger.warning("Playtime fetch failed for %s", steamid)
             return 0.0
+    _observe("GetOwnedGames", resp.status_code, start)
     if resp.status_code in (420, 429):
         logger.warning("Playtime rate limited for %s", steamid)
         return 0.0
@@ -1,19 +1,75 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
-from . import local_data
+from . import local_data, schema_snapshot
+from .metrics import record_cache
 from .price_loader import (
     ensure_prices_cached,
     build_price_map,
     load_price_map,
     dump_price_map,
     PRICE_MAP_FILE,
+    PRICE_SNAPSHOT_FILE,
+    PRICES_FILE,
 )
-from .price_service import format_price
+from .price_index import Sku, SkuIndex, build_sku_index
+from .price_service import format_price, format_refined, key_price
+from .price_snapshot import PriceSnapshot, SnapshotError, write_snapshot
+from .price_table import CompactPriceMap
+
+logger = logging.getLogger(__name__)
+
+PriceKey = Tuple[str, int, bool, bool, int, int]
+# Lookup result for one item: raw price info (or ``None``) and its price string.
+ItemValue = Tuple[Optional[Dict[str, Any]], str]
 
 
 _default_service: ValuationService | None = None
+_SWAP_LOCK = threading.Lock()
+
+
+def _mtime(path: Path) -> float | None:
+    return path.stat().st_mtime if path.exists() else None
+
+
+def _load_cached_price_map() -> (
+    Mapping[Tuple[str, int, bool, bool, int, int], Any] | None
+):
+    """Return the cached price map, preferring the binary snapshot.
+
+    A cached map older than the price dump is ignored so it gets rebuilt, and
+    the snapshot is skipped when ``price_map.json`` is newer.  A snapshot is
+    written for a JSON map that has none yet.
+    """
+
+    prices_mtime = _mtime(PRICES_FILE) or 0.0
+    json_mtime = _mtime(PRICE_MAP_FILE)
+    snapshot_mtime = _mtime(PRICE_SNAPSHOT_FILE)
+    if snapshot_mtime is not None and snapshot_mtime >= max(
+        json_mtime or 0.0, prices_mtime
+    ):
+        try:
+            return PriceSnapshot(PRICE_SNAPSHOT_FILE)
+        except SnapshotError as exc:
+            logger.warning("Ignoring price snapshot: %s", exc)
+    if json_mtime is None or json_mtime < prices_mtime:
+        return None
+    try:
+        price_map = load_price_map(PRICE_MAP_FILE)
+    except Exception:
+        return None
+    try:
+        write_snapshot(price_map, PRICE_SNAPSHOT_FILE)
+    except OSError as exc:
+        logger.warning("Could not write price snapshot: %s", exc)
+    return price_map
 
 
 def get_valuation_service() -> "ValuationService":
@@ -27,26 +83,214 @@ def get_valuation_service() -> "ValuationService":
     return _default_service
 
 
+def swap_valuation_service(service: "ValuationService") -> "ValuationService | None":
+    """Make ``service`` the next generation returned by :func:`get_valuation_service`.
+
+    ``local_data.CURRENCIES`` is replaced with the service's currencies in the
+    same step.  Scans already holding the previous service keep pricing
+    against it.  Returns the previous service.
+    """
+
+    global _default_service
+    with _SWAP_LOCK:
+        previous = _default_service
+        service.generation = (previous.generation if previous else 0) + 1
+        if service._currencies is not None:
+            local_data.CURRENCIES = service._currencies
+        _default_service = service
+    return previous
+
+
+def warm_up() -> "ValuationService":
+    """Load the current service and build its SKU index ahead of requests."""
+
+    service = get_valuation_service()
+    service.sku_index()
+    return service
+
+
+def price_status() -> Dict[str, Any]:
+    """Return generation, load time, age and size of the current service.
+
+    Once its SKU index is built, its size and unmatched name counts are
+    included under ``"sku"``.
+    """
+
+    service = _default_service
+    if service is None:
+        return {"generation": None, "loaded_at": None, "age_s": None, "entries": 0}
+    status = {
+        "generation": service.generation,
+        "loaded_at": service.loaded_at,
+        "age_s": round(time.time() - service.loaded_at, 1),
+        "entries": len(service.price_map),
+    }
+    index = service.built_sku_index()
+    if index is not None:
+        report = index.report(limit=0)
+        del report["top_unmatched"]
+        status["sku"] = report
+    return status
+
+
+def price_key(
+    item_name: str,
+    quality: int,
+    craftable: bool = True,
+    is_australium: bool = False,
+    effect_id: int | None = None,
+    killstreak_tier: int | None = None,
+) -> PriceKey:
+    """Return the price map key for an item."""
+
+    return (
+        item_name,
+        quality,
+        craftable,
+        is_australium,
+        effect_id or 0,
+        killstreak_tier or 0,
+    )
+
+
+class ValuationBatch:
+    """Memoized lookups for one inventory against one :class:`ValuationService`.
+
+    Each distinct price key walks the fallback chain once, and prices are
+    formatted with the key price parsed when the batch was created.  Items
+    with a :data:`~utils.price_index.Sku` are looked up in the service's
+    SKU index first and by name only when that misses.
+    """
+
+    __slots__ = ("service", "currencies", "key_price", "sku_index", "_memo")
+
+    def __init__(
+        self, service: "ValuationService", currencies: Dict[str, Any] | None = None
+    ) -> None:
+        self.service = service
+        self.currencies = service.currencies if currencies is None else currencies
+        self.key_price = key_price(self.currencies)
+        self.sku_index = service.sku_index()
+        self._memo: Dict[PriceKey | Tuple[PriceKey, Sku], ItemValue] = {}
+
+    def value(self, key: PriceKey, sku: Sku | None = None) -> ItemValue:
+        """Return ``(info, price_string)`` for ``sku``, else by name ``key``."""
+
+        memo_key = key if sku is None else (key, sku)
+        result = self._memo.get(memo_key)
+        if result is None:
+            info = None
+            if sku is not None and self.sku_index is not None:
+                info = self.sku_index.lookup(sku)
+                record_cache("price_sku", info is not None)
+            if info is None:
+                info = self.service._resolve(key)
+            value = info.get("value_raw") if info else None
+            formatted = "" if value is None else format_refined(value, self.key_price)
+            result = self._memo[memo_key] = (info, formatted)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+
+@dataclass
+class InventoryValuation:
+    """Result of :meth:`ValuationService.value_inventory`."""
+
+    items: List[ItemValue] = field(default_factory=list)
+    total_value_raw: float = 0.0
+    total_string: str = ""
+    priced: int = 0
+    unpriced: int = 0
+    lookups: int = 0
+
+
 class ValuationService:
-    """Wrapper around name-based price lookups."""
+    """Wrapper around name-based price lookups.
+
+    A plain dict ``price_map`` is converted to a
+    :class:`~utils.price_table.CompactPriceMap`.  ``currencies`` are the
+    rates prices are formatted with; when omitted, ``local_data.CURRENCIES``
+    is used at call time.
+    """
 
     def __init__(
         self,
         price_map: (
-            Dict[Tuple[str, int, bool, bool, int, int], Dict[str, Any]] | None
+            Mapping[Tuple[str, int, bool, bool, int, int], Dict[str, Any]] | None
         ) = None,
+        currencies: Dict[str, Any] | None = None,
     ) -> None:
         if price_map is None:
-            if PRICE_MAP_FILE.exists():
-                try:
-                    price_map = load_price_map(PRICE_MAP_FILE)
-                except Exception:
-                    price_map = None
+            price_map = _load_cached_price_map()
             if price_map is None:
                 path = ensure_prices_cached()
                 price_map = build_price_map(path)
                 dump_price_map(price_map, PRICE_MAP_FILE)
+        if isinstance(price_map, dict):
+            price_map = CompactPriceMap(price_map)
         self.price_map = price_map
+        self._currencies = currencies
+        self.generation = 0
+        self.loaded_at = time.time()
+        self._sku: Tuple[schema_snapshot.SchemaSnapshot, SkuIndex | None] | None = None
+        self._sku_lock = threading.Lock()
+
+    @property
+    def currencies(self) -> Dict[str, Any]:
+        if self._currencies is not None:
+            return self._currencies
+        return local_data.CURRENCIES
+
+    def sku_index(self) -> SkuIndex | None:
+        """Return the SKU index of this price map for the active schema.
+
+        Built on first use and again for each new schema snapshot; ``None``
+        while no schema is loaded.  Concurrent first calls build it once.
+        :func:`~utils.price_refresher.build_service` and ``run.py`` build it
+        before requests need it.
+        """
+
+        schema = schema_snapshot.active()
+        cached = self._sku
+        if cached is None or cached[0] is not schema:
+            with self._sku_lock:
+                cached = self._sku
+                if cached is None or cached[0] is not schema:
+                    index = None
+                    if schema.items_by_defindex:
+                        index = build_sku_index(
+                            self.price_map,
+                            schema.items_by_defindex,
+                            schema.paintkit_names,
+                        )
+                    cached = self._sku = (schema, index)
+        return cached[1]
+
+    def built_sku_index(self) -> SkuIndex | None:
+        """Return the SKU index last built, without building one."""
+
+        cached = self._sku
+        return cached[1] if cached else None
+
+    def _resolve(self, key: PriceKey) -> Dict[str, Any] | None:
+        """Return price info for ``key``, dropping killstreak, then effect."""
+
+        price_map = self.price_map
+        if isinstance(price_map, CompactPriceMap):
+            info = price_map.resolve(key)
+            record_cache("price_map", info is not None)
+            return info
+        info = price_map.get(key)
+        if info is None:
+            effect_id, killstreak_tier = key[4], key[5]
+            if killstreak_tier:
+                info = price_map.get(key[:5] + (0,))
+            if info is None and effect_id:
+                info = price_map.get(key[:4] + (0, killstreak_tier))
+        record_cache("price_map", info is not None)
+        return info
 
     def get_price_info(
         self,
@@ -58,38 +302,16 @@ class ValuationService:
         killstreak_tier: int | None = None,
     ) -> Dict[str, Any] | None:
         """Return raw price info dict for the item if available."""
-        key = (
-            item_name,
-            quality,
-            craftable,
-            is_australium,
-            effect_id or 0,
-            killstreak_tier or 0,
-        )
-        info = self.price_map.get(key)
-        if info is None and killstreak_tier is not None:
-            info = self.price_map.get(
-                (
-                    item_name,
-                    quality,
-                    craftable,
-                    is_australium,
-                    effect_id or 0,
-                    0,
-                )
-            )
-        if info is None and effect_id is not None:
-            info = self.price_map.get(
-                (
-                    item_name,
-                    quality,
-                    craftable,
-                    is_australium,
-                    0,
-                    killstreak_tier or 0,
-                )
+        return self._resolve(
+            price_key(
+                item_name,
+                quality,
+                craftable,
+                is_australium,
+                effect_id,
+                killstreak_tier,
             )
-        return info
+        )
 
     def format_price(
         self,
@@ -117,5 +339,43 @@ class ValuationService:
         if value is None:
             return ""
         if currencies is None:
-            currencies = local_data.CURRENCIES
+            currencies = self.currencies
         return format_price(value, currencies)
+
+    def batch(self, currencies: Dict[str, Any] | None = None) -> ValuationBatch:
+        """Return a :class:`ValuationBatch` for pricing one inventory."""
+
+        return ValuationBatch(self, currencies)
+
+    def value_inventory(
+        self,
+        items: Iterable[PriceKey | None],
+        currencies: Dict[str, Any] | None = None,
+        skus: Iterable[Sku | None] | None = None,
+    ) -> InventoryValuation:
+        """Price every key in ``items`` and total the results.
+
+        ``skus``, when given, runs parallel to ``items``.  ``None`` entries
+        (hidden or untradable items) get ``(None, "")``.  Duplicate keys are
+        resolved once.
+        """
+
+        batch = self.batch(currencies)
+        result = InventoryValuation()
+        total = 0.0
+        for key, sku in zip(items, skus if skus is not None else repeat(None)):
+            if key is None:
+                value: ItemValue = (None, "")
+            else:
+                value = batch.value(key, sku)
+            result.items.append(value)
+            info, formatted = value
+            if formatted:
+                result.priced += 1
+                total += float(info["value_raw"])
+            else:
+                result.unpriced += 1
+        result.total_value_raw = total
+        result.total_string = format_refined(total, batch.key_price)
+        result.lookups = len(batch)
+        return result
@@ -0,0 +1,357 @@
+"""Watchlist of SteamIDs rescanned in the background.
+
+Watched users are rescanned on a jittered schedule by
+:class:`WatchlistScheduler`, which runs inside the Hypercorn process started
+by ``run.py`` (disable with ``WATCHLIST_SCHEDULER=0``) or as a separate
+worker::
+
+    python -m utils.watchlist add 76561198000000000 --interval 3600
+    python -m utils.watchlist run
+
+Each rescan goes through the same scan function as interactive requests
+(``build_user_data_async`` inside the app), so results land in
+:mod:`utils.scan_store`.  The stored scan before and after is compared and
+the difference (items gained or lost, new unusuals) is kept on the entry,
+letting dashboards read precomputed data instead of starting live scans.
+Scans pass through a shared :class:`~utils.scan.RateLimiter` so the
+watchlist never exceeds ``WATCHLIST_RATE`` scans per second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from . import local_data, scan_store
+from .scan import RateLimiter, scan_user
+from .valuation_service import get_valuation_service
+
+WATCHLIST_FILE = Path("cache/watchlist.json")
+DEFAULT_INTERVAL = 6 * 3600.0
+MIN_INTERVAL = 300.0
+JITTER = 0.1
+MAX_CHANGES = 20
+
+logger = logging.getLogger(__name__)
+
+_STEAMID_RE = re.compile(r"^\d{17}$")
+
+ScanFn = Callable[[str], Awaitable[Any]]
+
+
+def _jittered(interval: float, jitter: float = JITTER) -> float:
+    return interval * random.uniform(1 - jitter, 1 + jitter)
+
+
+def _item_key(item: Dict[str, Any]) -> Any:
+    # ``id`` changes whenever an item is modified (painted, renamed, ...);
+    # ``original_id`` stays with the item for its lifetime.
+    key = item.get("original_id")
+    return item.get("id") if key is None else key
+
+
+def _summary(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": item.get("id"),
+        "original_id": item.get("original_id"),
+        "name": item.get("display_name") or item.get("name"),
+        "quality": item.get("quality"),
+        "unusual_effect_name": item.get("unusual_effect_name"),
+    }
+
+
+def diff_items(
+    old: Iterable[Dict[str, Any]], new: Iterable[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return items ``added``/``removed`` between scans and ``new_unusuals``.
+
+    Items are matched by ``original_id``, falling back to the asset id for
+    items stored without one, so modifying an item is not a trade.  An
+    unusual counts as new when its item was not in ``old``.
+    """
+
+    before = {_item_key(i): i for i in old if _item_key(i) is not None}
+    after = {_item_key(i): i for i in new if _item_key(i) is not None}
+    added = [_summary(after[k]) for k in after.keys() - before.keys()]
+    removed = [_summary(before[k]) for k in before.keys() - after.keys()]
+    return {
+        "added": added,
+        "removed": removed,
+        "new_unusuals": [i for i in added if i["unusual_effect_name"]],
+    }
+
+
+class Watchlist:
+    """Watched SteamIDs and their schedule, persisted as JSON.
+
+    Entries are read by request threads and updated by the scheduler task,
+    so every access goes through a lock and each change is saved
+    atomically.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] | None = None
+        self._mtime: int | None = None
+
+    @property
+    def path(self) -> Path:
+        # Resolved lazily so tests can redirect ``WATCHLIST_FILE``.
+        return self._path or WATCHLIST_FILE
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        # Reread when another process (a separate worker) saved the file.
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._entries is None or mtime != self._mtime:
+            try:
+                self._entries = json.loads(self.path.read_text())["entries"]
+            except (OSError, ValueError, KeyError, TypeError):
+                self._entries = {}
+            self._mtime = mtime
+        return self._entries
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"entries": self._entries}, indent=1))
+        os.replace(tmp, self.path)
+        self._mtime = self.path.stat().st_mtime_ns
+
+    def add(self, steamid: str, interval: float = DEFAULT_INTERVAL) -> Dict:
+        """Watch ``steamid``, rescanning about every ``interval`` seconds."""
+
+        steamid = str(steamid)
+        if not _STEAMID_RE.match(steamid):
+            raise ValueError(f"Invalid SteamID64: {steamid}")
+        interval = max(float(interval), MIN_INTERVAL)
+        with self._lock:
+            entries = self._load()
+            entry = entries.setdefault(
+                steamid,
+                {
+                    "steamid": steamid,
+                    "added_at": time.time(),
+                    # First scan soon, spread so a bulk add is not one burst.
+                    "next_due": time.time() + random.uniform(0, 60),
+                    "last_scan": None,
+                    "last_status": None,
+                    "changes": [],
+                },
+            )
+            entry["interval"] = interval
+            self._save()
+            return dict(entry)
+
+    def remove(self, steamid: str) -> bool:
+        with self._lock:
+            if self._load().pop(str(steamid), None) is None:
+                return False
+            self._save()
+            return True
+
+    def get(self, steamid: str) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self._load().get(str(steamid))
+            return json.loads(json.dumps(entry)) if entry else None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return json.loads(json.dumps(list(self._load().values())))
+
+    def due(self, now: float | None = None) -> List[str]:
+        """Return watched SteamIDs whose rescan is due, oldest first."""
+
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = self._load().values()
+            due = sorted(
+                (e for e in entries if e["next_due"] <= now),
+                key=lambda e: e["next_due"],
+            )
+            return [e["steamid"] for e in due]
+
+    def next_wakeup(self) -> float | None:
+        with self._lock:
+            return min((e["next_due"] for e in self._load().values()), default=None)
+
+    def record(
+        self, steamid: str, status: str, changes: Dict[str, List] | None
+    ) -> None:
+        """Store the outcome of a rescan and schedule the next one."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._load().get(str(steamid))
+            if entry is None:  # removed while being scanned
+                return
+            entry["last_scan"] = now
+            entry["last_status"] = status
+            entry["next_due"] = now + _jittered(entry["interval"])
+            if changes and any(changes.values()):
+                entry["changes"] = [{"at": now, **changes}] + entry["changes"]
+                del entry["changes"][MAX_CHANGES:]
+            self._save()
+
+
+class WatchlistScheduler:
+    """Rescan due watchlist entries with ``scan_fn`` under a rate budget.
+
+    ``scan_fn`` may return a dict with the scan ``status``; it is recorded
+    when nothing was stored, e.g. ``"private"`` for a private inventory.
+    """
+
+    def __init__(
+        self,
+        watchlist: Watchlist,
+        scan_fn: ScanFn,
+        *,
+        rate: float | None = None,
+        poll_interval: float = 30.0,
+        store: scan_store.ScanStore | None = None,
+    ) -> None:
+        self.watchlist = watchlist
+        self.scan_fn = scan_fn
+        if rate is None:
+            rate = float(os.getenv("WATCHLIST_RATE", "0.2"))
+        self.limiter = RateLimiter(rate)
+        self.poll_interval = poll_interval
+        self.store = store or scan_store.get_scan_store()
+
+    async def rescan(self, steamid: str) -> Dict[str, Any]:
+        """Rescan ``steamid`` now and record changes against its stored scan."""
+
+        before_meta = self.store.meta(steamid)
+        before = list(self.store.iter_items(steamid)) if before_meta else None
+        result = None
+        try:
+            result = await self.scan_fn(steamid)
+        except Exception:  # keep the scheduler alive
+            logger.exception("Watchlist rescan failed for %s", steamid)
+        after_meta = self.store.meta(steamid)
+        changes = None
+        if after_meta is None or after_meta == before_meta:
+            # Nothing stored: report why (private, incomplete, ...) when the
+            # scan said so, otherwise the scan failed.
+            status = "failed"
+            if isinstance(result, dict) and result.get("status") != "parsed":
+                status = result.get("status") or "failed"
+        else:
+            status = after_meta.get("status", "parsed")
+            if before is not None:
+                changes = diff_items(before, self.store.iter_items(steamid))
+        self.watchlist.record(steamid, status, changes)
+        return {"steamid": steamid, "status": status, "changes": changes}
+
+    async def run_once(self) -> List[Dict[str, Any]]:
+        """Rescan every entry that is currently due."""
+
+        results = []
+        for steamid in self.watchlist.due():
+            await self.limiter.acquire()
+            results.append(await self.rescan(steamid))
+        return results
+
+    async def run(self) -> None:
+        """Run until cancelled."""
+
+        while True:
+            await self.run_once()
+            wakeup = self.watchlist.next_wakeup()
+            delay = self.poll_interval
+            if wakeup is not None:
+                delay = min(delay, max(wakeup - time.time(), 1.0))
+            await asyncio.sleep(delay)
+
+
+_default_watchlist: Watchlist | None = None
+
+
+def get_watchlist() -> Watchlist:
+    """Return singleton :class:`Watchlist` instance."""
+
+    global _default_watchlist
+    if _default_watchlist is None:
+        _default_watchlist = Watchlist()
+    return _default_watchlist
+
+
+def scheduler_enabled() -> bool:
+    """Return whether ``run.py`` should start the in-process scheduler."""
+
+    return os.getenv("WATCHLIST_SCHEDULER", "1") != "0"
+
+
+async def _worker_scan(steamid: str) -> Dict[str, Any]:
+    service = get_valuation_service()
+    result = await scan_user(steamid, service, RateLimiter(0))
+    if result["status"] == "parsed":
+        scan_store.record_scan(
+            steamid, result["items"], "parsed", price_generation=service.generation
+        )
+    return result
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.watchlist", description=__doc__.splitlines()[0]
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="Watch SteamID64s")
+    add.add_argument("steamids", nargs="+")
+    add.add_argument("--interval", type=float, default=DEFAULT_INTERVAL)
+    remove = sub.add_parser("remove", help="Stop watching SteamID64s")
+    remove.add_argument("steamids", nargs="+")
+    sub.add_parser("list", help="Print entries as JSON")
+    run = sub.add_parser("run", help="Run the scheduler as a separate worker")
+    run.add_argument("--rate", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    watchlist = get_watchlist()
+    if args.command == "add":
+        for steamid in args.steamids:
+            try:
+                watchlist.add(steamid, args.interval)
+            except ValueError as exc:
+                print(exc, file=sys.stderr)
+                return 1
+    elif args.command == "remove":
+        for steamid in args.steamids:
+            watchlist.remove(steamid)
+    elif args.command == "list":
+        print(json.dumps(watchlist.entries(), indent=2))
+    else:
+        local_data.load_files(auto_refetch=False)
+        scheduler = WatchlistScheduler(watchlist, _worker_scan, rate=args.rate)
+        try:
+            asyncio.run(scheduler.run())
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+__all__ = [
+    "WATCHLIST_FILE",
+    "Watchlist",
+    "WatchlistScheduler",
+    "diff_items",
+    "get_watchlist",
+    "scheduler_enabled",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    raise SystemExit(main())
@@ -1,7 +1,7 @@
 import struct
 from typing import Iterable, Tuple
 
-from . import local_data
+from .schema_snapshot import active as _schema
 
 
 def _wear_tier(value: float) -> str:
@@ -21,7 +21,7 @@ def _wear_tier(value: float) -> str:
 def _decode_seed_info(attrs: Iterable[dict]) -> Tuple[float | None, int | None]:
     """Return ``(wear_float, pattern_seed)`` from custom paintkit seed attrs."""
 
-    mapping = local_data.SCHEMA_ATTRIBUTES or {}
+    mapping = _schema().schema_attributes
 
     def get_class(idx: int | None) -> str | None:
         try: